@@ -1,4 +1,5 @@
 """Main AI Agent entry point."""
+import os
 import signal
 import sys
 import time
@@ -17,6 +18,7 @@ class Agent:
         self.terminal = None
         self.task_manager = get_task_manager()
         self.running = False
+        self.abandoned_tasks = []  # tasks still running when shutdown gave up waiting
         
     def start(self):
         """Start the agent."""
@@ -63,15 +65,22 @@ class Agent:
         
         if self.terminal:
             self.terminal.stop()
-        self.task_manager.stop()
+        self.abandoned_tasks = self.task_manager.stop(timeout=5)
         
         print("[Agent] Goodbye!\n")
         
+    def exit(self):
+        """Exit the process without joining task threads that outlived stop()'s timeout."""
+        if self.abandoned_tasks:
+            sys.stdout.flush()
+            os._exit(0)
+        sys.exit(0)
+        
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         print("\n[Agent] Received shutdown signal...")
         self.stop()
-        sys.exit(0)
+        self.exit()
         
     def _register_configured_tasks(self):
         """Register tasks from configuration file."""
@@ -93,6 +102,7 @@ def main():
     split = "--classic" not in sys.argv
     agent = Agent(split_screen=split)
     agent.start()
+    agent.exit()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 """AI Client wrapper for Azure OpenAI with multi-model, Bing grounding, and tool calling support."""
 import time
 import json
+import threading
 import requests
+from typing import Collection, Iterator, Optional
 from openai import AzureOpenAI
 from config import (
     MODELS,
@@ -14,30 +16,42 @@ from config import (
 )
 from tools import get_tool_definitions, execute_tool, list_available_tools
 
+# Models that only accept max_completion_tokens and reject sampling knobs
+# such as temperature / logit_bias.
+_REASONING_MODELS = ("gpt-5", "grok")
+
+# API clients are shared by every AIClient (e.g. one per web browser session)
+# so they reuse one connection pool per model; AzureOpenAI is thread-safe.
+_api_clients = {}
+_api_clients_lock = threading.Lock()
+
 
 class AIClient:
     """Wrapper for Azure OpenAI API calls with multi-model and tool calling support."""
     
     def __init__(self, model_name: str = None):
         self.current_model = model_name or DEFAULT_MODEL
-        self._clients = {}
         self.conversation_history = []
         self.tools_enabled = True
         self.max_tool_iterations = 100
         
     def _get_client(self, model_name: str) -> AzureOpenAI:
-        """Get or create client for a specific model."""
-        if model_name not in self._clients:
-            config = MODELS.get(model_name)
-            if not config:
-                raise ValueError(f"Unknown model: {model_name}")
-            
-            self._clients[model_name] = AzureOpenAI(
-                azure_endpoint=config["endpoint"],
-                api_key=config["api_key"],
-                api_version=config["api_version"]
-            )
-        return self._clients[model_name]
+        """Get or create the shared client for a specific model."""
+        client = _api_clients.get(model_name)
+        if client is not None:
+            return client
+        config = MODELS.get(model_name)
+        if not config:
+            raise ValueError(f"Unknown model: {model_name}")
+        with _api_clients_lock:
+            client = _api_clients.get(model_name)
+            if client is None:
+                client = _api_clients[model_name] = AzureOpenAI(
+                    azure_endpoint=config["endpoint"],
+                    api_key=config["api_key"],
+                    api_version=config["api_version"]
+                )
+        return client
     
     def switch_model(self, model_name: str) -> str:
         """Switch to a different model."""
@@ -66,6 +80,10 @@ class AIClient:
         """Reset conversation history."""
         self.conversation_history = []
     
+    def close(self):
+        """Drop conversation state. The shared API clients stay open for other instances."""
+        self.conversation_history = []
+    
     def _get_system_prompt(self, enable_tools: bool) -> str:
         """Get the system prompt for the agent."""
         if not enable_tools:
@@ -103,12 +121,63 @@ IMPORTANT:
 - If you're unsure, try it and see what happens"""
         
     def chat(self, user_message: str, system_prompt: str = None, model: str = None,
-             use_tools: bool = None, tool_allowlist: list = None) -> str:
-        """Send a message and get a response, with optional tool calling."""
+             use_tools: bool = None, tool_allowlist: Collection[str] = None,
+             max_tokens: int = None, logit_bias: dict = None, stop: list = None) -> str:
+        """Send a message and get a response, with optional tool calling.
+
+        max_tokens, logit_bias and stop override the default completion
+        settings; logit_bias is ignored for reasoning models.
+        """
         model_name = model or self.current_model
         client = self._get_client(model_name)
         config = MODELS[model_name]
+        messages, tools = self._prepare(user_message, system_prompt, use_tools, tool_allowlist)
+        
+        overrides = {"max_tokens": max_tokens, "logit_bias": logit_bias, "stop": stop}
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = self._call_with_tools(client, config, model_name, messages, tools, overrides)
+                self.record_turn(user_message, response)
+                return response
+                
+            except Exception as e:
+                if attempt == MAX_RETRIES - 1:
+                    return f"Error: {str(e)}"
+                time.sleep(1)
         
+        return "Failed to get response after retries."
+    
+    def stream_chat(self, user_message: str, system_prompt: str = None, model: str = None,
+                    use_tools: bool = None, tool_allowlist: Collection[str] = None) -> Iterator[str]:
+        """Like chat(), but yield the response text in chunks as it is generated.
+        
+        Tool calls are still executed between streamed turns. If the stream fails
+        before producing any text or running any tool, falls back to chat() and
+        yields its response.
+        """
+        model_name = model or self.current_model
+        client = self._get_client(model_name)
+        config = MODELS[model_name]
+        messages, tools = self._prepare(user_message, system_prompt, use_tools, tool_allowlist)
+        
+        parts = []
+        state = {"tools_ran": False}
+        try:
+            for piece in self._stream_with_tools(client, config, model_name, messages, tools, state):
+                parts.append(piece)
+                yield piece
+        except Exception as e:
+            # Retrying after a tool call would run its side effects a second time
+            if not parts and not state["tools_ran"]:
+                yield self.chat(user_message, system_prompt=system_prompt, model=model,
+                                use_tools=use_tools, tool_allowlist=tool_allowlist)
+                return
+            yield f"\n[Error] Stream interrupted: {e}"
+        self.record_turn(user_message, "".join(parts))
+    
+    def _prepare(self, user_message: str, system_prompt: str, use_tools: bool, tool_allowlist: Collection[str]):
+        """Build the message list and tool definitions for a request. Returns (messages, tools)."""
         # Determine if we should use tools
         enable_tools = use_tools if use_tools is not None else self.tools_enabled
         
@@ -128,96 +197,108 @@ IMPORTANT:
         # Get tool definitions if enabled
         tools = get_tool_definitions() if enable_tools else None
         if tools and tool_allowlist:
-            allow = set(tool_allowlist)
+            allow = tool_allowlist if isinstance(tool_allowlist, frozenset) else frozenset(tool_allowlist)
             tools = [t for t in tools if t.get("function", {}).get("name") in allow]
+        return messages, tools
+    
+    def record_turn(self, user_message: str, response: str):
+        """Append an exchange to the conversation history.
         
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = self._call_with_tools(client, config, model_name, messages, tools)
-                
-                # Update conversation history
-                self.conversation_history.append({"role": "user", "content": user_message})
-                self.conversation_history.append({"role": "assistant", "content": response})
-                
-                # Keep history manageable
-                if len(self.conversation_history) > 20:
-                    self.conversation_history = self.conversation_history[-20:]
-                
-                return response
-                
-            except Exception as e:
-                if attempt == MAX_RETRIES - 1:
-                    return f"Error: {str(e)}"
-                time.sleep(1)
+        chat() and stream_chat() call this themselves; callers use it to record
+        a reply obtained some other way (e.g. from a cache or another client).
+        """
+        self.conversation_history.append({"role": "user", "content": user_message})
+        self.conversation_history.append({"role": "assistant", "content": response})
         
-        return "Failed to get response after retries."
+        # Keep history manageable
+        if len(self.conversation_history) > 20:
+            self.conversation_history = self.conversation_history[-20:]
+    
+    @staticmethod
+    def _request_params(config, model_name, messages, tools, overrides: dict) -> dict:
+        """Build completion request parameters for a model."""
+        max_tokens = overrides.get("max_tokens") or 4096
+        params = {
+            "model": config["deployment"],
+            "messages": messages,
+            "timeout": REQUEST_TIMEOUT
+        }
+        
+        # Add tools if available
+        if tools:
+            params["tools"] = tools
+            params["tool_choice"] = "auto"
+        
+        # Model-specific parameters
+        if model_name in _REASONING_MODELS:
+            params["max_completion_tokens"] = max_tokens
+        else:
+            params["max_tokens"] = max_tokens
+            params["temperature"] = 0.7
+            if overrides.get("logit_bias"):
+                params["logit_bias"] = overrides["logit_bias"]
+        if overrides.get("stop"):
+            params["stop"] = overrides["stop"]
+        return params
+    
+    @staticmethod
+    def _run_tool_calls(messages: list, content, tool_calls: list):
+        """Record an assistant tool-call turn, execute each call and append its result.
+        
+        tool_calls items are (id, name, arguments) tuples.
+        """
+        # Add assistant message with tool calls
+        messages.append({
+            "role": "assistant",
+            "content": content,
+            "tool_calls": [
+                {
+                    "id": call_id,
+                    "type": "function",
+                    "function": {
+                        "name": name,
+                        "arguments": arguments
+                    }
+                } for call_id, name, arguments in tool_calls
+            ]
+        })
+        
+        # Execute each tool call
+        for call_id, func_name, arguments in tool_calls:
+            try:
+                func_args = json.loads(arguments)
+            except json.JSONDecodeError:
+                func_args = {}
+            
+            # Execute the tool
+            tool_result = execute_tool(func_name, func_args)
+            
+            # Add tool result to messages
+            messages.append({
+                "role": "tool",
+                "tool_call_id": call_id,
+                "content": tool_result
+            })
     
-    def _call_with_tools(self, client, config, model_name, messages, tools) -> str:
+    def _call_with_tools(self, client, config, model_name, messages, tools, overrides: dict = None) -> str:
         """Make API call with tool calling support."""
+        overrides = overrides or {}
         iteration = 0
         current_messages = messages.copy()
         
         while iteration < self.max_tool_iterations:
             iteration += 1
             
-            # Build request parameters
-            params = {
-                "model": config["deployment"],
-                "messages": current_messages,
-                "timeout": REQUEST_TIMEOUT
-            }
-            
-            # Add tools if available
-            if tools:
-                params["tools"] = tools
-                params["tool_choice"] = "auto"
-            
-            # Model-specific parameters
-            if model_name in ["gpt-5", "grok"]:
-                params["max_completion_tokens"] = 4096
-            else:
-                params["max_tokens"] = 4096
-                params["temperature"] = 0.7
-            
+            params = self._request_params(config, model_name, current_messages, tools, overrides)
             response = client.chat.completions.create(**params)
             message = response.choices[0].message
             
             # Check if there are tool calls
             if message.tool_calls:
-                # Add assistant message with tool calls
-                current_messages.append({
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        } for tc in message.tool_calls
-                    ]
-                })
-                
-                # Execute each tool call
-                for tool_call in message.tool_calls:
-                    func_name = tool_call.function.name
-                    try:
-                        func_args = json.loads(tool_call.function.arguments)
-                    except json.JSONDecodeError:
-                        func_args = {}
-                    
-                    # Execute the tool
-                    tool_result = execute_tool(func_name, func_args)
-                    
-                    # Add tool result to messages
-                    current_messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": tool_result
-                    })
-                
+                self._run_tool_calls(
+                    current_messages, message.content,
+                    [(tc.id, tc.function.name, tc.function.arguments) for tc in message.tool_calls]
+                )
                 # Continue loop to get final response
                 continue
             
@@ -225,6 +306,71 @@ IMPORTANT:
             return message.content or ""
         
         return "Maximum tool iterations reached. Please try a simpler request."
+    
+    def _stream_with_tools(self, client, config, model_name, messages, tools,
+                           state: dict = None) -> Iterator[str]:
+        """Streaming counterpart of _call_with_tools: yields content deltas as they arrive.
+        
+        If given, state["tools_ran"] is set once any tool call starts executing.
+        """
+        iteration = 0
+        current_messages = messages.copy()
+        
+        while iteration < self.max_tool_iterations:
+            iteration += 1
+            
+            params = self._request_params(config, model_name, current_messages, tools, {})
+            params["stream"] = True
+            content = []
+            calls = {}  # index -> [id, name, arguments]
+            for chunk in client.chat.completions.create(**params):
+                if not chunk.choices:  # e.g. Azure content-filter preamble
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content.append(delta.content)
+                    yield delta.content
+                for tc in delta.tool_calls or ():
+                    call = calls.setdefault(tc.index, ["", "", ""])
+                    if tc.id:
+                        call[0] = tc.id
+                    if tc.function and tc.function.name:
+                        call[1] += tc.function.name
+                    if tc.function and tc.function.arguments:
+                        call[2] += tc.function.arguments
+            
+            if calls:
+                if state is not None:
+                    state["tools_ran"] = True
+                self._run_tool_calls(current_messages, "".join(content) or None,
+                                     [tuple(calls[i]) for i in sorted(calls)])
+                # Continue loop to get final response
+                continue
+            return
+        
+        yield "Maximum tool iterations reached. Please try a simpler request."
+
+    def ask_yes_no(self, question: str, system_prompt: str = None, model: str = None) -> Optional[bool]:
+        """Ask a YES/NO question. Returns True/False, or None if the reply is unclear.
+
+        Non-reasoning models are capped to a single completion token; reasoning
+        models need room for their hidden reasoning so they get the default budget.
+        """
+        model_name = model or self.current_model
+        max_tokens = None if model_name in _REASONING_MODELS else 1
+        response = self.chat(
+            f"{question}\n\nAnswer with YES or NO only.",
+            system_prompt=system_prompt or "You are a concise judge. Reply with YES or NO only.",
+            model=model_name,
+            use_tools=False,
+            max_tokens=max_tokens,
+        )
+        answer = response.strip().lower()
+        if answer.startswith("y"):
+            return True
+        if answer.startswith("n"):
+            return False
+        return None
 
     def search(self, query: str) -> str:
         """Search the web and return AI-summarized results."""
@@ -10,6 +10,7 @@ import threading
 import time
 import traceback
 import uuid
+from concurrent.futures import Future, wait
 from datetime import datetime
 from typing import List, Callable, Optional
 from ai_client import get_ai_client
@@ -45,6 +46,56 @@ _SESSION_FILE = os.path.join(_AGENT_STATE_DIR, "last_session.json")
 _PERSONAS_FILE = os.path.join(_AGENT_STATE_DIR, "personas.json")
 os.makedirs(_AGENT_STATE_DIR, exist_ok=True)
 
+# Agent loops run on reusable daemon threads (a ThreadPoolExecutor's workers
+# are joined at interpreter exit, which would hang on a loop still running).
+# Idle threads wait this long for another loop before exiting.
+_AGENT_THREAD_IDLE_SECONDS = 300
+_agent_jobs: "queue.SimpleQueue" = queue.SimpleQueue()
+_agent_idle = 0  # waiting threads not yet promised a job
+_agent_pool_lock = threading.Lock()
+
+
+def _agent_worker():
+    """Run agent loops from _agent_jobs until idle for too long."""
+    global _agent_idle
+    while True:
+        try:
+            fn, future = _agent_jobs.get(timeout=_AGENT_THREAD_IDLE_SECONDS)
+        except queue.Empty:
+            with _agent_pool_lock:
+                # a job queued between the timeout and here was promised to us
+                if not _agent_jobs.empty():
+                    continue
+                _agent_idle -= 1
+                return
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                print(f"[AutoAgent] Agent loop crashed: {e}")
+                traceback.print_exc()
+                future.set_exception(e)
+        del fn, future
+        with _agent_pool_lock:
+            _agent_idle += 1
+
+
+def _run_in_agent_thread(fn: Callable) -> Future:
+    """Run ``fn`` on an idle agent thread, starting one if none is free.
+
+    Returns:
+        A Future that completes when ``fn`` returns.
+    """
+    global _agent_idle
+    future = Future()
+    with _agent_pool_lock:
+        _agent_jobs.put((fn, future))
+        if _agent_idle:
+            _agent_idle -= 1
+            return future
+    threading.Thread(target=_agent_worker, daemon=True, name="agent").start()
+    return future
+
 
 DEFAULT_ENCOURAGER_PROMPT = """You're an attentive listener and thinking coach.
 Your job is NOT to critique or grade — it's to encourage deeper exploration:
@@ -221,7 +272,9 @@ class AgentMailbox:
     """Thread-safe message queue for inter-agent communication."""
 
     def __init__(self):
-        self._queue: queue.Queue = queue.Queue()
+        # SimpleQueue: unbounded FIFO with no task tracking, which is all a
+        # mailbox needs, and cheaper to create and use than queue.Queue
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
 
     def send(self, message: str):
         """Post a message to the mailbox."""
@@ -274,7 +327,7 @@ class AutonomousAgent:
         self.outbox = outbox     # sends output to critic
         self._running = False
         self._paused = False
-        self._thread: Optional[threading.Thread] = None
+        self._future: Optional[Future] = None
         self._lock = threading.Lock()
         self._cycle_count = 0
         self._history: List[str] = []
@@ -288,17 +341,20 @@ class AutonomousAgent:
             return
         self._running = True
         self._paused = False
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self._future = _run_in_agent_thread(self._run_loop)
 
     def stop(self):
         """Stop the autonomous agent and persist session."""
         self._running = False
         # Save session data for next startup
         _save_session(self.prompt, self._history, self._cycle_count)
-        if self._thread:
-            self._thread.join(timeout=5)
-            self._thread = None
+        self._join()
+
+    def _join(self, timeout: float = 5):
+        """Wait up to ``timeout`` seconds for the loop to exit."""
+        if self._future:
+            wait([self._future], timeout=timeout)
+            self._future = None
 
     def update_instructions(self, new_prompt: str):
         """Change the agent instructions and persist them."""
@@ -478,7 +534,7 @@ class CriticAgent:
         self.outbox = outbox
         self._running = False
         self._paused = False
-        self._thread: Optional[threading.Thread] = None
+        self._future: Optional[Future] = None
         self._cycle_count = 0
         self._review_history: List[str] = []
 
@@ -487,14 +543,13 @@ class CriticAgent:
             return
         self._running = True
         self._paused = False
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self._future = _run_in_agent_thread(self._run_loop)
 
     def stop(self):
         self._running = False
-        if self._thread:
-            self._thread.join(timeout=5)
-            self._thread = None
+        if self._future:
+            wait([self._future], timeout=5)
+            self._future = None
 
     def pause(self):
         self._paused = True
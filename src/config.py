@@ -68,3 +68,7 @@ for _d in [DATA_DIR, TASK_DATA_DIR, AGENT_WORKSPACE, OUTPUTS_DIR]:
 AGENT_NAME = "CrapBot"
 MAX_RETRIES = 3
 REQUEST_TIMEOUT = 120
+# Indent tool results passed back to the model (easier to read when debugging)
+PRETTY_TOOL_OUTPUT = os.getenv("CRAPBOT_PRETTY") == "1"
+# Web UI research sessions allowed to run at once; later ones wait for a slot
+MAX_CONCURRENT_RESEARCH = int(os.getenv("CRAPBOT_RESEARCH_WORKERS", "4"))
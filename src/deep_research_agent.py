@@ -9,16 +9,199 @@ This module implements a sophisticated research agent that can:
 """
 import json
 import os
+import threading
 import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Callable
-from ai_client import get_ai_client
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Iterator
+from ai_client import AIClient, get_ai_client
 from config import DATA_DIR
 
 
 # Research state storage
 _RESEARCH_STATE_DIR = os.path.join(DATA_DIR, "research_state")
-os.makedirs(_RESEARCH_STATE_DIR, exist_ok=True)
+_STATE_DIR = Path(_RESEARCH_STATE_DIR)
+_STATE_DIR.mkdir(parents=True, exist_ok=True)
+# One JSON line per completed run, so listings never need to open result files
+_INDEX_FILE = _STATE_DIR / "index.jsonl"
+
+# Shared pool for speculative LLM calls (e.g. prefetching the next review round)
+_speculative_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="research-spec")
+
+# Incremental encoder used to serialise prompt snippets
+_prompt_encoder = json.JSONEncoder(indent=2, default=str)
+
+
+def json_head(obj: Any, cap: int = 1000) -> str:
+    """Return at most the first ``cap`` characters of ``obj`` serialised as JSON.
+
+    Encoding stops as soon as the cap is reached, so large results are not
+    fully serialised only to be truncated.
+    """
+    parts = []
+    size = 0
+    for chunk in _prompt_encoder.iterencode(obj):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= cap:
+            break
+    return "".join(parts)[:cap]
+
+
+def _noop(_text: str) -> None:
+    """Default output callback that discards everything."""
+    return None
+
+
+def _private_client(ai) -> AIClient:
+    """A new AIClient starting from a copy of ``ai``'s model and history.
+
+    AIClient history is not synchronised, so a call that runs alongside other
+    calls on ``ai`` gets its own client instead of sharing it.
+    """
+    client = AIClient(ai.current_model)
+    client.conversation_history = list(ai.conversation_history)
+    return client
+
+
+# Prompt templates, built once at import and filled with str.format per call
+_PLANNING_PROMPT = """You are a research planning expert. Analyze the following problem and create a detailed research plan.
+
+Problem: {problem}
+{context_line}
+
+Your task:
+1. Identify the type of problem (e.g., financial analysis, philosophical inquiry, technical research, etc.)
+2. Determine the best research approach for this specific problem type
+3. Create a step-by-step research plan with 3-5 concrete steps
+4. For each step, specify:
+   - What to research or investigate
+   - Which tools or methods to use (web search, code analysis, data gathering, etc.)
+   - Expected outcomes
+
+Return your plan in JSON format:
+{{
+  "problem_type": "...",
+  "research_approach": "...",
+  "steps": [
+    {{
+      "step_number": 1,
+      "description": "...",
+      "methods": ["web_search", "code_analysis", etc.],
+      "expected_outcome": "..."
+    }},
+    ...
+  ]
+}}
+
+Be specific and actionable. Adapt your plan to the problem type."""
+
+_QUERY_PROMPT = """Generate a focused search query for: {query}
+
+Problem context: {problem}
+
+Return only the search query, optimized for getting the most relevant results."""
+
+_CODE_PROMPT = """You need to perform code analysis or write code to help with this research step:
+
+Step: {step}
+Problem: {problem}
+
+Determine if code execution would help answer this step. If yes:
+1. Write Python code to analyze data, make calculations, or gather information
+2. Execute the code
+3. Provide the results
+
+If code won't help, explain why and provide alternative insights."""
+
+_DATA_PROMPT = """Gather relevant data for this research step:
+
+Step: {step}
+Problem: {problem}
+
+Use available tools to gather data. Be thorough and specific."""
+
+_ANALYSIS_PROMPT = """Analyze the information gathered for this research step:
+
+Step: {step}
+Problem: {problem}
+
+Information gathered:
+{context}
+
+Provide deep analysis and insights. Be critical and thorough."""
+
+_EVAL_PROMPT = """Evaluate if this research step needs refinement:
+
+Step: {step}
+Result: {result}
+
+Are the findings sufficient and high-quality?"""
+
+_REFINE_PROMPT = """The previous research for this step needs improvement:
+
+Step: {step}
+Previous findings: {previous}
+
+Conduct additional research to fill gaps, verify information, or explore alternative angles.
+Be more thorough this time."""
+
+_SYNTHESIS_PROMPT = """Synthesize all research findings into a comprehensive, well-reasoned answer:
+
+Original Problem: {problem}
+
+Research Findings:
+{findings}
+
+Provide:
+1. A clear, direct answer to the problem
+2. Supporting evidence from the research
+3. Key insights and conclusions
+4. Any limitations or caveats
+
+Be thorough but concise. Format the answer in a professional, readable manner."""
+
+_REVIEW_PROMPT = """You are a critical research reviewer. Thoroughly review this research:
+
+Problem: {problem}
+
+Research Plan:
+{steps}
+
+Final Answer:
+{final_answer}
+
+Provide a comprehensive review covering:
+1. Quality Score (1-10): Rate the overall quality
+2. Strengths: What was done well?
+3. Weaknesses: What gaps or issues exist?
+4. Accuracy: Is the information accurate and well-supported?
+5. Completeness: Is anything missing?
+6. Suggestions: How can this be improved?
+
+Be honest and constructive. Don't hold back on criticism if deserved."""
+
+_FEEDBACK_PROMPT = """Based on your review, provide specific, actionable feedback for the researcher:
+
+Review: {review}
+Current Answer: {answer}
+Discussion Round: {round_num}
+
+Give 2-3 specific points the researcher should address to improve the answer."""
+
+_RESPONSE_PROMPT = """You received this feedback on your research:
+
+Feedback: {feedback}
+
+Original Problem: {problem}
+Current Answer: {answer}
+
+Respond to the feedback and provide an improved answer if needed. Be specific about what you're changing and why."""
+
+
+class ResearchCancelled(Exception):
+    """Raised inside a research run once it has been cancelled."""
 
 
 class ResearchPlan:
@@ -55,16 +238,26 @@ class ResearchPlan:
 class DeepResearchAgent:
     """An autonomous research agent that can plan, research, and adapt its approach."""
     
-    def __init__(self, on_output: Callable[[str], None] = None):
+    def __init__(self, on_output: Callable[[str], None] = None, ai=None):
         """
         Args:
             on_output: Callback to send output/progress updates to the UI
+            ai: AIClient to use; defaults to the shared singleton
         """
-        self.ai = get_ai_client()
-        self.on_output = on_output or (lambda text: None)
+        self.ai = ai if ai is not None else get_ai_client()
+        self.on_output = on_output if on_output is not None else _noop
         self.current_plan: Optional[ResearchPlan] = None
         self.max_iterations = 5
         self.research_id = None
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Ask a running research session to stop at the next step boundary."""
+        self._cancelled.set()
+    
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            raise ResearchCancelled(self.research_id)
     
     def research(self, problem: str, context: str = "") -> Dict[str, Any]:
         """
@@ -78,13 +271,15 @@ class DeepResearchAgent:
             Dict containing research results, findings, and final answer
         """
         self.research_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.on_output(f"\n{'='*80}")
-        self.on_output(f"DEEP RESEARCH SESSION: {self.research_id}")
-        self.on_output(f"{'='*80}")
-        self.on_output(f"\nProblem: {problem}")
-        if context:
-            self.on_output(f"Context: {context}")
-        self.on_output("\n")
+        self._cancelled.clear()
+        if self.on_output is not _noop:
+            self.on_output(f"\n{'='*80}")
+            self.on_output(f"DEEP RESEARCH SESSION: {self.research_id}")
+            self.on_output(f"{'='*80}")
+            self.on_output(f"\nProblem: {problem}")
+            if context:
+                self.on_output(f"Context: {context}")
+            self.on_output("\n")
         
         # Phase 1: Analyze problem and create initial plan
         self.on_output("[Phase 1] Analyzing problem and creating research plan...")
@@ -96,6 +291,7 @@ class DeepResearchAgent:
         research_results = self._execute_research_plan()
         
         # Phase 3: Synthesize findings
+        self._check_cancelled()
         self.on_output("\n[Phase 3] Synthesizing findings into final answer...")
         final_answer = self._synthesize_findings(research_results)
         
@@ -114,36 +310,10 @@ class DeepResearchAgent:
     
     def _create_research_plan(self, problem: str, context: str) -> ResearchPlan:
         """Analyze the problem and create a tailored research plan."""
-        planning_prompt = f"""You are a research planning expert. Analyze the following problem and create a detailed research plan.
-
-Problem: {problem}
-{f'Context: {context}' if context else ''}
-
-Your task:
-1. Identify the type of problem (e.g., financial analysis, philosophical inquiry, technical research, etc.)
-2. Determine the best research approach for this specific problem type
-3. Create a step-by-step research plan with 3-5 concrete steps
-4. For each step, specify:
-   - What to research or investigate
-   - Which tools or methods to use (web search, code analysis, data gathering, etc.)
-   - Expected outcomes
-
-Return your plan in JSON format:
-{{
-  "problem_type": "...",
-  "research_approach": "...",
-  "steps": [
-    {{
-      "step_number": 1,
-      "description": "...",
-      "methods": ["web_search", "code_analysis", etc.],
-      "expected_outcome": "..."
-    }},
-    ...
-  ]
-}}
-
-Be specific and actionable. Adapt your plan to the problem type."""
+        planning_prompt = _PLANNING_PROMPT.format(
+            problem=problem,
+            context_line=f'Context: {context}' if context else '',
+        )
         
         response = self.ai.chat(
             planning_prompt,
@@ -159,12 +329,13 @@ Be specific and actionable. Adapt your plan to the problem type."""
                 plan_data = json.loads(response[json_start:json_end])
                 plan = ResearchPlan(problem, plan_data.get("steps", []))
                 
-                self.on_output(f"\nProblem Type: {plan_data.get('problem_type', 'Unknown')}")
-                self.on_output(f"Research Approach: {plan_data.get('research_approach', 'Standard')}")
-                self.on_output(f"\nResearch Plan ({len(plan.steps)} steps):")
-                for step in plan.steps:
-                    self.on_output(f"  {step['step_number']}. {step['description']}")
-                    self.on_output(f"     Methods: {', '.join(step.get('methods', []))}")
+                if self.on_output is not _noop:
+                    self.on_output(f"\nProblem Type: {plan_data.get('problem_type', 'Unknown')}")
+                    self.on_output(f"Research Approach: {plan_data.get('research_approach', 'Standard')}")
+                    self.on_output(f"\nResearch Plan ({len(plan.steps)} steps):")
+                    for step in plan.steps:
+                        self.on_output(f"  {step['step_number']}. {step['description']}")
+                        self.on_output(f"     Methods: {', '.join(step.get('methods', []))}")
                 
                 return plan
         except Exception as e:
@@ -197,6 +368,7 @@ Be specific and actionable. Adapt your plan to the problem type."""
         results = []
         
         for step in self.current_plan.steps:
+            self._check_cancelled()
             self.on_output(f"\n--- Step {step['step_number']}: {step['description']} ---")
             
             step_result = self._execute_research_step(step)
@@ -222,28 +394,30 @@ Be specific and actionable. Adapt your plan to the problem type."""
         methods = step.get('methods', [])
         findings = []
         
-        # Execute based on methods specified
+        # Execute based on methods specified: (method, label, runner)
+        branches = []
         if 'web_search' in methods:
-            search_result = self._perform_web_search(step)
-            findings.append({"method": "web_search", "result": search_result})
-            self.on_output(f"[Web Search] {search_result[:300]}...")
-        
+            branches.append(("web_search", "Web Search", self._perform_web_search))
         if 'code_analysis' in methods or 'code' in methods:
-            code_result = self._perform_code_analysis(step)
-            findings.append({"method": "code_analysis", "result": code_result})
-            self.on_output(f"[Code Analysis] {code_result[:300]}...")
-        
+            branches.append(("code_analysis", "Code Analysis", self._perform_code_analysis))
         if 'data_gathering' in methods:
-            data_result = self._gather_data(step)
-            findings.append({"method": "data_gathering", "result": data_result})
-            self.on_output(f"[Data Gathering] {data_result[:300]}...")
+            branches.append(("data_gathering", "Data Gathering", self._gather_data))
+        
+        # Run one after another: the branches share self.ai, whose conversation
+        # history is not synchronised, and each sees the earlier ones through it
+        for method, label, run in branches:
+            branch_result = run(step)
+            findings.append({"method": method, "result": branch_result})
+            if self.on_output is not _noop:
+                self.on_output(f"[{label}] {branch_result[:300]}...")
         
         # If no specific method or 'analysis' method, use AI reasoning
         if not findings or 'analysis' in methods:
             context = "\n\n".join([f"{f['method']}: {f['result']}" for f in findings])
             analysis = self._perform_analysis(step, context)
             findings.append({"method": "analysis", "result": analysis})
-            self.on_output(f"[Analysis] {analysis[:300]}...")
+            if self.on_output is not _noop:
+                self.on_output(f"[Analysis] {analysis[:300]}...")
         
         return {
             "step": step['step_number'],
@@ -257,11 +431,10 @@ Be specific and actionable. Adapt your plan to the problem type."""
         search_query = step['description']
         
         # Use AI to generate better search query
-        query_prompt = f"""Generate a focused search query for: {search_query}
-
-Problem context: {self.current_plan.problem}
-
-Return only the search query, optimized for getting the most relevant results."""
+        query_prompt = _QUERY_PROMPT.format(
+            query=search_query,
+            problem=self.current_plan.problem,
+        )
         
         optimized_query = self.ai.chat(
             query_prompt,
@@ -278,17 +451,10 @@ Return only the search query, optimized for getting the most relevant results.""
     
     def _perform_code_analysis(self, step: Dict[str, Any]) -> str:
         """Perform code analysis or execute code for the research step."""
-        code_prompt = f"""You need to perform code analysis or write code to help with this research step:
-
-Step: {step['description']}
-Problem: {self.current_plan.problem}
-
-Determine if code execution would help answer this step. If yes:
-1. Write Python code to analyze data, make calculations, or gather information
-2. Execute the code
-3. Provide the results
-
-If code won't help, explain why and provide alternative insights."""
+        code_prompt = _CODE_PROMPT.format(
+            step=step['description'],
+            problem=self.current_plan.problem,
+        )
         
         result = self.ai.chat(
             code_prompt,
@@ -300,12 +466,10 @@ If code won't help, explain why and provide alternative insights."""
     
     def _gather_data(self, step: Dict[str, Any]) -> str:
         """Gather data through various means."""
-        data_prompt = f"""Gather relevant data for this research step:
-
-Step: {step['description']}
-Problem: {self.current_plan.problem}
-
-Use available tools to gather data. Be thorough and specific."""
+        data_prompt = _DATA_PROMPT.format(
+            step=step['description'],
+            problem=self.current_plan.problem,
+        )
         
         result = self.ai.chat(
             data_prompt,
@@ -317,15 +481,11 @@ Use available tools to gather data. Be thorough and specific."""
     
     def _perform_analysis(self, step: Dict[str, Any], context: str) -> str:
         """Perform analytical reasoning on gathered information."""
-        analysis_prompt = f"""Analyze the information gathered for this research step:
-
-Step: {step['description']}
-Problem: {self.current_plan.problem}
-
-Information gathered:
-{context}
-
-Provide deep analysis and insights. Be critical and thorough."""
+        analysis_prompt = _ANALYSIS_PROMPT.format(
+            step=step['description'],
+            problem=self.current_plan.problem,
+            context=context,
+        )
         
         result = self.ai.chat(
             analysis_prompt,
@@ -341,30 +501,24 @@ Provide deep analysis and insights. Be critical and thorough."""
             return False
         
         # Use AI to evaluate if iteration would help
-        eval_prompt = f"""Evaluate if this research step needs refinement:
-
-Step: {step['description']}
-Result: {json.dumps(result, indent=2)[:1000]}
-
-Are the findings sufficient and high-quality? Answer with YES or NO, followed by brief explanation."""
+        eval_prompt = _EVAL_PROMPT.format(
+            step=step['description'],
+            result=json_head(result, cap=1000),
+        )
         
-        response = self.ai.chat(
+        sufficient = self.ai.ask_yes_no(
             eval_prompt,
-            system_prompt="You are a research quality evaluator.",
-            use_tools=False
+            system_prompt="You are a research quality evaluator. Reply with YES or NO only."
         )
         
-        return "no" in response.lower()[:50]
+        return sufficient is False
     
     def _refine_research_step(self, step: Dict[str, Any], previous_result: Dict[str, Any]) -> Dict[str, Any]:
         """Refine and improve research for a step."""
-        refine_prompt = f"""The previous research for this step needs improvement:
-
-Step: {step['description']}
-Previous findings: {json.dumps(previous_result, indent=2)[:1000]}
-
-Conduct additional research to fill gaps, verify information, or explore alternative angles.
-Be more thorough this time."""
+        refine_prompt = _REFINE_PROMPT.format(
+            step=step['description'],
+            previous=json_head(previous_result, cap=1000),
+        )
         
         refinement = self.ai.chat(
             refine_prompt,
@@ -389,20 +543,10 @@ Be more thorough this time."""
             for r in research_results
         ])
         
-        synthesis_prompt = f"""Synthesize all research findings into a comprehensive, well-reasoned answer:
-
-Original Problem: {self.current_plan.problem}
-
-Research Findings:
-{findings_text}
-
-Provide:
-1. A clear, direct answer to the problem
-2. Supporting evidence from the research
-3. Key insights and conclusions
-4. Any limitations or caveats
-
-Be thorough but concise. Format the answer in a professional, readable manner."""
+        synthesis_prompt = _SYNTHESIS_PROMPT.format(
+            problem=self.current_plan.problem,
+            findings=findings_text,
+        )
         
         final_answer = self.ai.chat(
             synthesis_prompt,
@@ -422,7 +566,7 @@ Be thorough but concise. Format the answer in a professional, readable manner.""
         if not self.research_id or not self.current_plan:
             return
         
-        state_file = os.path.join(_RESEARCH_STATE_DIR, f"{self.research_id}_state.json")
+        state_file = _STATE_DIR / f"{self.research_id}_state.json"
         try:
             with open(state_file, 'w') as f:
                 json.dump(self.current_plan.to_dict(), f, indent=2)
@@ -433,21 +577,92 @@ Be thorough but concise. Format the answer in a professional, readable manner.""
     
     def _save_research_results(self, results: Dict[str, Any]):
         """Save final research results to disk."""
-        results_file = os.path.join(_RESEARCH_STATE_DIR, f"{self.research_id}_results.json")
+        results_file = _STATE_DIR / f"{self.research_id}_results.json"
         try:
             with open(results_file, 'w') as f:
                 json.dump(results, f, indent=2)
             self.on_output(f"\nResults saved to: {results_file}")
         except (IOError, OSError, TypeError) as e:
             self.on_output(f"Warning: Could not save results: {e}")
+            return
+        
+        entry = {
+            "id": self.research_id,
+            "problem": results.get("problem", "")[:200],
+            "completed_at": results.get("completed_at"),
+            "file": results_file.name,
+        }
+        try:
+            _append_index_entry(entry)
+        except OSError as e:
+            self.on_output(f"[Debug] Could not update research index: {e}")
+
+
+def _append_index_entry(entry: Dict[str, Any]):
+    """Append a single record to the research index (O_APPEND keeps lines whole)."""
+    line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+    fd = os.open(_INDEX_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def iter_research_index() -> Iterator[Dict[str, Any]]:
+    """Yield index records of past research runs, oldest first.
+
+    Full results are not loaded; use load_research_results() for that.
+    """
+    try:
+        with open(_INDEX_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def load_research_results(research_id: str) -> Optional[Dict[str, Any]]:
+    """Load the full saved results of a past research run, or None if missing."""
+    try:
+        with open(_STATE_DIR / f"{research_id}_results.json", 'r') as f:
+            return json.load(f)
+    except (IOError, OSError, json.JSONDecodeError):
+        return None
+
+
+def rebuild_research_index() -> int:
+    """Recreate the index from result files on disk. Returns the record count."""
+    entries = []
+    with os.scandir(_STATE_DIR) as it:
+        for entry in it:
+            if not entry.is_file() or not entry.name.endswith("_results.json"):
+                continue
+            research_id = entry.name[:-len("_results.json")]
+            results = load_research_results(research_id) or {}
+            entries.append((entry.stat().st_mtime, {
+                "id": research_id,
+                "problem": results.get("problem", "")[:200],
+                "completed_at": results.get("completed_at"),
+                "file": entry.name,
+            }))
+    entries.sort(key=lambda e: e[0])
+    tmp = _INDEX_FILE.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        for _, record in entries:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    os.replace(tmp, _INDEX_FILE)
+    return len(entries)
 
 
 class ResearchReviewer:
     """A critical reviewer that evaluates research and provides feedback."""
     
-    def __init__(self, on_output: Callable[[str], None] = None):
-        self.ai = get_ai_client()
-        self.on_output = on_output or (lambda text: None)
+    def __init__(self, on_output: Callable[[str], None] = None, ai=None):
+        self.ai = ai if ai is not None else get_ai_client()
+        self.on_output = on_output if on_output is not None else _noop
         self.review_history = []
     
     def review(self, research_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -468,25 +683,11 @@ class ResearchReviewer:
         final_answer = research_result.get('final_answer', '')
         plan = research_result.get('plan', {})
         
-        review_prompt = f"""You are a critical research reviewer. Thoroughly review this research:
-
-Problem: {problem}
-
-Research Plan:
-{json.dumps(plan.get('steps', []), indent=2)}
-
-Final Answer:
-{final_answer}
-
-Provide a comprehensive review covering:
-1. Quality Score (1-10): Rate the overall quality
-2. Strengths: What was done well?
-3. Weaknesses: What gaps or issues exist?
-4. Accuracy: Is the information accurate and well-supported?
-5. Completeness: Is anything missing?
-6. Suggestions: How can this be improved?
-
-Be honest and constructive. Don't hold back on criticism if deserved."""
+        review_prompt = _REVIEW_PROMPT.format(
+            problem=problem,
+            steps=json.dumps(plan.get('steps', []), indent=2),
+            final_answer=final_answer,
+        )
         
         review_response = self.ai.chat(
             review_prompt,
@@ -531,7 +732,8 @@ Be honest and constructive. Don't hold back on criticism if deserved."""
         return 5  # Default middle score
     
     def discuss_with_researcher(self, research_agent: DeepResearchAgent, 
-                               review: Dict[str, Any], max_rounds: int = 3) -> Dict[str, Any]:
+                               review: Dict[str, Any], max_rounds: int = 3,
+                               speculative: bool = False) -> Dict[str, Any]:
         """
         Have a discussion with the researcher to improve the answer.
         
@@ -539,6 +741,11 @@ Be honest and constructive. Don't hold back on criticism if deserved."""
             research_agent: The research agent to discuss with
             review: The review feedback
             max_rounds: Maximum discussion rounds
+            speculative: Generate the next round's feedback on the researcher's
+                         reply while agreement is being checked. Saves the
+                         (short) agreement check per round, but when agreement
+                         is reached a full feedback call has been paid for
+                         and is thrown away.
             
         Returns:
             Dict containing the final agreed-upon answer and discussion history
@@ -549,12 +756,19 @@ Be honest and constructive. Don't hold back on criticism if deserved."""
         
         discussion_history = []
         current_answer = research_agent.current_plan.findings[-1] if research_agent.current_plan.findings else {}
+        next_feedback = None  # Future for the speculatively generated feedback
         
         for round_num in range(1, max_rounds + 1):
             self.on_output(f"\n--- Discussion Round {round_num} ---\n")
             
-            # Reviewer provides specific feedback
-            feedback = self._generate_feedback(current_answer, review, round_num)
+            # Reviewer provides specific feedback (prefetched if available)
+            if next_feedback is not None:
+                feedback = next_feedback.result()
+                next_feedback = None
+                # It ran on a private client; record the turn as a direct call would
+                self.ai.record_turn(self._feedback_prompt(current_answer, review, round_num), feedback)
+            else:
+                feedback = self._generate_feedback(current_answer, review, round_num)
             self.on_output(f"[Reviewer] {feedback}\n")
             discussion_history.append({"role": "reviewer", "content": feedback})
             
@@ -563,11 +777,27 @@ Be honest and constructive. Don't hold back on criticism if deserved."""
             self.on_output(f"[Researcher] {response}\n")
             discussion_history.append({"role": "researcher", "content": response})
             
+            # Next round's feedback needs the researcher's reply (now in the
+            # history), but not the agreement verdict, so generate it while
+            # agreement is checked. It gets its own client so the two calls
+            # don't race on the shared conversation history.
+            if speculative and round_num < max_rounds:
+                next_feedback = _speculative_executor.submit(
+                    self._generate_feedback, current_answer, review, round_num + 1,
+                    _private_client(self.ai)
+                )
+            
             # Check if agreement is reached
             if self._check_agreement(feedback, response):
                 self.on_output("\n[Agreement Reached] Both parties agree on the answer.")
                 break
         
+        # Discard prefetched feedback we no longer need. cancel() only stops it
+        # if it hasn't started; a call already running still completes (and is
+        # billed), its result is just ignored.
+        if next_feedback is not None:
+            next_feedback.cancel()
+        
         return {
             "final_answer": response,
             "discussion_history": discussion_history,
@@ -575,18 +805,19 @@ Be honest and constructive. Don't hold back on criticism if deserved."""
             "agreement_reached": round_num < max_rounds
         }
     
-    def _generate_feedback(self, answer: Any, review: Dict[str, Any], round_num: int) -> str:
-        """Generate specific feedback for the researcher."""
-        feedback_prompt = f"""Based on your review, provide specific, actionable feedback for the researcher:
-
-Review: {review.get('review_text', '')[:1000]}
-Current Answer: {str(answer)[:500]}
-Discussion Round: {round_num}
-
-Give 2-3 specific points the researcher should address to improve the answer."""
-        
-        return self.ai.chat(
-            feedback_prompt,
+    @staticmethod
+    def _feedback_prompt(answer: Any, review: Dict[str, Any], round_num: int) -> str:
+        return _FEEDBACK_PROMPT.format(
+            review=review.get('review_text', '')[:1000],
+            answer=str(answer)[:500],
+            round_num=round_num,
+        )
+    
+    def _generate_feedback(self, answer: Any, review: Dict[str, Any], round_num: int,
+                           ai: AIClient = None) -> str:
+        """Generate specific feedback for the researcher (on ``ai`` if given)."""
+        return (ai or self.ai).chat(
+            self._feedback_prompt(answer, review, round_num),
             system_prompt="You are a constructive reviewer. Give specific, actionable feedback.",
             use_tools=False
         )
@@ -594,14 +825,11 @@ Give 2-3 specific points the researcher should address to improve the answer."""
     def _researcher_response(self, research_agent: DeepResearchAgent, 
                            feedback: str, current_answer: Any) -> str:
         """Get researcher's response to feedback."""
-        response_prompt = f"""You received this feedback on your research:
-
-Feedback: {feedback}
-
-Original Problem: {research_agent.current_plan.problem if research_agent.current_plan else 'Unknown'}
-Current Answer: {str(current_answer)[:500]}
-
-Respond to the feedback and provide an improved answer if needed. Be specific about what you're changing and why."""
+        response_prompt = _RESPONSE_PROMPT.format(
+            feedback=feedback,
+            problem=research_agent.current_plan.problem if research_agent.current_plan else 'Unknown',
+            answer=str(current_answer)[:500],
+        )
         
         return research_agent.ai.chat(
             response_prompt,
@@ -611,7 +839,22 @@ Respond to the feedback and provide an improved answer if needed. Be specific ab
     
     def _check_agreement(self, feedback: str, response: str) -> bool:
         """Check if reviewer and researcher have reached agreement."""
-        # Simple heuristic: look for agreement keywords
+        question = f"""Reviewer feedback:
+{feedback[:1000]}
+
+Researcher response:
+{response[:1500]}
+
+Does the researcher accept the feedback, so that both parties agree on the answer?"""
+        
+        agreed = self.ai.ask_yes_no(
+            question,
+            system_prompt="You judge whether a research discussion has reached agreement. Reply with YES or NO only."
+        )
+        if agreed is not None:
+            return agreed
+        
+        # Unclear verdict: fall back to keyword heuristic
         agreement_keywords = ['agree', 'acceptable', 'satisfactory', 'good enough', 'sounds good']
         response_lower = response.lower()
         return any(keyword in response_lower for keyword in agreement_keywords)
@@ -620,13 +863,40 @@ Respond to the feedback and provide an improved answer if needed. Be specific ab
 class ResearchOrchestrator:
     """Orchestrates the research-review cycle with autonomous discussion."""
     
-    def __init__(self, on_output: Callable[[str], None] = None):
+    def __init__(self, on_output: Callable[[str], None] = None, ai=None):
+        """
+        Args:
+            on_output: Callback to send output/progress updates to the UI
+            ai: AIClient to use; defaults to the shared singleton
+        """
         self.on_output = on_output or print
-        self.research_agent = DeepResearchAgent(on_output=self.on_output)
-        self.reviewer = ResearchReviewer(on_output=self.on_output)
+        # One client for both roles so they share connections and history
+        self.ai = ai if ai is not None else get_ai_client()
+        self.research_agent = DeepResearchAgent(on_output=self.on_output, ai=self.ai)
+        self.reviewer = ResearchReviewer(on_output=self.on_output, ai=self.ai)
+        self._cancelled = threading.Event()
+        self._pending = None  # (agent, buffered output, future) for a speculative attempt
+    
+    def cancel(self):
+        """Stop conduct_research at the next step, attempt or review boundary.
+        
+        The LLM call in flight still completes. Once cancelled, the
+        orchestrator stays cancelled.
+        """
+        self._cancelled.set()
+        self.research_agent.cancel()
+        pending = self._pending
+        if pending is not None:
+            pending[0].cancel()
+            pending[2].cancel()
+    
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            raise ResearchCancelled(self.research_agent.research_id)
     
     def conduct_research(self, problem: str, context: str = "", 
-                        min_score: int = 7, max_attempts: int = 2) -> Dict[str, Any]:
+                        min_score: int = 7, max_attempts: int = 2,
+                        speculative: bool = False) -> Dict[str, Any]:
         """
         Conduct complete research with review and iteration.
         
@@ -635,6 +905,9 @@ class ResearchOrchestrator:
             context: Additional context
             min_score: Minimum acceptable review score (1-10)
             max_attempts: Maximum research attempts
+            speculative: Once a review fails, start the next attempt (with the
+                         review feedback) while the discussion runs. The retry
+                         uses its own client, so it does not see the discussion.
             
         Returns:
             Dict with final research results, reviews, and discussions
@@ -645,16 +918,31 @@ class ResearchOrchestrator:
         self.on_output(f"{'#'*80}\n")
         
         all_attempts = []
+        pending = None  # (agent, buffered output, future) for a speculative attempt
         
         for attempt in range(1, max_attempts + 1):
+            self._check_cancelled()
             self.on_output(f"\n{'='*80}")
             self.on_output(f"RESEARCH ATTEMPT {attempt}/{max_attempts}")
             self.on_output(f"{'='*80}\n")
             
-            # Conduct research
-            research_result = self.research_agent.research(problem, context)
+            # Conduct research (or adopt the speculative attempt)
+            if pending is not None:
+                agent, buffered, future = pending
+                pending = None
+                try:
+                    research_result = future.result()
+                except CancelledError:
+                    raise ResearchCancelled(agent.research_id)
+                for line in buffered:
+                    self.on_output(line)
+                agent.on_output = self.on_output
+            else:
+                agent = self.research_agent
+                research_result = agent.research(problem, context)
             
             # Review research
+            self._check_cancelled()
             review = self.reviewer.review(research_result)
             
             attempt_data = {
@@ -672,16 +960,27 @@ class ResearchOrchestrator:
             else:
                 self.on_output(f"\n✗ Score {review['score']}/10 below threshold {min_score}. Discussing improvements...")
                 
+                # Update context for next attempt
+                context += f"\n\nPrevious attempt feedback: {review['review_text'][:300]}"
+                
+                # Start the next attempt now so it runs alongside the discussion
+                if speculative and attempt < max_attempts:
+                    buffered = []
+                    spec_agent = DeepResearchAgent(on_output=buffered.append,
+                                                   ai=_private_client(self.ai))
+                    future = _speculative_executor.submit(spec_agent.research, problem, context)
+                    pending = self._pending = (spec_agent, buffered, future)
+                    if self._cancelled.is_set():
+                        self.cancel()  # cancelled while it was being started
+                
                 # Have discussion to improve
+                self._check_cancelled()
                 discussion = self.reviewer.discuss_with_researcher(
-                    self.research_agent, review, max_rounds=2
+                    agent, review, max_rounds=2
                 )
                 attempt_data['discussion'] = discussion
                 attempt_data['accepted'] = False
                 all_attempts.append(attempt_data)
-                
-                # Update context for next attempt
-                context += f"\n\nPrevious attempt feedback: {review['review_text'][:300]}"
         
         final_result = {
             "problem": problem,
@@ -700,7 +999,8 @@ class ResearchOrchestrator:
         return final_result
 
 
-def run_deep_research(problem: str, context: str = "", on_output: Callable[[str], None] = None) -> Dict[str, Any]:
+def run_deep_research(problem: str, context: str = "", on_output: Callable[[str], None] = None,
+                      ai=None) -> Dict[str, Any]:
     """
     Convenience function to run a complete deep research session.
     
@@ -708,9 +1008,10 @@ def run_deep_research(problem: str, context: str = "", on_output: Callable[[str]
         problem: The problem or question to research
         context: Additional context or constraints
         on_output: Optional callback for progress updates
+        ai: AIClient to use; defaults to the shared singleton
         
     Returns:
         Complete research results with reviews and discussions
     """
-    orchestrator = ResearchOrchestrator(on_output=on_output)
+    orchestrator = ResearchOrchestrator(on_output=on_output, ai=ai)
     return orchestrator.conduct_research(problem, context)
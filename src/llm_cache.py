@@ -0,0 +1,80 @@
+"""Small on-disk cache for LLM responses that are a pure function of their inputs."""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from config import DATA_DIR
+
+
+LLM_CACHE_DB = os.path.join(DATA_DIR, "llm_cache.db")
+DEFAULT_TTL = 3600  # seconds
+
+_db = None
+_lock = threading.Lock()
+
+
+def _key(parts: tuple) -> str:
+    """Hash the key parts (model, prompts, ...) into a fixed-size cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _connect():
+    """Open the cache database once. Returns None if it cannot be opened."""
+    global _db
+    if _db is None:
+        try:
+            _db = sqlite3.connect(LLM_CACHE_DB, check_same_thread=False, isolation_level=None)
+            _db.execute("PRAGMA journal_mode=WAL")
+            _db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+        except Exception as e:
+            print(f"[LLMCache] Could not open cache: {e}")
+            _db = False
+    return _db or None
+
+
+def get(parts: tuple) -> Optional[str]:
+    """Return the cached response for ``parts``, or None if missing or expired."""
+    key = _key(parts)
+    with _lock:
+        db = _connect()
+        if db is None:
+            return None
+        try:
+            row = db.execute("SELECT value, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return row[0]
+        except Exception as e:
+            print(f"[LLMCache] Lookup failed: {e}")
+            return None
+
+
+def put(parts: tuple, value: str, ttl: int = DEFAULT_TTL):
+    """Cache ``value`` for ``parts`` for ``ttl`` seconds, dropping expired entries."""
+    key = _key(parts)
+    now = time.time()
+    with _lock:
+        db = _connect()
+        if db is None:
+            return
+        try:
+            # get() only removes an expired row when its key is looked up again
+            db.execute("DELETE FROM responses WHERE expires < ?", (now,))
+            db.execute(
+                "INSERT OR REPLACE INTO responses(key, value, expires) VALUES (?, ?, ?)",
+                (key, value, now + ttl)
+            )
+        except Exception as e:
+            print(f"[LLMCache] Could not store response: {e}")
@@ -6,8 +6,13 @@ Two-column layout:
   Right-bottom pane: critic AI agent output (reviews primary agent, provides feedback)
 """
 import curses
+import curses.textpad
 import os
+from concurrent.futures import ThreadPoolExecutor
+import re
+import select
 import subprocess
+import sys
 import tempfile
 import threading
 import textwrap
@@ -19,32 +24,150 @@ from task_manager import get_task_manager, list_task_folders
 from autonomous_tasks import add_scheduled_task, remove_scheduled_task, list_configured_tasks
 from autonomous_agent import AutonomousAgent, CriticAgent, AgentMailbox, _SESSION_FILE
 from deep_research_agent import run_deep_research
-from config import AGENT_NAME
+from config import AGENT_NAME, DATA_DIR
 
 
 # Maximum lines kept in each pane's buffer
 MAX_BUFFER_LINES = 500
 
+# Input history: entries kept in memory and loaded back from disk at start
+MAX_HISTORY_ENTRIES = 1000
+_HISTORY_FILE = os.path.join(DATA_DIR, "input_history.txt")
+
+# Multi-line editor input: comment lines and trailing whitespace (newlines
+# excluded, so blank lines survive), each removed in a single pass
+_COMMENT_LINE_RE = re.compile(r"^[^\S\n]*#[^\n]*(?:\n|$)", re.M)
+_TRAILING_SPACE_RE = re.compile(r"[^\S\n]+$", re.M)
+
+# Upper bound on how long the UI sleeps with no keys or pane output (seconds),
+# so terminal resizes and status changes are still picked up
+IDLE_REDRAW_SECONDS = 1.0
+
+# After pane output wakes the UI, wait this long so the rest of a burst
+# lands in the same frame (seconds)
+FRAME_DEBOUNCE_SECONDS = 0.03
+
+# Line-drawing characters; curses only defines ACS_* after initscr(),
+# so these are filled in by _load_acs() once the UI has started
+_VLINE = _HLINE = _LTEE = _CKBOARD = None
+
+
+def _load_acs():
+    global _VLINE, _HLINE, _LTEE, _CKBOARD
+    _VLINE = curses.ACS_VLINE
+    _HLINE = curses.ACS_HLINE
+    _LTEE = curses.ACS_LTEE
+    _CKBOARD = curses.ACS_CKBOARD
+
 
 class PaneBuffer:
-    """Thread-safe scrollable text buffer for a pane."""
+    """Thread-safe scrollable text buffer for a pane.
+
+    Lines live in a fixed-size ring indexed by a monotonic tail counter.
+    Writers serialise on a lock; readers take no lock and just slice the
+    ring up to the tail they observed (strings are immutable, so a
+    concurrent write can at worst show a line one frame early).
+    """
 
     def __init__(self, maxlines: int = MAX_BUFFER_LINES):
-        self._lines: deque = deque(maxlen=maxlines)
-        self._lock = threading.Lock()
+        self._size = maxlines
+        self._ring = [""] * maxlines
+        self._tail = 0  # total lines ever written; next slot is _tail % _size
+        self._head = 0  # first visible line (moved forward by clear())
+        self._lock = threading.Lock()  # writers only
+        self._version = 0  # bumped on every change, used to reuse wrapped output
+        # Wrap cache: line -> wrapped rows, valid for a single width
+        self._wrap_width = None
+        self._wrap_cache: dict = {}
+        self._wrapped = None  # (version, width, flattened rows)
+        self._listener = None  # called after every change, e.g. to wake the UI
+        self._snapshot = (0, ())  # (version, lines) from the last get_lines()
+
+    def set_listener(self, callback):
+        """Register a no-argument callable invoked whenever the buffer changes."""
+        self._listener = callback
 
     def add(self, text: str):
-        with self._lock:
-            for line in text.split("\n"):
-                self._lines.append(line)
+        self._append(text.split("\n"))
 
-    def get_lines(self) -> list:
+    def add_many(self, texts: list):
+        """Add several (possibly multi-line) texts as one batch."""
+        self._append("\n".join(texts).split("\n"))
+
+    def _append(self, lines: list):
+        # Only the newest ``_size`` lines can survive, so drop the rest up front
+        if len(lines) > self._size:
+            lines = lines[-self._size:]
         with self._lock:
-            return list(self._lines)
+            ring, size, tail = self._ring, self._size, self._tail
+            start = tail % size
+            first = lines[:size - start]
+            ring[start:start + len(first)] = first
+            rest = lines[len(first):]
+            ring[:len(rest)] = rest
+            self._tail = tail + len(lines)
+            self._version += 1
+        if self._listener:
+            self._listener()
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every add/clear."""
+        return self._version
+
+    def get_lines(self) -> tuple:
+        """Return the buffered lines, reusing the last snapshot if nothing changed."""
+        version = self._version
+        snapshot = self._snapshot
+        if snapshot[0] == version:
+            return snapshot[1]
+        tail = self._tail
+        head = max(self._head, tail - self._size)
+        if tail <= head:
+            lines = ()
+        else:
+            start, end = head % self._size, tail % self._size
+            ring = self._ring
+            lines = tuple(ring[start:end] if start < end else ring[start:] + ring[:end])
+        self._snapshot = (version, lines)
+        return lines
+
+    def get_wrapped(self, width: int) -> list:
+        """Return all lines wrapped to ``width``, wrapping only lines not seen before."""
+        version = self._version
+        cached = self._wrapped
+        if cached is not None and cached[0] == version and cached[1] == width:
+            return cached[2]
+        lines = self.get_lines()
+
+        if width != self._wrap_width or len(self._wrap_cache) > 2 * len(lines) + 64:
+            # Width changed or the cache holds many evicted lines: start over
+            self._wrap_width = width
+            self._wrap_cache = {}
+        cache = self._wrap_cache
+
+        wrapped = []
+        for line in lines:
+            rows = cache.get(line)
+            if rows is None:
+                rows = (textwrap.wrap(line, width) or [""]) if line else [""]
+                cache[line] = rows
+            wrapped.extend(rows)
+
+        self._wrapped = (version, width, wrapped)
+        return wrapped
 
     def clear(self):
         with self._lock:
-            self._lines.clear()
+            self._head = self._tail
+            self._version += 1
+        if self._listener:
+            self._listener()
+
+
+def _strip_comment_lines(text: str) -> str:
+    """Drop '#' comment lines and trailing whitespace from multi-line input."""
+    return _TRAILING_SPACE_RE.sub('', _COMMENT_LINE_RE.sub('', text)).strip()
 
 
 def get_multiline_input(initial_text: str = "") -> str:
@@ -71,18 +194,17 @@ def get_multiline_input(initial_text: str = "") -> str:
         tf.flush()
     
     try:
-        # Open the editor
-        subprocess.call([editor, temp_path])
+        # Open the editor. posix_spawn skips the fork + exec-status pipe
+        # read that Popen does, which can stall under heavy disk IO.
+        if hasattr(os, "posix_spawnp"):
+            pid = os.posix_spawnp(editor, [editor, temp_path], os.environ)
+            os.waitpid(pid, 0)
+        else:
+            subprocess.call([editor, temp_path])
         
-        # Read the content back
+        # Read the content back, dropping comment lines and trailing whitespace
         with open(temp_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Filter out comment lines and strip trailing whitespace
-        content_lines = [line.rstrip() for line in lines if not line.strip().startswith('#')]
-        content = '\n'.join(content_lines).strip()
-        
-        return content
+            return _strip_comment_lines(f.read())
     finally:
         # Clean up temp file
         try:
@@ -91,6 +213,33 @@ def get_multiline_input(initial_text: str = "") -> str:
             pass
 
 
+def _load_history() -> deque:
+    """Load the most recent input history entries from disk.
+
+    The file is append-only while running; if it has grown past the cap it
+    is rewritten here with just the entries that were kept.
+    """
+    history = deque(maxlen=MAX_HISTORY_ENTRIES)
+    total = 0
+    try:
+        with open(_HISTORY_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line:
+                    history.append(line)
+                    total += 1
+    except OSError:
+        return history
+
+    if total > MAX_HISTORY_ENTRIES:
+        try:
+            with open(_HISTORY_FILE, "w", encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in history)
+        except OSError:
+            pass
+    return history
+
+
 class SplitTerminal:
     """Curses-based split-screen terminal: left control + right stacked agent/critic."""
 
@@ -100,9 +249,12 @@ class SplitTerminal:
         self.left_buf = PaneBuffer()
         self.agent_buf = PaneBuffer()   # right-top: autonomous agent
         self.critic_buf = PaneBuffer()  # right-bottom: critic agent
-        self.input_line = ""
-        self.input_history: list = []
-        self.input_hist_idx = -1
+        self.input_line: list = []  # characters typed so far, joined on submit
+        self.input_history: deque = _load_history()
+        self.input_hist_idx = len(self.input_history)
+        # input_history plus a trailing "" so moving past the newest entry
+        # is a plain lookup that yields an empty line
+        self._history_view: list = list(self.input_history) + [""]
         self.running = False
 
         # Scroll state for right panes (0 = pinned to bottom / auto-scroll)
@@ -117,6 +269,31 @@ class SplitTerminal:
         self.auto_agent: AutonomousAgent = None
         self.critic_agent: CriticAgent = None
         self._stdscr = None
+        self._cp = [0] * 6  # colour pair attributes, indexed by pair number
+
+        # Shared workers for chat/search requests instead of a thread per call
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="chat")
+
+        # Last rendered frame per pane, so _draw only repaints rows that changed
+        self._shadow: dict = {}
+        self._last_size = None
+        self._size_ok = False  # recomputed whenever the size changes
+
+        # Set whenever something on screen may have changed; the main loop
+        # only redraws when it is set, so bursts coalesce into one frame
+        self._dirty = threading.Event()
+        self._dirty.set()
+
+        # Self-pipe written by the pane buffers so the main loop can block in
+        # select() until a key arrives or there is new output to show. Windows
+        # consoles can't be select()ed, so there we keep polling getch instead.
+        self._wake_r = self._wake_w = None
+        if os.name != "nt":
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+            os.set_blocking(self._wake_w, False)
+        for buf in (self.left_buf, self.agent_buf, self.critic_buf):
+            buf.set_listener(self._wake)
 
         # Commands (same set as old Terminal, plus agent controls)
         self.commands = {
@@ -160,13 +337,17 @@ class SplitTerminal:
             self.auto_agent.stop()
         if self.critic_agent:
             self.critic_agent.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
     # --------------------------------------------------------------- curses
     def _main(self, stdscr):
         self._stdscr = stdscr
+        _load_acs()
         curses.curs_set(1)
-        stdscr.nodelay(False)
-        stdscr.timeout(100)  # 100 ms refresh
+        if self._wake_r is not None:
+            stdscr.timeout(0)    # only called once select() says a key is waiting
+        else:
+            stdscr.timeout(100)  # 100 ms refresh
 
         # Colours
         curses.start_color()
@@ -176,6 +357,7 @@ class SplitTerminal:
         curses.init_pair(3, curses.COLOR_YELLOW, -1)   # input prompt
         curses.init_pair(4, curses.COLOR_RED, -1)      # separator
         curses.init_pair(5, curses.COLOR_MAGENTA, -1)  # right header (critic)
+        self._cp = [0] + [curses.color_pair(i) for i in range(1, 6)]
 
         self.running = True
 
@@ -192,14 +374,18 @@ class SplitTerminal:
 
         # Main loop
         while self.running:
-            self._draw(stdscr)
-            self._handle_input(stdscr)
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self._draw(stdscr)
+            if self._wait_for_event():
+                self._handle_input(stdscr)
 
         # Cleanup
         if self.auto_agent:
             self.auto_agent.stop()
         if self.critic_agent:
             self.critic_agent.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
     def _launch_auto_agent(self):
         """Start the autonomous agent feeding into the right-top pane."""
@@ -222,13 +408,19 @@ class SplitTerminal:
         self.critic_agent.start()
 
     # --------------------------------------------------------------- draw
-    def _draw(self, stdscr):
+    def _draw(self, stdscr, present: bool = True):
         try:
             height, width = stdscr.getmaxyx()
-            if height < 8 or width < 60:
-                stdscr.clear()
-                stdscr.addstr(0, 0, "Terminal too small! Need 60+ cols, 8+ rows.")
-                stdscr.refresh()
+            if (height, width) != self._last_size:
+                # Layout changed: start from a blank screen and forget the shadow
+                self._last_size = (height, width)
+                self._shadow = {}
+                self._size_ok = height >= 8 and width >= 60
+                stdscr.erase()
+                if not self._size_ok:
+                    stdscr.addnstr(0, 0, "Terminal too small! Need 60+ cols, 8+ rows.", width - 1)
+                    stdscr.refresh()
+            if not self._size_ok:
                 return
 
             # Two columns: left (control) | right (agent top / critic bottom)
@@ -244,93 +436,73 @@ class SplitTerminal:
             right_bot_h = content_h - right_top_h
             right_split_row = content_top + right_top_h  # horizontal divider row
 
-            stdscr.erase()
-
-            # ---- headers ----
-            left_title = f" {AGENT_NAME} - Control "
+            # ---- headers (only redrawn when their status/cycle/focus change) ----
+            agent_key = self._agent_state(self.auto_agent) + (self._focused_pane == "agent",)
+            critic_key = self._agent_state(self.critic_agent) + (self._focused_pane == "critic",)
 
-            agent_status = "RUN" if (self.auto_agent and self.auto_agent.is_running) else (
-                "PAUSE" if (self.auto_agent and self.auto_agent.is_paused) else "STOP"
-            )
-            agent_cycle = self.auto_agent.cycle_count if self.auto_agent else 0
-            agent_title = f" Agent [{agent_status}] #{agent_cycle} "
-
-            critic_status = "RUN" if (self.critic_agent and self.critic_agent.is_running) else (
-                "PAUSE" if (self.critic_agent and self.critic_agent.is_paused) else "STOP"
-            )
-            critic_cycle = self.critic_agent.cycle_count if self.critic_agent else 0
-            critic_title = f" Critic [{critic_status}] #{critic_cycle} "
+            # ---- left header and separators (static until the next resize) ----
+            if "separators" not in self._shadow:
+                self._shadow["separators"] = True
+                left_title = f" {AGENT_NAME} - Control "
+                stdscr.attron(self._cp[1])
+                stdscr.addstr(0, 0, left_title[:left_w].ljust(left_w))
+                stdscr.attroff(self._cp[1])
 
-            # Left header
-            stdscr.attron(curses.color_pair(1))
-            stdscr.addstr(0, 0, left_title[:left_w].ljust(left_w))
-            stdscr.attroff(curses.color_pair(1))
+                stdscr.vline(0, mid_col, _VLINE | self._cp[4], height)
+                # Draw intersection where vertical meets horizontal
+                stdscr.addch(right_split_row, mid_col, _LTEE | self._cp[4])
 
             # Agent header (right-top)
-            focus_agent = "*" if self._focused_pane == "agent" else " "
-            stdscr.attron(curses.color_pair(2))
-            stdscr.addstr(0, mid_col + 1, f"{focus_agent}{agent_title}"[:right_w].ljust(right_w))
-            stdscr.attroff(curses.color_pair(2))
-
-            # ---- vertical separator ----
-            stdscr.attron(curses.color_pair(4))
-            for row in range(height):
-                try:
-                    stdscr.addch(row, mid_col, curses.ACS_VLINE)
-                except curses.error:
-                    pass
-            stdscr.attroff(curses.color_pair(4))
-
-            # ---- horizontal separator in right pane (between agent & critic) ----
-            stdscr.attron(curses.color_pair(4))
-            for col in range(mid_col + 1, width):
+            if self._shadow.get("agent:header") != agent_key:
+                self._shadow["agent:header"] = agent_key
+                status, cycle, focused = agent_key
+                agent_title = f"{'*' if focused else ' '} Agent [{status}] #{cycle} "
+                stdscr.attron(self._cp[2])
+                stdscr.addstr(0, mid_col + 1, agent_title[:right_w].ljust(right_w))
+                stdscr.attroff(self._cp[2])
+
+            # Critic header, drawn on the horizontal separator between agent &
+            # critic; the line is redrawn with it since the title length varies
+            if self._shadow.get("critic:header") != critic_key:
+                self._shadow["critic:header"] = critic_key
+                status, cycle, focused = critic_key
+                critic_title = f"{'*' if focused else ' '} Critic [{status}] #{cycle} "
+                stdscr.hline(right_split_row, mid_col + 1, _HLINE | self._cp[4],
+                             width - mid_col - 1)
+                stdscr.attron(self._cp[5])
                 try:
-                    stdscr.addch(right_split_row, col, curses.ACS_HLINE)
+                    stdscr.addstr(right_split_row, mid_col + 1, critic_title[:right_w])
                 except curses.error:
                     pass
-            # Draw intersection where vertical meets horizontal
-            try:
-                stdscr.addch(right_split_row, mid_col, curses.ACS_LTEE)
-            except curses.error:
-                pass
-            stdscr.attroff(curses.color_pair(4))
-
-            # Critic header (on the horizontal divider line, right side)
-            focus_critic = "*" if self._focused_pane == "critic" else " "
-            stdscr.attron(curses.color_pair(5))
-            try:
-                stdscr.addstr(right_split_row, mid_col + 1, f"{focus_critic}{critic_title}"[:right_w])
-            except curses.error:
-                pass
-            stdscr.attroff(curses.color_pair(5))
+                stdscr.attroff(self._cp[5])
 
             # ---- content areas ----
             # Left pane: full height
-            self._draw_pane(stdscr, self.left_buf.get_lines(),
+            self._draw_pane(stdscr, "left", self.left_buf,
                             content_top, 0, content_h, left_w)
             # Right-top: agent output (with scroll offset & scrollbar)
-            self._draw_pane_scrollable(stdscr, self.agent_buf.get_lines(),
+            self._draw_pane_scrollable(stdscr, "agent", self.agent_buf,
                             content_top, mid_col + 1, right_top_h, right_w,
                             self._agent_scroll)
             # Right-bottom: critic output (with scroll offset & scrollbar)
-            self._draw_pane_scrollable(stdscr, self.critic_buf.get_lines(),
+            self._draw_pane_scrollable(stdscr, "critic", self.critic_buf,
                             right_split_row + 1, mid_col + 1, right_bot_h - 1, right_w,
                             self._critic_scroll)
 
             # ---- input line (spans left pane) ----
             prompt = "[You] > "
             input_row = height - 1
-            stdscr.attron(curses.color_pair(3))
+            stdscr.attron(self._cp[3])
             try:
                 stdscr.addstr(input_row, 0, prompt[:left_w])
             except curses.error:
                 pass
-            stdscr.attroff(curses.color_pair(3))
+            stdscr.attroff(self._cp[3])
 
             avail = left_w - len(prompt)
-            visible = self.input_line[-avail:] if len(self.input_line) > avail else self.input_line
+            visible = "".join(self.input_line[-avail:])
             try:
-                stdscr.addstr(input_row, len(prompt), visible)
+                stdscr.addnstr(input_row, len(prompt), visible.ljust(avail), avail)
             except curses.error:
                 pass
 
@@ -340,45 +512,68 @@ class SplitTerminal:
             except curses.error:
                 pass
 
-            stdscr.refresh()
+            # stdscr is already curses' off-screen buffer: stage it and let
+            # doupdate() emit only the changed cells in a single write
+            if present:
+                stdscr.noutrefresh()
+                curses.doupdate()
         except curses.error:
             pass
 
-    def _draw_pane(self, stdscr, lines: list, top: int, left: int,
-                   height: int, width: int):
-        """Draw wrapped text lines in a pane region, auto-scrolled to bottom."""
-        wrapped = []
-        for line in lines:
-            if not line:
-                wrapped.append("")
-            else:
-                wrapped.extend(textwrap.wrap(line, width) or [""])
-
-        visible = wrapped[-height:] if len(wrapped) > height else wrapped
-
-        for i, line in enumerate(visible):
-            row = top + (height - len(visible)) + i
-            if row < top or row >= top + height:
+    @staticmethod
+    def _agent_state(agent) -> tuple:
+        """Return the (status, cycle count) shown in an agent pane's header."""
+        if not agent:
+            return ("STOP", 0)
+        status = "RUN" if agent.is_running else ("PAUSE" if agent.is_paused else "STOP")
+        return (status, agent.cycle_count)
+
+    def _unchanged(self, key: str, stamp: tuple) -> bool:
+        """Record ``stamp`` for ``key``; True if it matches the previous frame's."""
+        stamp_key = key + ":stamp"
+        if self._shadow.get(stamp_key) == stamp:
+            return True
+        self._shadow[stamp_key] = stamp
+        return False
+
+    def _blit_rows(self, stdscr, key: str, rows: list, top: int, left: int, width: int):
+        """Write rows that differ from the last frame drawn for ``key``.
+
+        Rows are padded to ``width`` so a shorter line overwrites the old one
+        without erasing neighbouring panes.
+        """
+        prev = self._shadow.get(key, [])
+        for i, line in enumerate(rows):
+            if i < len(prev) and prev[i] == line:
                 continue
             try:
-                stdscr.addnstr(row, left, line, width)
+                stdscr.addnstr(top + i, left, line.ljust(width), width)
             except curses.error:
                 pass
+        self._shadow[key] = rows
 
-    def _draw_pane_scrollable(self, stdscr, lines: list, top: int, left: int,
+    def _draw_pane(self, stdscr, key: str, buf: PaneBuffer, top: int, left: int,
+                   height: int, width: int):
+        """Draw wrapped text lines in a pane region, auto-scrolled to bottom."""
+        if self._unchanged(key, (buf.version, top, left, height, width)):
+            return
+        wrapped = buf.get_wrapped(width)
+
+        visible = wrapped[-height:] if len(wrapped) > height else wrapped
+        rows = [""] * (height - len(visible)) + visible
+        self._blit_rows(stdscr, key, rows, top, left, width)
+
+    def _draw_pane_scrollable(self, stdscr, key: str, buf: PaneBuffer, top: int, left: int,
                               height: int, width: int, scroll_offset: int):
         """Draw wrapped text with scroll offset and a scrollbar track."""
+        if self._unchanged(key, (buf.version, top, left, height, width, scroll_offset)):
+            return
         # Reserve 1 col for scrollbar
         text_w = max(width - 1, 1)
         sb_col = left + text_w
 
-        # Wrap all lines to text width
-        wrapped = []
-        for line in lines:
-            if not line:
-                wrapped.append("")
-            else:
-                wrapped.extend(textwrap.wrap(line, text_w) or [""])
+        # Wrap all lines to text width (cached per buffer)
+        wrapped = buf.get_wrapped(text_w)
 
         total = len(wrapped)
 
@@ -395,63 +590,99 @@ class SplitTerminal:
             visible = wrapped[start:end]
 
         # Draw text lines
-        for i, line in enumerate(visible):
-            row = top + (height - len(visible)) + i
-            if row < top or row >= top + height:
-                continue
-            try:
-                stdscr.addnstr(row, left, line, text_w)
-            except curses.error:
-                pass
+        rows = [""] * (height - len(visible)) + visible
+        self._blit_rows(stdscr, key, rows, top, left, text_w)
 
-        # Draw scrollbar
+        # Scrollbar: one character per row, blank when everything fits
         if total > height and height > 1:
             # Scrollbar thumb position
             thumb_size = max(1, height * height // total)
             # Position: 0 offset = thumb at bottom, max_scroll offset = thumb at top
             if max_scroll > 0:
-                thumb_top = top + int((max_scroll - offset) / max_scroll * (height - thumb_size))
+                thumb_top = int((max_scroll - offset) / max_scroll * (height - thumb_size))
             else:
-                thumb_top = top + height - thumb_size
+                thumb_top = height - thumb_size
 
-            for row in range(top, top + height):
-                ch = curses.ACS_CKBOARD if thumb_top <= row < thumb_top + thumb_size else curses.ACS_VLINE
-                try:
-                    stdscr.addch(row, sb_col, ch)
-                except curses.error:
-                    pass
+            thumb_end = thumb_top + thumb_size
+            bar = [_VLINE] * thumb_top + [_CKBOARD] * thumb_size + [_VLINE] * (height - thumb_end)
             # Show scroll indicator if not at bottom
             if offset > 0:
-                try:
-                    stdscr.addch(top + height - 1, sb_col, ord('v'))
-                except curses.error:
-                    pass
+                bar[-1] = ord('v')
+        else:
+            bar = [ord(' ')] * height
+
+        bar_key = key + ":scrollbar"
+        prev_bar = self._shadow.get(bar_key, [])
+        for i, ch in enumerate(bar):
+            if i < len(prev_bar) and prev_bar[i] == ch:
+                continue
+            try:
+                stdscr.addch(top + i, sb_col, ch)
+            except curses.error:
+                pass
+        self._shadow[bar_key] = bar
 
     # --------------------------------------------------------------- input
-    def _handle_input(self, stdscr):
+    def _wake(self):
+        """Wake the main loop so it redraws; safe to call from any thread."""
+        self._dirty.set()
+        if self._wake_w is None:
+            return  # polling mode picks the flag up on its next tick
         try:
-            ch = stdscr.getch()
-        except curses.error:
-            return
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass  # pipe full: a wake-up is already pending
 
-        if ch == -1:
-            return
+    def _wait_for_event(self) -> bool:
+        """Block until stdin is readable, a pane changed, or the idle timeout.
+
+        Returns:
+            True if there may be keys to read.
+        """
+        if self._wake_r is None:
+            return True  # polling mode: getch's own timeout paces the loop
+        try:
+            stdin_fd = sys.stdin.fileno()
+            ready, _, _ = select.select([stdin_fd, self._wake_r], [], [], IDLE_REDRAW_SECONDS)
+        except (OSError, ValueError):
+            return True
+        if not ready:
+            self._dirty.set()  # idle tick: refresh agent status headers
+        elif self._wake_r in ready:
+            if stdin_fd not in ready:
+                time.sleep(FRAME_DEBOUNCE_SECONDS)
+            try:
+                while os.read(self._wake_r, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+        return stdin_fd in ready
+
+    def _handle_input(self, stdscr):
+        while True:
+            try:
+                ch = stdscr.getch()
+            except curses.error:
+                return
+
+            if ch == -1:
+                return
 
+            self._handle_key(ch)
+            self._dirty.set()
+            if self._wake_r is None or not self.running:
+                return  # polling mode handles one key per frame
+
+    def _handle_key(self, ch: int):
         if ch in (curses.KEY_ENTER, 10, 13):
             self._process_input()
         elif ch in (curses.KEY_BACKSPACE, 127, 8):
-            self.input_line = self.input_line[:-1]
+            if self.input_line:
+                self.input_line.pop()
         elif ch == curses.KEY_UP:
-            if self.input_history:
-                self.input_hist_idx = max(0, self.input_hist_idx - 1)
-                self.input_line = self.input_history[self.input_hist_idx]
+            self._move_history(-1)
         elif ch == curses.KEY_DOWN:
-            if self.input_history:
-                self.input_hist_idx = min(len(self.input_history), self.input_hist_idx + 1)
-                if self.input_hist_idx >= len(self.input_history):
-                    self.input_line = ""
-                else:
-                    self.input_line = self.input_history[self.input_hist_idx]
+            self._move_history(1)
         elif ch == 9:  # Tab — switch focused right pane
             self._focused_pane = "critic" if self._focused_pane == "agent" else "agent"
         elif ch == curses.KEY_PPAGE:  # Page Up — scroll focused pane up
@@ -477,17 +708,41 @@ class SplitTerminal:
         elif ch == 3:  # Ctrl+C
             self.cmd_quit("")
         elif 32 <= ch <= 126:
-            self.input_line += chr(ch)
+            self.input_line.append(chr(ch))
+
+    def _move_history(self, delta: int):
+        """Step through input history; past the newest entry is an empty line."""
+        if not self.input_history:
+            return
+        view = self._history_view
+        self.input_hist_idx = max(0, min(len(view) - 1, self.input_hist_idx + delta))
+        self.input_line = list(view[self.input_hist_idx])
+
+    def _persist_history(self, line: str):
+        """Append one submitted line to the history file.
+
+        Called on the UI thread: a single small append keeps lines in order
+        and can't be dropped at quit the way a queued pool job can.
+        """
+        try:
+            with open(_HISTORY_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            self._out(f"[Error] Failed to save input history: {e}")
 
     def _process_input(self):
-        user_input = self.input_line.strip()
-        self.input_line = ""
+        user_input = "".join(self.input_line).strip()
+        self.input_line = []
 
         if not user_input:
             return
 
         self.input_history.append(user_input)
         self.input_hist_idx = len(self.input_history)
+        self._history_view.insert(-1, user_input)
+        if len(self._history_view) > MAX_HISTORY_ENTRIES + 1:
+            del self._history_view[0]
+        self._persist_history(user_input)
 
         self.left_buf.add(f"[You] > {user_input}")
 
@@ -495,8 +750,9 @@ class SplitTerminal:
         cmd = parts[0].lower()
         args = parts[1] if len(parts) > 1 else ""
 
-        if cmd in self.commands:
-            self.commands[cmd](args)
+        handler = self.commands.get(cmd)
+        if handler:
+            handler(args)
         else:
             self._chat(user_input)
 
@@ -521,7 +777,7 @@ class SplitTerminal:
         def _bg():
             response = self.ai.chat(message)
             self._out(f"[CrapBot] {response}")
-        threading.Thread(target=_bg, daemon=True).start()
+        self._pool.submit(_bg)
 
     def cmd_help(self, args: str):
         tools_status = "ON" if self.ai.tools_enabled else "OFF"
@@ -541,7 +797,7 @@ Agent Control (use: <cmd> [agent|critic|both]):
   fresh             - Clear session & restart both agents
   agents            - Show status of both agents
   instruct <target> <text> - Change instructions (single-line)
-  topic             - Set topic with multi-line editor
+  topic [editor]    - Set topic in a multi-line box (or $EDITOR)
 
 Task Management:
   task <desc>       - Background task
@@ -653,30 +909,88 @@ Settings:
                 self.critic_agent.update_instructions(rest)
                 self._out("[System] Critic instructions updated.")
 
+    def _inline_multiline_editor(self) -> str:
+        """Edit multi-line text in a box drawn over the panes.
+
+        Agent output keeps rendering underneath while the box is open.
+
+        Returns:
+            The entered text with comment lines removed, or "" if cancelled.
+        """
+        stdscr = self._stdscr
+        height, width = stdscr.getmaxyx()
+        frame = curses.newwin(height - 2, width - 2, 1, 1)
+        frame.box()
+        frame.addnstr(0, 2, " Topic - Ctrl-G to save, Esc to cancel ", width - 6)
+        win = frame.derwin(height - 4, width - 4, 1, 1)
+        win.keypad(True)
+        win.timeout(100)
+        box = curses.textpad.Textbox(win, insert_mode=True)
+        cancelled = False
+
+        def _validate(ch):
+            nonlocal cancelled
+            if ch == 27:  # Esc
+                cancelled = True
+                return 7  # Ctrl-G ends the edit
+            if ch == -1:
+                # Idle: let pane output render, then put the editor back on top
+                if self._dirty.is_set():
+                    self._dirty.clear()
+                    self._draw(stdscr, present=False)
+                    stdscr.noutrefresh()
+                    frame.touchwin()
+                    frame.noutrefresh()
+                    win.noutrefresh()
+                    curses.doupdate()
+                return 0
+            return ch
+
+        frame.refresh()
+        try:
+            text = box.edit(_validate)
+        finally:
+            self._last_size = None  # force a full repaint on the next frame
+            self._dirty.set()
+
+        if cancelled:
+            return ""
+        return _strip_comment_lines(text)
+
     def cmd_topic(self, args: str):
         """Provide a topic or multi-line text to the agent/critic session.
         
-        Opens an editor for multi-line input. The topic will be injected as context
-        into the agents' instructions to guide their discussion.
+        Opens a multi-line input box over the panes, or $EDITOR with
+        'topic editor'. The topic will be injected as context into the
+        agents' instructions to guide their discussion.
         """
-        self._out("[System] Opening editor for multi-line topic input...")
-        self._out("[System] The terminal will be suspended. Save and close the editor when done.")
-        
-        # We need to suspend curses temporarily to use the editor
-        curses.def_prog_mode()  # Save current curses state
-        curses.endwin()  # Exit curses mode temporarily
-        
-        try:
-            topic_text = get_multiline_input("")
-        except Exception as e:
+        if args.strip().lower() == "editor" or not self._size_ok:
+            self._out("[System] Opening editor for multi-line topic input...")
+            self._out("[System] The terminal will be suspended. Save and close the editor when done.")
+
+            # We need to suspend curses temporarily to use the editor
+            curses.def_prog_mode()  # Save current curses state
+            curses.endwin()  # Exit curses mode temporarily
+
+            try:
+                topic_text = get_multiline_input("")
+            except Exception as e:
+                curses.reset_prog_mode()
+                self._stdscr.refresh()
+                self._last_size = None
+                self._out(f"[Error] Failed to get topic: {e}")
+                return
+
+            # Always restore curses after editor closes
             curses.reset_prog_mode()
             self._stdscr.refresh()
-            self._out(f"[Error] Failed to get topic: {e}")
-            return
-
-        # Always restore curses after editor closes
-        curses.reset_prog_mode()
-        self._stdscr.refresh()
+            self._last_size = None  # force a full repaint on the next frame
+        else:
+            try:
+                topic_text = self._inline_multiline_editor()
+            except curses.error as e:
+                self._out(f"[Error] Failed to get topic: {e}")
+                return
 
         if not topic_text:
             self._out("[System] No topic provided. Cancelled.")
@@ -725,7 +1039,7 @@ Settings:
         def _bg():
             response = self.ai.search(args)
             self._out(f"[CrapBot] {response}")
-        threading.Thread(target=_bg, daemon=True).start()
+        self._pool.submit(_bg)
 
     def cmd_model(self, args: str):
         if not args:
@@ -737,10 +1051,10 @@ Settings:
 
     def cmd_models(self, args: str):
         current = self.ai.current_model
-        self._out("Available Models:")
-        for m in self.ai.list_models():
-            marker = " (current)" if m == current else ""
-            self._out(f"  - {m}{marker}")
+        self.left_buf.add_many(["Available Models:"] + [
+            f"  - {m}{' (current)' if m == current else ''}"
+            for m in self.ai.list_models()
+        ])
 
     def cmd_tools(self, args: str):
         if not args:
@@ -774,9 +1088,7 @@ Settings:
         if self.auto_agent:
             # Stop without saving session (we want to discard it)
             self.auto_agent._running = False
-            if self.auto_agent._thread:
-                self.auto_agent._thread.join(timeout=5)
-                self.auto_agent._thread = None
+            self.auto_agent._join()
         if self.critic_agent:
             self.critic_agent.stop()
 
@@ -813,10 +1125,11 @@ Settings:
         if not tasks:
             self._out("[System] No tasks.")
             return
-        self._out("Background Tasks:")
+        lines = ["Background Tasks:"]
         for t in tasks:
             recurring = " (recurring)" if t['is_recurring'] else ""
-            self._out(f"  {t['id']}: {t['name']} - {t['status']}{recurring}")
+            lines.append(f"  {t['id']}: {t['name']} - {t['status']}{recurring}")
+        self.left_buf.add_many(lines)
 
     def cmd_status(self, args: str):
         if not args:
@@ -899,7 +1212,7 @@ Settings:
                 f"Task: {args}\n\nComplete this task. If it requires code, write and execute it.",
             )
             self._out(f"[CrapBot] {response}")
-        threading.Thread(target=_bg, daemon=True).start()
+        self.tasks.submit(_bg)
     
     def cmd_research(self, args: str):
         """Run deep research with autonomous planning and critical review."""
@@ -932,7 +1245,7 @@ Settings:
             except Exception as e:
                 self._out(f"[Error] Research failed: {e}")
         
-        threading.Thread(target=_bg, daemon=True).start()
+        self.tasks.submit(_bg)
 
     def cmd_quit(self, args: str):
         self._out("[System] Shutting down...")
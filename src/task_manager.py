@@ -1,11 +1,14 @@
 """Background task manager for autonomous operations with history and parallel execution."""
+import functools
 import threading
-import queue
+import heapq
 import time
 import json
 import os
 import shutil
-from concurrent.futures import ThreadPoolExecutor, Future
+import sqlite3
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 from datetime import datetime
 from typing import Callable, Dict, Any, List, Optional
 from dataclasses import dataclass, field
@@ -15,62 +18,155 @@ from config import TASK_DATA_DIR
 
 # Task storage paths — always under data/task_data/
 TASK_BASE_DIR = TASK_DATA_DIR
+TASK_HISTORY_DB = os.path.join(TASK_BASE_DIR, "task_history.db")
+# JSON history used before TASK_HISTORY_DB; imported once, then renamed to .bak
 TASK_HISTORY_FILE = os.path.join(TASK_BASE_DIR, "task_history.json")
 
 # Ensure base directory exists
 os.makedirs(TASK_BASE_DIR, exist_ok=True)
 
 
+class _SafeNameTable(dict):
+    """str.translate table: keeps alphanumerics, space, '-' and '_'; maps the rest to '_'.
+    
+    Entries are filled in on first sight of a code point, so non-ASCII letters
+    are kept exactly as str.isalnum() decides.
+    """
+    def __missing__(self, codepoint: int):
+        c = chr(codepoint)
+        value = codepoint if (c.isalnum() or c in ' -_') else '_'
+        self[codepoint] = value
+        return value
+
+
+_SAFE_NAME_TABLE = _SafeNameTable()
+for _cp in range(128):
+    _SAFE_NAME_TABLE[_cp]  # prefill ASCII
+
+_folder_paths: Dict[str, str] = {}  # task name -> folder path
+_created_folders: set = set()  # folders already made by get_task_folder
+
+
+def task_folder_path(task_name: str) -> str:
+    """Get the folder path for a specific task without creating it."""
+    folder = _folder_paths.get(task_name)
+    if folder is None:
+        # Sanitize task name for folder
+        safe_name = task_name.translate(_SAFE_NAME_TABLE).strip().replace(' ', '_')[:50]
+        folder = os.path.join(TASK_BASE_DIR, safe_name)
+        _folder_paths[task_name] = folder
+    return folder
+
+
 def get_task_folder(task_name: str) -> str:
     """Get or create a folder for a specific task."""
-    # Sanitize task name for folder
-    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in task_name)
-    safe_name = safe_name.strip().replace(' ', '_')[:50]
-    folder = os.path.join(TASK_BASE_DIR, safe_name)
-    os.makedirs(folder, exist_ok=True)
+    folder = task_folder_path(task_name)
+    if folder not in _created_folders:
+        os.makedirs(folder, exist_ok=True)
+        _created_folders.add(folder)
     return folder
 
 
-MAX_TASK_OUTPUTS = 100  # Maximum number of output files per task
+MAX_TASK_OUTPUTS = 100  # Maximum number of runs kept per task
+
+# Each task folder holds an append-only log with one JSON object per run
+RUNS_FILE = "runs.jsonl"
+_TRIM_SLACK = 50  # Runs allowed past MAX_TASK_OUTPUTS before the log is trimmed
+
+# Shared compact encoder for the runs logs and history rows; built once
+# instead of per json.dumps() call, with datetimes etc. via str()
+_compact_encoder = json.JSONEncoder(separators=(',', ':'), default=str)
+
+# History rows keep at most this many characters of a run's result/error;
+# the full output stays in the task's runs log
+MAX_HISTORY_FIELD_CHARS = 4096
+
+
+def _truncate(text: str, limit: int = MAX_HISTORY_FIELD_CHARS) -> str:
+    """Shorten text to about ``limit`` chars, keeping its head and tail."""
+    if text is None or len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]}…[{len(text) - limit} chars]…{text[-half:]}"
+
+
+_run_counts: Dict[str, int] = {}  # folder -> number of lines in its runs file
+_runs_lock = threading.Lock()
+
+
+def _count_lines(path: str) -> int:
+    """Count lines in a file, 0 if it doesn't exist."""
+    try:
+        with open(path, 'rb') as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def _legacy_output_files(folder: str) -> List[str]:
+    """Per-run run_*.json files written before runs.jsonl existed."""
+    return [f for f in os.listdir(folder) if f.startswith('run_') and f.endswith('.json')]
 
 
-def cleanup_old_outputs(folder: str, max_outputs: int = MAX_TASK_OUTPUTS):
-    """Remove oldest output files if count exceeds max_outputs."""
+def cleanup_old_outputs(folder: str, max_outputs: int = MAX_TASK_OUTPUTS) -> int:
+    """Trim the folder's runs log to the newest max_outputs runs.
+    
+    Returns:
+        Number of runs left in the log.
+    """
+    path = os.path.join(folder, RUNS_FILE)
     try:
-        files = [f for f in os.listdir(folder) if f.endswith('.json')]
-        if len(files) > max_outputs:
-            # Sort by modification time, oldest first
-            files_with_time = [(f, os.path.getmtime(os.path.join(folder, f))) for f in files]
-            files_with_time.sort(key=lambda x: x[1])
-            # Remove oldest files
-            to_remove = len(files) - max_outputs
-            for filename, _ in files_with_time[:to_remove]:
-                os.remove(os.path.join(folder, filename))
+        with open(path, 'r', encoding='utf-8') as f:
+            kept = deque(f, maxlen=max_outputs)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(kept)
+        os.replace(tmp_path, path)
+        return len(kept)
     except Exception as e:
         print(f"[TaskManager] Could not cleanup outputs: {e}")
+        return _count_lines(path)
 
 
-def save_task_output(task_name: str, run_number: int, result: Any, error: str = None) -> str:
-    """Save task output to a file in the task's folder. Returns the file path."""
+def save_task_output(task_name: str, run_number: int, result: Any, error: str = None,
+                     timestamp: str = None) -> str:
+    """Append task output to the runs log in the task's folder. Returns the log path.
+    
+    ``timestamp`` (ISO format) defaults to now.
+    """
     folder = get_task_folder(task_name)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"run_{run_number:04d}_{timestamp}.json"
-    filepath = os.path.join(folder, filename)
+    filepath = os.path.join(folder, RUNS_FILE)
     
     output_data = {
         "task_name": task_name,
         "run_number": run_number,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": timestamp or datetime.now().isoformat(),
         "success": error is None,
         "result": result,
         "error": error
     }
     
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, default=str)
-        # Cleanup old outputs to stay within limit
-        cleanup_old_outputs(folder)
+        line = (_compact_encoder.encode(output_data) + '\n').encode('utf-8')
+        with _runs_lock:
+            count = _run_counts.get(folder)
+            if count is None:
+                count = _count_lines(filepath)
+            try:
+                with open(filepath, 'ab') as f:
+                    f.write(line)
+            except FileNotFoundError:
+                # Folder was removed after we created it: make it again
+                _created_folders.discard(folder)
+                get_task_folder(task_name)
+                count = 0
+                with open(filepath, 'ab') as f:
+                    f.write(line)
+            count += 1
+            # Trim in batches rather than rewriting the log on every run
+            if count > MAX_TASK_OUTPUTS + _TRIM_SLACK:
+                count = cleanup_old_outputs(folder)
+            _run_counts[folder] = count
         return filepath
     except Exception as e:
         print(f"[TaskManager] Could not save output: {e}")
@@ -78,16 +174,28 @@ def save_task_output(task_name: str, run_number: int, result: Any, error: str =
 
 
 def load_task_outputs(task_name: str, limit: int = 10) -> List[Dict]:
-    """Load previous outputs for a task."""
-    folder = get_task_folder(task_name)
+    """Load previous outputs for a task, newest first."""
+    folder = task_folder_path(task_name)
+    path = os.path.join(folder, RUNS_FILE)
     outputs = []
+    if not os.path.isdir(folder):
+        return outputs  # nothing saved yet
     
     try:
-        files = sorted([f for f in os.listdir(folder) if f.endswith('.json')], reverse=True)
-        for filename in files[:limit]:
-            filepath = os.path.join(folder, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                outputs.append(json.load(f))
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                lines = deque(f, maxlen=limit)
+            for line in reversed(lines):
+                try:
+                    outputs.append(json.loads(line))
+                except ValueError:
+                    continue  # partially written line
+        else:
+            files = sorted(_legacy_output_files(folder), reverse=True)
+            for filename in files[:limit]:
+                filepath = os.path.join(folder, filename)
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    outputs.append(json.load(f))
     except Exception as e:
         print(f"[TaskManager] Could not load outputs: {e}")
     
@@ -104,16 +212,29 @@ def list_task_folders() -> List[Dict]:
     """List all task folders with stats."""
     folders = []
     try:
-        for name in os.listdir(TASK_BASE_DIR):
-            folder_path = os.path.join(TASK_BASE_DIR, name)
-            if os.path.isdir(folder_path) and name != "__pycache__":
-                files = [f for f in os.listdir(folder_path) if f.endswith('.json')]
-                folders.append({
-                    "name": name,
-                    "path": folder_path,
-                    "output_count": len(files),
-                    "latest": max([os.path.getmtime(os.path.join(folder_path, f)) for f in files]) if files else None
-                })
+        with os.scandir(TASK_BASE_DIR) as entries:
+            task_dirs = [e for e in entries if e.is_dir() and e.name != "__pycache__"]
+        for entry in task_dirs:
+            folder_path = entry.path
+            runs_path = os.path.join(folder_path, RUNS_FILE)
+            try:
+                latest = os.stat(runs_path).st_mtime
+                count = _run_counts.get(folder_path)
+                if count is None:
+                    count = _count_lines(runs_path)
+            except FileNotFoundError:
+                # Older folder with one run_*.json file per run
+                with os.scandir(folder_path) as files:
+                    mtimes = [f.stat().st_mtime for f in files
+                              if f.name.startswith('run_') and f.name.endswith('.json')]
+                count = len(mtimes)
+                latest = max(mtimes, default=None)
+            folders.append({
+                "name": entry.name,
+                "path": folder_path,
+                "output_count": count,
+                "latest": latest
+            })
     except Exception as e:
         print(f"[TaskManager] Could not list folders: {e}")
     
@@ -150,46 +271,95 @@ class Task:
     error: str = None
     last_run: datetime = None
     run_count: int = 0
-    history: List[TaskResult] = field(default_factory=list)
+    history: deque = field(default_factory=lambda: deque(maxlen=10))  # of TaskResult
     max_history: int = 10
     use_history: bool = False
     parallel: bool = True  # Whether task can run in parallel with others
+    kind: str = "io"  # "io" (LLM/HTTP calls, mostly waiting) or "cpu" (local computation)
     future: Future = None  # Track running future for parallel tasks
+    runner: Callable = None  # func with args/kwargs pre-bound, built by add_task
 
 
 class TaskManager:
     """Manages background autonomous tasks with history, parallel execution, and file storage."""
     
-    def __init__(self, max_workers: int = 5):
+    def __init__(self, max_workers: int = None):
         self.tasks: Dict[str, Task] = {}
-        self.task_queue = queue.Queue()
+        self._tasks_version = 0  # bumped whenever a task is added
+        self._tasks_snapshot = (0, ())  # (version, tuple of tasks) for iteration
         self.running = False
-        self.worker_thread = None
         self.scheduler_thread = None
         self._task_counter = 0
         self._lock = threading.Lock()
-        self._task_history: Dict[str, List[dict]] = {}
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._history_lock = threading.Lock()  # one sqlite connection shared by all threads
+        self._db = None
+        cpus = os.cpu_count() or 4
+        # I/O-bound tasks mostly wait on the network, so allow more of them than
+        # cores (same cap as CPython's default pool size). CPU-bound tasks get a
+        # core less than the machine has so they can't starve the I/O pool.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or min(32, cpus + 4))
+        self._cpu_executor = ThreadPoolExecutor(max_workers=max(1, cpus - 1))
+        # Tasks with parallel=False run one at a time on their own worker
+        self._serial_executor = ThreadPoolExecutor(max_workers=1)
         self._active_futures: Dict[str, Future] = {}
+        # Recurring tasks: heap of (next fire time on time.monotonic(), task_id)
+        self._schedule_heap: List[tuple] = []
+        self._sched_event = threading.Event()  # set when the heap changes
         self._load_history()
         
     def _load_history(self):
-        """Load task history from disk."""
+        """Open the task history database, importing the old JSON history once."""
         try:
-            if os.path.exists(TASK_HISTORY_FILE):
-                with open(TASK_HISTORY_FILE, 'r') as f:
-                    self._task_history = json.load(f)
+            self._db = sqlite3.connect(TASK_HISTORY_DB, check_same_thread=False,
+                                       isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, task TEXT NOT NULL, run INTEGER, "
+                "ts TEXT, result TEXT, error TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS history_task ON history(task, id)")
         except Exception as e:
-            print(f"[TaskManager] Could not load history: {e}")
-            self._task_history = {}
+            print(f"[TaskManager] Could not open history database: {e}")
+            self._db = None
+            return
+        
+        if os.path.exists(TASK_HISTORY_FILE):
+            try:
+                with open(TASK_HISTORY_FILE, 'rb') as f:
+                    old_history = json.loads(f.read())
+                with self._history_lock, self._db:
+                    self._db.execute("BEGIN")
+                    for name, entries in old_history.items():
+                        self._db.executemany(
+                            "INSERT INTO history(task, run, ts, result, error) VALUES (?, ?, ?, ?, ?)",
+                            [(name, h.get("run_number"), h.get("timestamp"),
+                              _compact_encoder.encode(h.get("result")), h.get("error"))
+                             for h in entries]
+                        )
+                os.replace(TASK_HISTORY_FILE, TASK_HISTORY_FILE + ".bak")
+            except Exception as e:
+                print(f"[TaskManager] Could not import old history: {e}")
     
-    def _save_history(self):
-        """Save task history to disk."""
+    def _query_history(self, name: str, limit: int) -> List[dict]:
+        """Return up to ``limit`` most recent history entries for a task name, oldest first."""
+        if self._db is None or limit <= 0:
+            return []
         try:
-            with open(TASK_HISTORY_FILE, 'w') as f:
-                json.dump(self._task_history, f, indent=2, default=str)
+            with self._history_lock:
+                rows = self._db.execute(
+                    "SELECT ts, result, error, run FROM history WHERE task = ? "
+                    "ORDER BY id DESC LIMIT ?", (name, limit)
+                ).fetchall()
         except Exception as e:
-            print(f"[TaskManager] Could not save history: {e}")
+            print(f"[TaskManager] Could not load history: {e}")
+            return []
+        return [
+            {"timestamp": ts, "result": json.loads(result) if result is not None else None,
+             "error": error, "run_number": run}
+            for ts, result, error, run in reversed(rows)
+        ]
         
     def start(self):
         """Start the task manager."""
@@ -197,34 +367,49 @@ class TaskManager:
             return
             
         self.running = True
-        self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
         self.scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
-        self.worker_thread.start()
         self.scheduler_thread.start()
         print("[TaskManager] Started")
         
-    def stop(self):
-        """Stop the task manager."""
+    def stop(self, timeout: float = 5.0) -> List[str]:
+        """Stop the task manager.
+        
+        Queued runs are cancelled; runs already in progress get up to ``timeout``
+        seconds, waited on together, to finish.
+        
+        Returns:
+            Names of tasks still running when the timeout expired.
+        """
         self.running = False
+        self._sched_event.set()  # wake the scheduler so it can exit
         
-        # Cancel active futures
-        for task_id, future in self._active_futures.items():
-            if not future.done():
-                future.cancel()
+        # Cancel queued futures; cancel() fails only for runs that have started
+        with self._lock:
+            active = list(self._active_futures.items())
+        running = {future: task_id for task_id, future in active if not future.cancel()}
         
-        # Shutdown executor
+        # Shutdown executors
         self._executor.shutdown(wait=False)
+        self._cpu_executor.shutdown(wait=False)
+        self._serial_executor.shutdown(wait=False)
         
-        if self.worker_thread:
-            self.worker_thread.join(timeout=2)
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=2)
-        print("[TaskManager] Stopped")
+        
+        leftover = []
+        if running:
+            _, not_done = wait(running, timeout=timeout)
+            leftover = [self.tasks[running[f]].name for f in not_done if running[f] in self.tasks]
+        if leftover:
+            print(f"[TaskManager] Stopped; {len(leftover)} task(s) still running: {', '.join(leftover)}")
+        else:
+            print("[TaskManager] Stopped")
+        return leftover
         
     def add_task(self, name: str, func: Callable, args: tuple = (), 
                  kwargs: dict = None, interval: int = None,
                  use_history: bool = False, max_history: int = 10,
-                 parallel: bool = True) -> str:
+                 parallel: bool = True, kind: str = "io") -> str:
         """Add a new task. Returns task ID.
         
         Args:
@@ -236,16 +421,15 @@ class TaskManager:
             use_history: If True, pass previous results to function via 'previous_results' kwarg
             max_history: Maximum number of historical results to keep
             parallel: If True, task can run in parallel with others (default True)
+            kind: "io" for tasks that mostly wait on LLM/HTTP calls (default),
+                "cpu" for local computation; picks the executor the task runs on
         """
         with self._lock:
             self._task_counter += 1
             task_id = f"task_{self._task_counter}"
         
         # Load existing history for this task name
-        existing_history = self._task_history.get(name, [])
-        
-        # Also load from file outputs if available
-        file_outputs = load_task_outputs(name, limit=max_history)
+        existing_history = self._query_history(name, max_history)
         
         task = Task(
             id=task_id,
@@ -257,19 +441,57 @@ class TaskManager:
             use_history=use_history,
             max_history=max_history,
             parallel=parallel,
-            history=[TaskResult(**h) if isinstance(h, dict) else h for h in existing_history[-max_history:]]
+            kind=kind,
+            history=deque((TaskResult(**h) if isinstance(h, dict) else h for h in existing_history[-max_history:]),
+                          maxlen=max_history)
         )
         
-        self.tasks[task_id] = task
+        task.runner = self._build_runner(task)
         
-        # Create task folder
-        get_task_folder(name)
+        with self._lock:
+            self.tasks[task_id] = task
+            self._tasks_version += 1
         
         if interval is None:
-            # One-time task, queue immediately
-            self.task_queue.put(task_id)
+            # One-time task, run immediately
+            self._dispatch(task_id)
+        else:
+            # Recurring task: first run right away
+            self._schedule(task_id, time.monotonic())
         
         return task_id
+    
+    def _build_runner(self, task: Task) -> Callable:
+        """Bind a task's func to its args/kwargs once, so each run is a plain call."""
+        bound = functools.partial(task.func, *task.args, **task.kwargs)
+        if not task.use_history:
+            return bound
+        
+        def run_with_history():
+            return bound(previous_results=self._previous_results(task))
+        return run_with_history
+    
+    @staticmethod
+    def _previous_results(task: Task) -> List[Dict]:
+        """Build the 'previous_results' kwarg for a use_history task, oldest first."""
+        if task.history:
+            # In-memory history already holds the last max_history runs, oldest first
+            return [
+                {"timestamp": h.timestamp, "result": h.result, "run": h.run_number}
+                for h in task.history
+            ]
+        # Cold start with no persisted history: fall back to saved outputs
+        file_outputs = load_task_outputs(task.name, limit=task.max_history)
+        return [
+            {"timestamp": o.get("timestamp"), "result": o.get("result"), "run": o.get("run_number")}
+            for o in reversed(file_outputs)  # Oldest first
+        ]
+    
+    def _schedule(self, task_id: str, when: float):
+        """Queue a recurring task to fire at ``when`` (a time.monotonic() value)."""
+        with self._lock:
+            heapq.heappush(self._schedule_heap, (when, task_id))
+        self._sched_event.set()
         
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a task."""
@@ -296,7 +518,7 @@ class TaskManager:
             "uses_history": task.use_history,
             "history_count": len(task.history),
             "parallel": task.parallel,
-            "output_folder": get_task_folder(task.name)
+            "output_folder": task_folder_path(task.name)
         }
     
     def get_task_history(self, task_id: str = None, task_name: str = None) -> List[dict]:
@@ -305,8 +527,8 @@ class TaskManager:
             task = self.tasks[task_id]
             return [{"timestamp": h.timestamp, "result": h.result, "error": h.error, "run": h.run_number} 
                     for h in task.history]
-        elif task_name and task_name in self._task_history:
-            return self._task_history[task_name]
+        elif task_name:
+            return self._query_history(task_name, MAX_TASK_OUTPUTS)
         return []
     
     def get_task_outputs(self, task_id: str = None, task_name: str = None, limit: int = 10) -> List[dict]:
@@ -319,13 +541,23 @@ class TaskManager:
             return load_task_outputs(name, limit=limit)
         return []
     
+    def _all_tasks(self) -> tuple:
+        """Tuple of all tasks, rebuilt only when a task has been added since last call."""
+        version, tasks = self._tasks_snapshot
+        if version != self._tasks_version:
+            with self._lock:
+                version = self._tasks_version
+                tasks = tuple(self.tasks.values())
+            self._tasks_snapshot = (version, tasks)
+        return tasks
+    
     def get_running_tasks(self) -> List[Dict[str, Any]]:
         """Get list of currently running tasks."""
         running = []
-        for task_id, task in self.tasks.items():
+        for task in self._all_tasks():
             if task.status == TaskStatus.RUNNING:
                 running.append({
-                    "id": task_id,
+                    "id": task.id,
                     "name": task.name,
                     "started": str(task.last_run) if task.last_run else None
                 })
@@ -333,43 +565,49 @@ class TaskManager:
         
     def list_tasks(self) -> List[Dict[str, Any]]:
         """List all tasks."""
-        return [self.get_task_status(tid) for tid in self.tasks]
+        return [self.get_task_status(task.id) for task in self._all_tasks()]
         
-    def _worker_loop(self):
-        """Worker thread that dispatches tasks for parallel execution."""
-        while self.running:
-            try:
-                task_id = self.task_queue.get(timeout=0.5)
-                
-                if task_id not in self.tasks:
-                    continue
-                    
-                task = self.tasks[task_id]
-                
-                if task.status == TaskStatus.CANCELLED:
-                    continue
-                
-                # Submit task for parallel execution
-                if task.parallel:
-                    future = self._executor.submit(self._execute_task, task_id)
-                    self._active_futures[task_id] = future
-                    task.future = future
-                else:
-                    # Execute synchronously if not parallel
-                    self._execute_task(task_id)
-                    
-            except queue.Empty:
-                # Clean up completed futures
-                self._cleanup_futures()
-                continue
-            except Exception as e:
-                print(f"[TaskManager] Worker error: {e}")
+    def submit(self, func: Callable, *args, kind: str = "io") -> Future:
+        """Run a one-off callable on the task pools without registering a task.
+        
+        Args:
+            func: Function to execute
+            *args: Positional arguments for function
+            kind: "io" or "cpu", as for add_task
+            
+        Returns:
+            Future for the call.
+        """
+        executor = self._cpu_executor if kind == "cpu" else self._executor
+        return executor.submit(func, *args)
     
-    def _cleanup_futures(self):
-        """Remove completed futures from tracking."""
-        completed = [tid for tid, f in self._active_futures.items() if f.done()]
-        for tid in completed:
-            del self._active_futures[tid]
+    def _dispatch(self, task_id: str):
+        """Submit a task to its executor for execution."""
+        task = self.tasks.get(task_id)
+        if task is None or task.status == TaskStatus.CANCELLED:
+            return
+        
+        if not task.parallel:
+            executor = self._serial_executor
+        elif task.kind == "cpu":
+            executor = self._cpu_executor
+        else:
+            executor = self._executor
+        try:
+            future = executor.submit(self._execute_task, task_id)
+        except RuntimeError as e:  # executor already shut down
+            print(f"[TaskManager] Could not run {task_id}: {e}")
+            return
+        with self._lock:
+            self._active_futures[task_id] = future
+        task.future = future
+        future.add_done_callback(functools.partial(self._on_task_done, task_id))
+    
+    def _on_task_done(self, task_id: str, future: Future):
+        """Stop tracking a finished future (unless a newer run replaced it)."""
+        with self._lock:
+            if self._active_futures.get(task_id) is future:
+                del self._active_futures[task_id]
     
     def _execute_task(self, task_id: str):
         """Execute a single task."""
@@ -385,35 +623,17 @@ class TaskManager:
         task.last_run = datetime.now()
         
         try:
-            # Prepare kwargs with history if needed
-            kwargs = task.kwargs.copy()
-            if task.use_history:
-                # Load from file outputs for more complete history
-                file_outputs = load_task_outputs(task.name, limit=task.max_history)
-                kwargs['previous_results'] = [
-                    {"timestamp": o.get("timestamp"), "result": o.get("result"), "run": o.get("run_number")}
-                    for o in reversed(file_outputs)  # Oldest first
-                ]
-            
-            result = task.func(*task.args, **kwargs)
+            result = task.runner()
             task.result = result
             task.status = TaskStatus.COMPLETED
             task.run_count += 1
+            finished = datetime.now().isoformat()
             
             # Save output to file
-            output_file = save_task_output(task.name, task.run_count, result)
+            output_file = save_task_output(task.name, task.run_count, result, timestamp=finished)
             
             # Store in memory history
-            task_result = TaskResult(
-                timestamp=datetime.now().isoformat(),
-                result=result,
-                run_number=task.run_count
-            )
-            task.history.append(task_result)
-            
-            # Trim history if needed
-            if len(task.history) > task.max_history:
-                task.history = task.history[-task.max_history:]
+            self._record_result(task, result, None, finished)
             
             # Update persistent history
             self._update_persistent_history(task)
@@ -422,53 +642,87 @@ class TaskManager:
             task.error = str(e)
             task.status = TaskStatus.FAILED
             task.run_count += 1
+            finished = datetime.now().isoformat()
             
             # Save failure to file
-            save_task_output(task.name, task.run_count, None, str(e))
+            save_task_output(task.name, task.run_count, None, str(e), timestamp=finished)
             
             # Store failure in history too
-            task_result = TaskResult(
-                timestamp=datetime.now().isoformat(),
-                result=None,
-                error=str(e),
-                run_number=task.run_count
-            )
-            task.history.append(task_result)
+            self._record_result(task, None, str(e), finished)
             self._update_persistent_history(task)
     
+    def _record_result(self, task: Task, result: Any, error: Optional[str], timestamp: str):
+        """Append a run to task.history, reusing the entry it evicts once full."""
+        history = task.history
+        if history and len(history) == history.maxlen:
+            entry = history.popleft()
+            entry.timestamp = timestamp
+            entry.result = result
+            entry.error = error
+            entry.run_number = task.run_count
+        else:
+            entry = TaskResult(timestamp=timestamp, result=result, error=error,
+                               run_number=task.run_count)
+        history.append(entry)
+    
     def _update_persistent_history(self, task: Task):
-        """Update persistent history for a task."""
-        history_entries = [
-            {"timestamp": h.timestamp, "result": h.result, "error": h.error, "run_number": h.run_number}
-            for h in task.history
-        ]
-        self._task_history[task.name] = history_entries[-task.max_history:]
-        self._save_history()
+        """Store the task's latest run and drop rows beyond its max_history."""
+        if self._db is None or not task.history:
+            return
+        h = task.history[-1]
+        result = _compact_encoder.encode(h.result)
+        if len(result) > MAX_HISTORY_FIELD_CHARS:
+            # Oversized results are stored as a shortened string
+            text = h.result if isinstance(h.result, str) else result
+            result = _compact_encoder.encode(_truncate(text))
+        try:
+            with self._history_lock, self._db:
+                self._db.execute("BEGIN")
+                self._db.execute(
+                    "INSERT INTO history(task, run, ts, result, error) VALUES (?, ?, ?, ?, ?)",
+                    (task.name, h.run_number, h.timestamp, result, _truncate(h.error))
+                )
+                self._db.execute(
+                    "DELETE FROM history WHERE task = ? AND id <= "
+                    "(SELECT id FROM history WHERE task = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (task.name, task.name, task.max_history)
+                )
+        except Exception as e:
+            print(f"[TaskManager] Could not save history: {e}")
                 
     def _scheduler_loop(self):
-        """Scheduler thread for recurring tasks."""
+        """Scheduler thread for recurring tasks.
+        
+        Sleeps until the earliest entry in the schedule heap is due (or the heap
+        changes), so idle time costs no wakeups.
+        """
+        heap = self._schedule_heap
         while self.running:
             try:
-                now = datetime.now()
+                with self._lock:
+                    wait = heap[0][0] - time.monotonic() if heap else None
+                if wait is None or wait > 0:
+                    self._sched_event.wait(wait)
+                    self._sched_event.clear()
+                    continue
+                
+                now = time.monotonic()
+                due = []
+                with self._lock:
+                    while heap and heap[0][0] <= now:
+                        due.append(heapq.heappop(heap)[1])
                 
-                for task_id, task in list(self.tasks.items()):
-                    if task.status == TaskStatus.CANCELLED:
+                for task_id in due:
+                    task = self.tasks.get(task_id)
+                    if task is None or task.interval is None or task.status == TaskStatus.CANCELLED:
                         continue
-                        
-                    if task.interval is None:
+                    if task.status == TaskStatus.RUNNING:
+                        # Still busy from the last run: check again shortly
+                        self._schedule(task_id, now + min(1, task.interval))
                         continue
-                        
-                    # Check if it's time to run
-                    if task.last_run is None:
-                        # Never run, schedule now
-                        self.task_queue.put(task_id)
-                    else:
-                        elapsed = (now - task.last_run).total_seconds()
-                        if elapsed >= task.interval and task.status != TaskStatus.RUNNING:
-                            task.status = TaskStatus.PENDING
-                            self.task_queue.put(task_id)
-                            
-                time.sleep(1)  # Check every second
+                    task.status = TaskStatus.PENDING
+                    self._dispatch(task_id)
+                    self._schedule(task_id, now + task.interval)
                 
             except Exception as e:
                 print(f"[TaskManager] Scheduler error: {e}")
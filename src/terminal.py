@@ -1,14 +1,26 @@
 """Terminal interface for the AI Agent."""
+import os
 import sys
 import threading
+import time
 import json
-from ai_client import get_ai_client
+import hashlib
+import traceback
+import reprlib
+from collections import OrderedDict, deque
+from typing import Any, Callable, Optional
+from config import DEFAULT_TASKS_FILE, RUNTIME_TASKS_FILE
+from ai_client import AIClient, get_ai_client
 from task_manager import get_task_manager, list_task_folders
 from autonomous_tasks import add_scheduled_task, remove_scheduled_task, list_configured_tasks
 from tools import create_system_change_approval
 from deep_research_agent import run_deep_research
+import llm_cache
 
 
+# The fix prompts are sent verbatim as the first message of every cmd_fix call.
+# Keep per-call values out of them so the identical prefix stays eligible for
+# Azure OpenAI's automatic prompt caching.
 SYSTEM_FIX_PLANNER_PROMPT = """You are a Windows troubleshooting planner.
 Analyze the user's issue and propose a safe, step-by-step fix plan.
 Return ONLY valid JSON with this schema:
@@ -40,6 +52,132 @@ You must:
 - Stop if a command fails and report the error.
 - Summarize results and next steps.
 """
+# The only tool the fix executor may call
+_FIX_EXECUTOR_TOOLS = frozenset({"run_powershell_guarded"})
+
+
+def _prompt(prompt: str) -> str:
+    """Write a prompt and read one line from stdin, like input() minus its extra flushing.
+    
+    Raises:
+        EOFError: If stdin is closed.
+    """
+    if prompt:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+def _plan_error(plan) -> Optional[str]:
+    """Check a parsed fix plan against the planner's JSON schema.
+    
+    Returns:
+        A description of the first problem found, or None if the plan is usable.
+    """
+    def is_commands(value):
+        return isinstance(value, list) and all(isinstance(c, str) for c in value)
+    
+    if not isinstance(plan, dict):
+        return "plan is not a JSON object"
+    if not isinstance(plan.get("summary", ""), str):
+        return "'summary' must be a string"
+    if not is_commands(plan.get("diagnostics", [])):
+        return "'diagnostics' must be a list of command strings"
+    fixes = plan.get("fixes", [])
+    if not isinstance(fixes, list):
+        return "'fixes' must be a list"
+    for i, fix in enumerate(fixes, 1):
+        if not isinstance(fix, dict):
+            return f"fix {i} is not an object"
+        if not is_commands(fix.get("commands", [])):
+            return f"fix {i}: 'commands' must be a list of command strings"
+    return None
+
+
+def _file_stamp(path: str):
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# Bounded repr for result previews: nested containers and long strings are
+# abbreviated while being converted, not after
+_preview_repr = reprlib.Repr()
+_preview_repr.maxstring = 500
+_preview_repr.maxother = 500
+
+
+def _preview(value, n: int) -> str:
+    """First ``n`` characters of a task result/error for display ("" for None)."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value[:n]
+    return _preview_repr.repr(value)[:n]
+
+
+# In-memory cache of chat replies (see Terminal._stream_reply)
+CHAT_CACHE_SIZE = 128
+CHAT_CACHE_TTL = 300  # seconds
+
+# Progress lines kept per background do/research task (shown by 'status <id>')
+TASK_LOG_LINES = 200
+TASK_LOG_SHOWN = 15
+
+
+# Help text for cmd_help; {model} and {tools} are filled in from the current settings
+HELP_TEMPLATE = """
+Available Commands:
+  help              - Show this help
+  do <task>         - Execute task autonomously in the background (writes & runs code if needed)
+  do --wait <task>  - Same, but wait for the result
+    fix <issue>       - Diagnose and fix a Windows issue (asks before changes)
+  fix --no-cache <issue> - Same, but re-plan instead of reusing a recent plan
+  chat <message>    - Chat with the AI (or just type your message)
+  search <query>    - Search the web
+  research <problem> - Run deep research in the background with autonomous planning and review
+  research --wait <problem> - Same, but wait for the result
+  
+Task Management:
+  task <desc>       - Create a one-time background task
+  schedule          - List scheduled tasks from config
+  schedule <name> <seconds> <prompt>  - Add a recurring scheduled task
+  tasks             - List all running tasks
+  status <id>       - Get status of a task
+  history <id>      - View execution history of a task
+  outputs [id]      - View saved task outputs (files)
+  cancel <id>       - Cancel a task
+
+Settings:
+  model <name>      - Switch AI model (current: {model})
+  models            - List available models  
+  tools [on|off]    - Toggle tool calling (current: {tools})
+  reset             - Reset conversation history
+  cache [on|off|clear] - Show or toggle reuse of identical recent chat replies (off by default, tools OFF only)
+  quit/exit         - Exit the terminal
+
+Task Output Storage:
+  All task outputs are saved to: task_data/<task_name>/
+  Tasks can access their previous outputs via 'use_history' option.
+
+Autonomous Execution:
+  Use 'do <task>' for complex tasks - the agent will write and execute
+  code (Python, JS, PowerShell) autonomously to complete the task.
+
+Deep Research:
+  Use 'research <problem>' for thorough autonomous research with:
+  - Adaptive planning based on problem type
+  - Web search with Bing grounding
+  - Code analysis and data gathering
+  - Critical review and iteration
+  - Researcher-reviewer discussion for quality
+        """
 
 
 class Terminal:
@@ -49,6 +187,11 @@ class Terminal:
         self.ai = get_ai_client()
         self.tasks = get_task_manager()
         self.running = False
+        self._help_cache = None  # ((model, tools_status), formatted help text)
+        self._schedule_cache = None  # (task config file stamps, list_configured_tasks() result)
+        self._chat_cache = OrderedDict()  # key -> (time.monotonic(), reply), least recent first
+        self.chat_cache_enabled = False  # opt-in with 'cache on'
+        self._task_logs = {}  # task id -> deque of progress lines from a background do/research
         self.commands = {
             "help": self.cmd_help,
             "chat": self.cmd_chat,
@@ -57,6 +200,7 @@ class Terminal:
             "models": self.cmd_models,
             "tools": self.cmd_tools,
             "reset": self.cmd_reset,
+            "cache": self.cmd_cache,
             "fix": self.cmd_fix,
             "task": self.cmd_task,
             "tasks": self.cmd_list_tasks,
@@ -83,28 +227,31 @@ class Terminal:
         
     def print_banner(self):
         """Print welcome banner."""
-        tools_status = "ON" if self.ai.tools_enabled else "OFF"
-        print("\n" + "="*60)
-        print("  CRAPBOT - AI Agent Terminal")
-        print(f"  Model: {self.ai.current_model} | Tools: {tools_status}")
-        print("="*60 + "\n")
+        ai = self.ai
+        model, tools_status = ai.current_model, "ON" if ai.tools_enabled else "OFF"
+        rule = "=" * 60
+        sys.stdout.write(
+            f"\n{rule}\n"
+            "  CRAPBOT - AI Agent Terminal\n"
+            f"  Model: {model} | Tools: {tools_status}\n"
+            f"{rule}\n\n"
+        )
         
     def _run_loop(self):
         """Main terminal loop."""
         while self.running:
             try:
-                user_input = input("\n[You] > ").strip()
+                user_input = _prompt("\n[You] > ").strip()
                 
                 if not user_input:
                     continue
                     
                 # Check if it's a command
-                parts = user_input.split(maxsplit=1)
-                cmd = parts[0].lower()
-                args = parts[1] if len(parts) > 1 else ""
+                cmd, _, args = user_input.partition(" ")
                 
-                if cmd in self.commands:
-                    self.commands[cmd](args)
+                handler = self.commands.get(cmd.lower())
+                if handler is not None:
+                    handler(args.lstrip())
                 else:
                     # Treat as chat message
                     self._chat(user_input)
@@ -119,55 +266,60 @@ class Terminal:
     def _chat(self, message: str):
         """Send chat message to AI."""
         print("\n[CrapBot] Thinking...")
-        response = self.ai.chat(message)
-        print(f"\n[CrapBot] {response}")
+        self._stream_reply(message)
+    
+    def _stream_reply(self, message: str, cache: bool = True):
+        """Write the AI's reply to stdout chunk by chunk as it is generated.
+        
+        With ``cache`` and the chat cache turned on, a reply to the same
+        message, with the same model and the same preceding exchange, is reused
+        for CHAT_CACHE_TTL seconds; the reused turn is still added to the
+        conversation. Nothing is cached while tools are enabled, since a reply
+        may stand for tool calls that should run again. Pass cache=False for
+        messages whose point is to act (e.g. 'do'), not just to answer.
+        """
+        write, flush = sys.stdout.write, sys.stdout.flush
+        ai = self.ai
+        key = None
+        if cache and self.chat_cache_enabled and not ai.tools_enabled:
+            # Follow-ups like "yes" or "explain more" depend on the last exchange
+            context = hashlib.sha256(
+                json.dumps(ai.conversation_history[-2:]).encode("utf-8")
+            ).hexdigest()
+            key = (ai.current_model, context, message.strip())
+            hit = self._chat_cache.get(key)
+            if hit is not None and time.monotonic() - hit[0] < CHAT_CACHE_TTL:
+                self._chat_cache.move_to_end(key)
+                write(f"\n[CrapBot] [cache] {hit[1]}\n")
+                ai.record_turn(message, hit[1])
+                return
+        
+        write("\n[CrapBot] ")
+        parts = []
+        for chunk in ai.stream_chat(message):
+            parts.append(chunk)
+            write(chunk)
+            flush()
+        write("\n")
+        
+        if key is not None:
+            reply = "".join(parts)
+            history = ai.conversation_history
+            # Only replies the client recorded in history succeeded; never cache errors
+            if history and history[-1].get("content") == reply:
+                self._chat_cache[key] = (time.monotonic(), reply)
+                self._chat_cache.move_to_end(key)
+                if len(self._chat_cache) > CHAT_CACHE_SIZE:
+                    self._chat_cache.popitem(last=False)
         
     def cmd_help(self, args: str):
         """Show help."""
-        tools_status = "ON" if self.ai.tools_enabled else "OFF"
-        help_text = f"""
-Available Commands:
-  help              - Show this help
-  do <task>         - Execute task autonomously (writes & runs code if needed)
-    fix <issue>       - Diagnose and fix a Windows issue (asks before changes)
-  chat <message>    - Chat with the AI (or just type your message)
-  search <query>    - Search the web
-  research <problem> - Run deep research with autonomous planning and review
-  
-Task Management:
-  task <desc>       - Create a one-time background task
-  schedule          - List scheduled tasks from config
-  schedule <name> <seconds> <prompt>  - Add a recurring scheduled task
-  tasks             - List all running tasks
-  status <id>       - Get status of a task
-  history <id>      - View execution history of a task
-  outputs [id]      - View saved task outputs (files)
-  cancel <id>       - Cancel a task
-
-Settings:
-  model <name>      - Switch AI model (current: {self.ai.current_model})
-  models            - List available models  
-  tools [on|off]    - Toggle tool calling (current: {tools_status})
-  reset             - Reset conversation history
-  quit/exit         - Exit the terminal
-
-Task Output Storage:
-  All task outputs are saved to: task_data/<task_name>/
-  Tasks can access their previous outputs via 'use_history' option.
-
-Autonomous Execution:
-  Use 'do <task>' for complex tasks - the agent will write and execute
-  code (Python, JS, PowerShell) autonomously to complete the task.
-
-Deep Research:
-  Use 'research <problem>' for thorough autonomous research with:
-  - Adaptive planning based on problem type
-  - Web search with Bing grounding
-  - Code analysis and data gathering
-  - Critical review and iteration
-  - Researcher-reviewer discussion for quality
-        """
-        print(help_text)
+        ai = self.ai
+        key = (ai.current_model, "ON" if ai.tools_enabled else "OFF")
+        cached = self._help_cache
+        if cached is None or cached[0] != key:
+            cached = self._help_cache = (key, HELP_TEMPLATE.format(model=key[0], tools=key[1]))
+        sys.stdout.write(cached[1] + "\n")
     
     def cmd_search(self, args: str):
         """Search the web."""
@@ -191,10 +343,11 @@ Deep Research:
         """List models."""
         models = self.ai.list_models()
         current = self.ai.current_model
-        print("\nAvailable Models:")
+        lines = ["\nAvailable Models:"]
         for m in models:
             marker = " (current)" if m == current else ""
-            print(f"  - {m}{marker}")
+            lines.append(f"  - {m}{marker}")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def cmd_tools(self, args: str):
         """Toggle or list tools."""
@@ -226,14 +379,32 @@ Deep Research:
         self.ai.reset_conversation()
         print("[System] Conversation history cleared.")
         
+    def cmd_cache(self, args: str):
+        """Show or toggle the chat reply cache."""
+        arg = args.strip().lower()
+        if arg == "on":
+            self.chat_cache_enabled = True
+        elif arg == "off":
+            self.chat_cache_enabled = False
+        elif arg == "clear":
+            self._chat_cache.clear()
+            print("[System] Chat cache cleared.")
+            return
+        elif arg:
+            print("[Error] Use 'cache on', 'cache off' or 'cache clear'")
+            return
+        status = "enabled" if self.chat_cache_enabled else "disabled"
+        print(f"[System] Chat cache is {status} ({len(self._chat_cache)} replies)")
+        
     def cmd_task(self, args: str):
         """Create a background task."""
         if not args:
             print("[Error] Please provide a task description.")
             return
             
+        ai = self.ai  # same singleton get_ai_client() returns
+        
         def run_ai_task(prompt):
-            ai = get_ai_client()
             return ai.chat(prompt, system_prompt="You are executing a background task. Complete it thoroughly and return the result.")
             
         task_id = self.tasks.add_task(
@@ -251,13 +422,14 @@ Deep Research:
             print("[System] No tasks.")
             return
             
-        print("\nBackground Tasks:")
-        print("-" * 50)
+        rule = "-" * 50
+        lines = ["\nBackground Tasks:", rule]
         for t in tasks:
             status = t['status']
             recurring = " (recurring)" if t['is_recurring'] else ""
-            print(f"  {t['id']}: {t['name']} - {status}{recurring}")
-        print("-" * 50)
+            lines.append(f"  {t['id']}: {t['name']} - {status}{recurring}")
+        lines.append(rule)
+        sys.stdout.write("\n".join(lines) + "\n")
         
     def cmd_status(self, args: str):
         """Get task status."""
@@ -266,7 +438,7 @@ Deep Research:
             return
             
         status = self.tasks.get_task_status(args.strip())
-        if "error" in status:
+        if "id" not in status:  # lookup failed; a found task always has an "error" key
             print(f"[Error] {status['error']}")
             return
             
@@ -276,10 +448,15 @@ Deep Research:
         if status['last_run']:
             print(f"  Last run: {status['last_run']}")
         if status['result']:
-            result_preview = str(status['result'])[:500]
+            result_preview = _preview(status['result'], 500)
             print(f"  Result: {result_preview}...")
         if status['error']:
             print(f"  Error: {status['error']}")
+        log = self._task_logs.get(args.strip())
+        if log:
+            print(f"  Progress (last {min(len(log), TASK_LOG_SHOWN)} lines):")
+            for line in list(log)[-TASK_LOG_SHOWN:]:
+                print(f"    {_preview(line.strip(), 300)}")
             
     def cmd_cancel(self, args: str):
         """Cancel a task."""
@@ -303,14 +480,15 @@ Deep Research:
             print("[System] No history found for this task.")
             return
         
-        print(f"\nExecution History (last {len(history)} runs):")
-        print("-" * 50)
+        rule = "-" * 50
+        lines = [f"\nExecution History (last {len(history)} runs):", rule]
         for h in history[-10:]:
             status = "✓" if not h.get('error') else "✗"
-            result_preview = str(h.get('result', ''))[:100] if h.get('result') else h.get('error', '')[:100]
-            print(f"  {status} Run #{h.get('run', '?')} [{h.get('timestamp', '')}]")
-            print(f"    {result_preview}...")
-        print("-" * 50)
+            result_preview = _preview(h.get('result') or h.get('error'), 100)
+            lines.append(f"  {status} Run #{h.get('run', '?')} [{h.get('timestamp', '')}]")
+            lines.append(f"    {result_preview}...")
+        lines.append(rule)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def cmd_outputs(self, args: str):
         """View saved task outputs."""
@@ -321,11 +499,12 @@ Deep Research:
                 print("[System] No task outputs found.")
                 return
             
-            print("\nTask Output Folders:")
-            print("-" * 50)
+            rule = "-" * 50
+            lines = ["\nTask Output Folders:", rule]
             for f in folders:
-                print(f"  {f['name']}: {f['output_count']} outputs")
-            print("-" * 50)
+                lines.append(f"  {f['name']}: {f['output_count']} outputs")
+            lines.append(rule)
+            sys.stdout.write("\n".join(lines) + "\n")
             return
         
         # Show outputs for specific task
@@ -334,43 +513,51 @@ Deep Research:
             print(f"[System] No outputs found for task: {args}")
             return
         
-        print(f"\nRecent Outputs:")
-        print("-" * 50)
+        rule = "-" * 50
+        lines = ["\nRecent Outputs:", rule]
         for o in outputs:
             status = "✓" if o.get('success') else "✗"
-            result = str(o.get('result', o.get('error', '')))[:150]
-            print(f"  {status} Run #{o.get('run_number', '?')} [{o.get('timestamp', '')}]")
-            print(f"    {result}...")
-        print("-" * 50)
+            result = _preview(o.get('result') if o.get('success') else o.get('error'), 150)
+            lines.append(f"  {status} Run #{o.get('run_number', '?')} [{o.get('timestamp', '')}]")
+            lines.append(f"    {result}...")
+        lines.append(rule)
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    def _configured_tasks(self) -> list:
+        """list_configured_tasks(), re-read only when a task config file has changed."""
+        stamp = (_file_stamp(DEFAULT_TASKS_FILE), _file_stamp(RUNTIME_TASKS_FILE))
+        cached = self._schedule_cache
+        if cached is None or cached[0] != stamp:
+            cached = self._schedule_cache = (stamp, list_configured_tasks())
+        return cached[1]
     
     def cmd_schedule(self, args: str):
         """Schedule a recurring task."""
         if not args:
             # List configured scheduled tasks
-            tasks = list_configured_tasks()
-            print("\nScheduled Tasks (from config):")
-            print("-" * 60)
+            tasks = self._configured_tasks()
+            rule = "-" * 60
+            lines = ["\nScheduled Tasks (from config):", rule]
             for t in tasks:
                 status = "✓" if t.get('enabled') else "✗"
                 interval = t.get('interval', 0)
                 history = " [uses history]" if t.get('use_history') else ""
-                print(f"  {status} {t['name']} ({t['type']}) - every {interval}s{history}")
-            print("-" * 60)
-            print("Use: schedule <name> <interval_seconds> <prompt>")
+                lines.append(f"  {status} {t['name']} ({t['type']}) - every {interval}s{history}")
+            lines.append(rule)
+            lines.append("Use: schedule <name> <interval_seconds> <prompt>")
+            sys.stdout.write("\n".join(lines) + "\n")
             return
         
         # Parse: schedule <name> <interval> <prompt>
-        parts = args.split(maxsplit=2)
-        if len(parts) < 3:
-            print("[Error] Usage: schedule <name> <interval_seconds> <prompt>")
-            print("  Example: schedule DailyReport 3600 Generate a daily summary report")
-            return
-        
-        name, interval_str, prompt = parts
         try:
+            name, interval_str, prompt = args.split(maxsplit=2)
             interval = int(interval_str)
         except ValueError:
-            print("[Error] Interval must be a number of seconds.")
+            print("[Error] Usage: schedule <name> <interval_seconds> <prompt>")
+            print("  Example: schedule DailyReport 3600 Generate a daily summary report")
+            return
+        if interval <= 0:
+            print("[Error] Interval must be a positive number of seconds.")
             return
         
         if add_scheduled_task(name, prompt, interval, use_history=True):
@@ -379,20 +566,41 @@ Deep Research:
         else:
             print(f"[Error] Task '{name}' already exists.")
     
+    @staticmethod
+    def _pop_flag(args: str, flag: str):
+        """Strip a leading ``flag`` from args. Returns (flag_given, remaining_args)."""
+        if args == flag or args.startswith(flag + " "):
+            return True, args[len(flag):].strip()
+        return False, args
+    
     def cmd_do(self, args: str):
-        """Execute a task autonomously - agent will write and run code if needed."""
+        """Execute a task autonomously - agent will write and run code if needed.
+        
+        Runs as a background task unless --wait is given.
+        """
+        wait, args = self._pop_flag(args, "--wait")
         if not args:
             print("[Error] Please provide a task description.")
             return
         
-        print("\n[CrapBot] Working on it (may write and execute code)...")
-        response = self.ai.chat(
-            f"Task: {args}\n\nComplete this task. If it requires computation, data processing, or any programming, write and execute the necessary code. Show the actual results.",
-        )
-        print(f"\n[CrapBot] {response}")
+        prompt = f"Task: {args}\n\nComplete this task. If it requires computation, data processing, or any programming, write and execute the necessary code. Show the actual results."
+        if wait:
+            print("\n[CrapBot] Working on it (may write and execute code)...")
+            # Never from the chat cache: a repeated task should run its code again
+            self._stream_reply(prompt, cache=False)
+            return
+        
+        ai = self._background_client()
+        task_id = self._start_background(f"Do: {args[:30]}...", "Task", lambda log: ai.chat(prompt))
+        print(f"\n[CrapBot] Working on it in the background as {task_id} (may write and execute code)...")
+        print(f"[System] Use 'status {task_id}' to check progress, or 'do --wait <task>' to wait for it.")
     
     def cmd_research(self, args: str):
-        """Run deep research with autonomous planning and critical review."""
+        """Run deep research with autonomous planning and critical review.
+        
+        Runs as a background task unless --wait is given.
+        """
+        wait, args = self._pop_flag(args, "--wait")
         if not args:
             print("[Error] Please provide a research problem.")
             print("\nExamples:")
@@ -404,45 +612,100 @@ Deep Research:
         print("[Deep Research] This will involve planning, web search, analysis, and critical review.")
         print("[Deep Research] The process may take several minutes.\n")
         
+        if not wait:
+            ai = self._background_client()
+            
+            def run_research(log):
+                result = run_deep_research(problem=args, on_output=log, ai=ai)
+                self._print_research_summary(result, out=log)
+                return result
+            
+            task_id = self._start_background(f"Research: {args[:30]}...", "Research", run_research)
+            print(f"[System] Research is running in the background as {task_id}.")
+            print(f"[System] Use 'status {task_id}' to check progress, or 'research --wait <problem>' to wait for it.")
+            return
+        
         try:
             # Run the deep research
             result = run_deep_research(problem=args, on_output=print)
-            
-            # Display summary
-            print("\n" + "="*80)
-            print("RESEARCH SUMMARY")
-            print("="*80)
-            print(f"Problem: {result['problem']}")
-            print(f"Attempts: {len(result['attempts'])}")
-            print(f"Final Score: {result['final_score']}/10")
-            print(f"Status: {'✓ Accepted' if result['final_accepted'] else '✗ Needs Improvement'}")
-            
-            # Show final answer from last attempt
-            last_attempt = result['attempts'][-1]
-            if 'research' in last_attempt and 'final_answer' in last_attempt['research']:
-                print("\nFINAL ANSWER:")
-                print("-" * 80)
-                print(last_attempt['research']['final_answer'])
-            
-            print("\n" + "="*80)
-            
+            self._print_research_summary(result)
         except Exception as e:
-            print(f"\n[Error] Research failed: {e}")
-            import traceback
-            traceback.print_exc()
+            sys.stdout.write(f"\n[Error] Research failed: {e}\n{traceback.format_exc()}")
+    
+    def _background_client(self) -> AIClient:
+        """A fresh AIClient for a background task, so it never interleaves with the REPL's conversation."""
+        ai = AIClient(self.ai.current_model)
+        ai.tools_enabled = self.ai.tools_enabled
+        return ai
+    
+    def _start_background(self, name: str, label: str, work: Callable[[Callable[[str], None]], Any]) -> str:
+        """Run ``work(log)`` as a background task and return its task id.
+        
+        Progress passed to ``log`` is kept for 'status <id>' instead of being
+        printed over the prompt; only a one-line notice is printed at the end.
+        """
+        log = deque(maxlen=TASK_LOG_LINES)
+        ready = threading.Event()  # task_id is assigned once add_task returns
+        task_id = None
+        
+        def run():
+            ready.wait()
+            try:
+                result = work(log.append)
+            except Exception as e:
+                log.append(f"[Error] {e}")
+                print(f"\n[System] {label} {task_id} failed: {e} (see 'status {task_id}')")
+                raise
+            print(f"\n[System] {label} {task_id} finished. Use 'status {task_id}' to see the result.")
+            return result
+        
+        task_id = self.tasks.add_task(name=name, func=run)
+        self._task_logs[task_id] = log
+        ready.set()
+        return task_id
+    
+    def _print_research_summary(self, result: dict, out: Callable[[str], None] = print):
+        """Print (or send to ``out``) the summary and final answer of a deep research run."""
+        out("\n" + "="*80)
+        out("RESEARCH SUMMARY")
+        out("="*80)
+        out(f"Problem: {result['problem']}")
+        out(f"Attempts: {len(result['attempts'])}")
+        out(f"Final Score: {result['final_score']}/10")
+        out(f"Status: {'✓ Accepted' if result['final_accepted'] else '✗ Needs Improvement'}")
+        
+        # Show final answer from last attempt
+        last_attempt = result['attempts'][-1]
+        if 'research' in last_attempt and 'final_answer' in last_attempt['research']:
+            out("\nFINAL ANSWER:")
+            out("-" * 80)
+            out(last_attempt['research']['final_answer'])
+        
+        out("\n" + "="*80)
 
     def cmd_fix(self, args: str):
-        """Diagnose and fix a Windows issue with explicit approval."""
+        """Diagnose and fix a Windows issue with explicit approval.
+        
+        Plans are cached for an hour per (model, issue); pass --no-cache to re-plan.
+        """
+        no_cache, args = self._pop_flag(args, "--no-cache")
+        use_cache = not no_cache
         if not args:
             print("[Error] Please describe the issue to fix.")
             return
 
-        print("\n[CrapBot] Planning a fix... (no changes yet)")
-        plan_text = self.ai.chat(
-            args,
-            system_prompt=SYSTEM_FIX_PLANNER_PROMPT,
-            use_tools=False,
-        )
+        cache_key = (self.ai.current_model, SYSTEM_FIX_PLANNER_PROMPT, args)
+        plan_text = llm_cache.get(cache_key) if use_cache else None
+        fresh = plan_text is None
+        if not fresh:
+            print("\n[CrapBot] Reusing a recent plan for this issue (use 'fix --no-cache' to re-plan)")
+        else:
+            print("\n[CrapBot] Planning a fix... (no changes yet)")
+            plan_text = self.ai.chat(
+                args,
+                system_prompt=SYSTEM_FIX_PLANNER_PROMPT,
+                use_tools=False,
+            )
 
         try:
             plan = json.loads(plan_text)
@@ -450,30 +713,37 @@ Deep Research:
             print("[Error] Planner did not return valid JSON. Showing raw response:\n")
             print(plan_text)
             return
+        problem = _plan_error(plan)
+        if problem:
+            print(f"[Error] Planner returned an invalid plan ({problem}). Showing raw response:\n")
+            print(plan_text)
+            return
+        if fresh:  # re-storing a cached plan would restart its TTL on every reuse
+            llm_cache.put(cache_key, plan_text)
 
         summary = plan.get("summary", "(no summary)")
         diagnostics = plan.get("diagnostics", [])
         fixes = plan.get("fixes", [])
 
-        print("\nProposed plan:")
-        print(f"  Summary: {summary}")
+        lines = ["\nProposed plan:", f"  Summary: {summary}"]
         if diagnostics:
-            print("  Diagnostics:")
+            lines.append("  Diagnostics:")
             for cmd in diagnostics:
-                print(f"    - {cmd}")
+                lines.append(f"    - {cmd}")
         if fixes:
-            print("  Fixes:")
+            lines.append("  Fixes:")
             for i, fix in enumerate(fixes, 1):
                 title = fix.get("title", f"Fix {i}")
                 risk = fix.get("risk", "unknown")
                 admin = "admin" if fix.get("requires_admin") else "user"
-                print(f"    {i}. {title} (risk: {risk}, {admin})")
+                lines.append(f"    {i}. {title} (risk: {risk}, {admin})")
                 for cmd in fix.get("commands", []):
-                    print(f"       - {cmd}")
+                    lines.append(f"       - {cmd}")
                 if fix.get("rollback"):
-                    print(f"       rollback: {fix['rollback']}")
+                    lines.append(f"       rollback: {fix['rollback']}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
-        confirm = input("\nRun this plan now? (y/N): ").strip().lower()
+        confirm = _prompt("\nRun this plan now? (y/N): ").strip().lower()
         if confirm != "y":
             print("[System] Cancelled. No changes made.")
             return
@@ -485,17 +755,18 @@ Deep Research:
         )
 
         print("\n[CrapBot] Executing plan with approval...\n")
-        executor_input = json.dumps({
-            "issue": args,
-            "approval_id": approval_id,
-            "plan": plan,
-        })
+        # plan_text already parsed as a JSON object above, so splice it in as-is
+        # rather than re-encoding the plan
+        executor_input = (
+            f'{{"issue": {json.dumps(args)}, "approval_id": {json.dumps(approval_id)}, '
+            f'"plan": {plan_text.strip()}}}'
+        )
 
         response = self.ai.chat(
             executor_input,
             system_prompt=SYSTEM_FIX_EXECUTOR_PROMPT,
             use_tools=True,
-            tool_allowlist=["run_powershell_guarded"],
+            tool_allowlist=_FIX_EXECUTOR_TOOLS,
         )
         print(f"\n[CrapBot] {response}")
             
@@ -1,25 +1,111 @@
 """Tool definitions and implementations for the AI Agent."""
+import ast
+import functools
+import itertools
 import json
+import locale
+import operator
+import platform
+import sys
 import requests
+from requests.adapters import HTTPAdapter
+from http.cookiejar import DefaultCookiePolicy
 import subprocess
 import os
 import tempfile
 import shutil
 import re
+import html
+import urllib.parse
 import time
+import threading
+import queue
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Callable
 from datetime import datetime
-from config import DATA_DIR, AGENT_WORKSPACE
+from config import DATA_DIR, AGENT_WORKSPACE, AGENT_NAME, PRETTY_TOOL_OUTPUT
 
 
 # Tool registry
 TOOLS: Dict[str, Dict[str, Any]] = {}
+# get_tool_definitions() output, rebuilt after each register_tool
+_tool_definitions: List[dict] = None
+
+# json.dumps options for execute_tool results. Compact by default: the model
+# reads them, whitespace costs tokens, and indent forces json's pure-Python encoder.
+_TOOL_JSON_OPTIONS = {"indent": 2} if PRETTY_TOOL_OUTPUT else {"separators": (",", ":")}
+
+# execute_tool results for tools registered with a cache_ttl:
+# (name, canonical JSON arguments) -> (time.monotonic(), result string), least recent first
+_TOOL_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_TOOL_CACHE_SIZE = 256
+_tool_cache_lock = threading.Lock()
+
+# Shared HTTP session for all tool requests, so repeat calls to a host reuse
+# its pooled keep-alive connection. Cookies are refused to keep each call
+# as stateless as a bare requests.request().
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers["User-Agent"] = f"{AGENT_NAME} {requests.utils.default_user_agent()}"
+_SESSION.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+# HTML-to-text cleanup for fetch_webpage
+_RE_SCRIPT = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_RE_STYLE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_WS = re.compile(r'\s+')
+# fetch_webpage reads at most this many body bytes per requested character of text
+# (markup, scripts and styles are stripped after the read)
+_FETCH_BYTES_PER_CHAR = 20
+
+# Runs the independent lookups inside web_search concurrently
+_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="web-search")
 
 # Code execution workspace — inside the agent's data folder
 CODE_WORKSPACE = AGENT_WORKSPACE
 os.makedirs(CODE_WORKSPACE, exist_ok=True)
 
+# Writes the files of create_and_run_project concurrently
+_project_write_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="project-write")
+
+# execute_python hands scripts to an interpreter that was started ahead of time:
+# the driver blocks on stdin for a filename line followed by the source, then
+# runs it as __main__, so interpreter startup happens while the agent is idle.
+# Each interpreter still runs exactly one script. The script runs in the real
+# __main__ namespace (pickle and multiprocessing look its classes up there);
+# the driver keeps its own names local so the script starts from a clean one.
+_PY_DRIVER = (
+    "def _run():\n"
+    "    import sys\n"
+    "    name = sys.stdin.readline().rstrip('\\n')\n"
+    "    src = sys.stdin.read()\n"
+    "    if not name:\n"
+    "        return\n"
+    "    sys.argv = [name]\n"
+    "    namespace = sys.modules['__main__'].__dict__\n"
+    "    del namespace['_run']\n"
+    "    namespace['__file__'] = name\n"
+    "    try:\n"
+    "        exec(compile(src, name, 'exec'), namespace)\n"
+    "    except SystemExit:\n"
+    "        raise\n"
+    "    except BaseException as e:\n"
+    "        import traceback\n"
+    "        traceback.print_exception(type(e), e, e.__traceback__.tb_next)\n"
+    "        sys.exit(1)\n"
+    "_run()\n"
+)
+_PY_SPARES = 2
+_py_spares: "queue.Queue[subprocess.Popen]" = queue.Queue(maxsize=_PY_SPARES)
+
+# File tools are confined to the data folder; resolved once since DATA_DIR is fixed
+_DATA_DIR_REAL = os.path.realpath(DATA_DIR)
+_DATA_DIR_REAL_PREFIX = os.path.join(_DATA_DIR_REAL, "")
+
 # System-change approval storage
 _AGENT_STATE_DIR = os.path.join(DATA_DIR, "agent_state")
 _APPROVALS_FILE = os.path.join(_AGENT_STATE_DIR, "system_change_approvals.json")
@@ -111,18 +197,15 @@ def run_powershell_guarded(command: str, approval_id: str,
         }
 
     try:
-        result = subprocess.run(
+        exit_code, stdout, stderr = _run_bounded(
             ["powershell", "-ExecutionPolicy", "Bypass", "-Command", command],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=DATA_DIR,
+            timeout, 10000, 5000, DATA_DIR
         )
         return {
-            "stdout": result.stdout[:10000] if result.stdout else "",
-            "stderr": result.stderr[:5000] if result.stderr else "",
-            "exit_code": result.returncode,
-            "success": result.returncode == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": exit_code,
+            "success": exit_code == 0,
         }
     except subprocess.TimeoutExpired:
         return {"error": "Command timed out", "success": False}
@@ -130,11 +213,15 @@ def run_powershell_guarded(command: str, approval_id: str,
         return {"error": str(e), "success": False}
 
 
+def _within_data_dir(resolved: str) -> bool:
+    """Check a realpath against the data folder (a sibling like data-other doesn't count)."""
+    return resolved == _DATA_DIR_REAL or resolved.startswith(_DATA_DIR_REAL_PREFIX)
+
+
 def _is_inside_data_dir(path: str) -> bool:
     """Check whether a resolved path is inside the agent's data folder."""
     try:
-        resolved = os.path.realpath(os.path.abspath(path))
-        return resolved.startswith(os.path.realpath(DATA_DIR))
+        return _within_data_dir(os.path.realpath(os.path.abspath(path)))
     except Exception:
         return False
 
@@ -150,50 +237,121 @@ def _resolve_safe_path(path: str) -> str:
     else:
         resolved = os.path.realpath(os.path.join(DATA_DIR, path))
     
-    if not resolved.startswith(os.path.realpath(DATA_DIR)):
+    if not _within_data_dir(resolved):
         raise PermissionError(
             f"Access denied: path '{path}' is outside the agent's data folder ({DATA_DIR})"
         )
     return resolved
 
 
-def register_tool(name: str, description: str, parameters: dict, func: Callable):
-    """Register a tool for the agent to use."""
+def register_tool(name: str, description: str, parameters: dict, func: Callable,
+                  cache_ttl: float = None, cache_key: Callable[[dict], dict] = None):
+    """Register a tool for the agent to use.
+    
+    Args:
+        cache_ttl: If set, execute_tool reuses a successful result for identical
+            arguments for this many seconds (float("inf") for pure functions).
+        cache_key: Optional function mapping arguments to a normalized copy used
+            as the cache key, so equivalent calls share one cached result.
+    """
+    global _tool_definitions
     TOOLS[name] = {
         "name": name,
         "description": description,
         "parameters": parameters,
         "function": func,
+        "cache_ttl": cache_ttl,
+        "cache_key": cache_key,
     }
+    _tool_definitions = None
 
 
 def get_tool_definitions() -> List[dict]:
-    """Get OpenAI-compatible tool definitions."""
-    definitions = []
-    for name, tool in TOOLS.items():
-        definitions.append({
-            "type": "function",
-            "function": {
-                "name": name,
-                "description": tool["description"],
-                "parameters": tool["parameters"],
+    """Get OpenAI-compatible tool definitions.
+    
+    The list is built once and shared between callers until the next
+    register_tool; callers must not modify it.
+    """
+    global _tool_definitions
+    if _tool_definitions is None:
+        _tool_definitions = [
+            {
+                "type": "function",
+                "function": {
+                    "name": name,
+                    "description": tool["description"],
+                    "parameters": tool["parameters"],
+                }
             }
-        })
-    return definitions
+            for name, tool in TOOLS.items()
+        ]
+    return _tool_definitions
 
 
 def execute_tool(name: str, arguments: dict) -> str:
     """Execute a tool by name with given arguments."""
-    if name not in TOOLS:
+    tool = TOOLS.get(name)
+    if tool is None:
         return json.dumps({"error": f"Unknown tool: {name}"})
     
+    ttl = tool["cache_ttl"]
+    key = None
+    if ttl:
+        key_args = tool["cache_key"](arguments) if tool["cache_key"] else arguments
+        key = (name, json.dumps(key_args, sort_keys=True, default=str))
+        with _tool_cache_lock:
+            hit = _TOOL_CACHE.get(key)
+            if hit is not None and time.monotonic() - hit[0] < ttl:
+                _TOOL_CACHE.move_to_end(key)
+                return hit[1]
+    
     try:
-        result = TOOLS[name]["function"](**arguments)
+        result = tool["function"](**arguments)
         if isinstance(result, (dict, list)):
-            return json.dumps(result, indent=2, default=str)
-        return str(result)
+            output = json.dumps(result, default=str, **_TOOL_JSON_OPTIONS)
+        else:
+            output = str(result)
     except Exception as e:
         return json.dumps({"error": str(e)})
+    
+    # Failures (e.g. a network error) are retried on the next call, not cached
+    failed = isinstance(result, dict) and ("error" in result or result.get("success") is False)
+    if key is not None and not failed:
+        with _tool_cache_lock:
+            _TOOL_CACHE[key] = (time.monotonic(), output)
+            _TOOL_CACHE.move_to_end(key)
+            if len(_TOOL_CACHE) > _TOOL_CACHE_SIZE:
+                _TOOL_CACHE.popitem(last=False)
+    return output
+
+
+def _url_cache_key(arguments: dict) -> dict:
+    """fetch_webpage cache key: scheme and host are case-insensitive, fragments never reach the server."""
+    url = arguments.get("url")
+    if not isinstance(url, str):
+        return arguments
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+        url = urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+    except ValueError:
+        pass
+    return {**arguments, "url": url}
+
+
+def _query_cache_key(arguments: dict) -> dict:
+    """web_search cache key: ignore case and spacing differences in the query."""
+    query = arguments.get("query")
+    if not isinstance(query, str):
+        return arguments
+    return {**arguments, "query": " ".join(query.split()).casefold()}
+
+
+def clear_tool_cache() -> dict:
+    """Drop all cached tool results."""
+    with _tool_cache_lock:
+        cleared = len(_TOOL_CACHE)
+        _TOOL_CACHE.clear()
+    return {"success": True, "cleared": cleared}
 
 
 # ============== Tool Implementations ==============
@@ -204,7 +362,7 @@ def rest_api_call(method: str, url: str, headers: dict = None, body: dict = None
     try:
         headers = headers or {}
         
-        response = requests.request(
+        response = _SESSION.request(
             method=method.upper(),
             url=url,
             headers=headers,
@@ -252,15 +410,16 @@ def read_file(path: str, max_lines: int = 100) -> dict:
         if not os.path.exists(path):
             return {"error": f"File not found: {path}"}
         
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
+        # Read one line past the limit so truncation is detectable without
+        # pulling the rest of a large file into memory
+        with open(path, 'r', encoding='utf-8', errors='ignore', buffering=1 << 16) as f:
+            lines = list(itertools.islice(f, max_lines + 1))
             
         if len(lines) > max_lines:
             content = ''.join(lines[:max_lines])
             return {
                 "content": content,
                 "truncated": True,
-                "total_lines": len(lines),
                 "shown_lines": max_lines
             }
         
@@ -278,30 +437,109 @@ def write_file(path: str, content: str, mode: str = "write") -> dict:
     try:
         path = _resolve_safe_path(path)
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        file_mode = 'a' if mode == "append" else 'w'
-        with open(path, file_mode, encoding='utf-8') as f:
-            f.write(content)
-        return {"success": True, "path": path, "mode": mode}
+        # Encode once and hand the bytes to a single write; keep the platform
+        # newline translation that text mode used to do
+        if os.linesep != "\n":
+            content = content.replace("\n", os.linesep)
+        data = content.encode('utf-8')
+        file_mode = 'ab' if mode == "append" else 'wb'
+        with open(path, file_mode, buffering=1 << 20) as f:
+            f.write(data)
+        return {"success": True, "path": path, "mode": mode, "bytes_written": len(data)}
     except Exception as e:
         return {"error": str(e), "success": False}
 
 
+def _drain(pipe, cap: int, chunks: List[bytes]):
+    """Read a pipe to EOF, keeping at most ``cap`` bytes so a chatty child can't exhaust memory."""
+    size = 0
+    with pipe:
+        for chunk in iter(lambda: pipe.read(65536), b""):
+            if size < cap:
+                chunks.append(chunk[:cap - size])
+                size += len(chunks[-1])
+
+
+def _decode_output(chunks: List[bytes], encoding: str) -> str:
+    """Decode captured output the way text=True would, newlines included."""
+    text = b"".join(chunks).decode(encoding, errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _collect_bounded(proc: subprocess.Popen, timeout: float, cap_out: int, cap_err: int,
+                     input: bytes = None, encoding: str = None) -> tuple:
+    """Wait for a process started with binary stdout/stderr pipes, capturing capped output.
+    
+    Args:
+        proc: Process whose stdout and stderr (and stdin, if ``input`` is given) are pipes
+        timeout: Seconds to wait for the process to exit and close its output
+        cap_out: Maximum stdout bytes to keep
+        cap_err: Maximum stderr bytes to keep
+        input: Bytes to write to stdin before closing it
+        encoding: Output encoding (default: the locale encoding, as with text=True)
+    
+    Returns:
+        (exit_code, stdout, stderr). Raises subprocess.TimeoutExpired after killing
+        the process if it runs past the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    out, err = [], []
+    threads = [
+        threading.Thread(target=_drain, args=(proc.stdout, cap_out, out), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, cap_err, err), daemon=True),
+    ]
+    if input is not None:
+        def feed():
+            try:
+                with proc.stdin:
+                    proc.stdin.write(input)
+            except (BrokenPipeError, OSError):
+                pass  # child exited without reading all of its input
+        threads.append(threading.Thread(target=feed, daemon=True))
+    for t in threads:
+        t.start()
+    try:
+        proc.wait(timeout=max(0, deadline - time.monotonic()))
+        for t in threads:
+            t.join(max(0, deadline - time.monotonic()))
+        if any(t.is_alive() for t in threads):
+            # The child exited but something it started still holds the pipes
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    encoding = encoding or locale.getpreferredencoding(False)
+    return proc.returncode, _decode_output(out, encoding), _decode_output(err, encoding)
+
+
+def _run_bounded(cmd, timeout: float, cap_out: int, cap_err: int, cwd: str,
+                 shell: bool = False, input: bytes = None, encoding: str = None) -> tuple:
+    """subprocess.run replacement that caps captured output at the pipe.
+    
+    Returns:
+        (exit_code, stdout, stderr); see _collect_bounded.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        shell=shell,
+        cwd=cwd,
+        stdin=subprocess.PIPE if input is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    return _collect_bounded(proc, timeout, cap_out, cap_err, input=input, encoding=encoding)
+
+
 def run_command(command: str, timeout: int = 60) -> dict:
     """Run a shell command (working directory is agent's data folder)."""
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=DATA_DIR
-        )
+        exit_code, stdout, stderr = _run_bounded(command, timeout, 5000, 2000, DATA_DIR, shell=True)
         return {
-            "stdout": result.stdout[:5000] if len(result.stdout) > 5000 else result.stdout,
-            "stderr": result.stderr[:2000] if len(result.stderr) > 2000 else result.stderr,
-            "exit_code": result.returncode,
-            "success": result.returncode == 0
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": exit_code,
+            "success": exit_code == 0
         }
     except subprocess.TimeoutExpired:
         return {"error": "Command timed out", "success": False}
@@ -317,13 +555,14 @@ def list_directory(path: str = ".") -> dict:
             return {"error": f"Directory not found: {path}"}
         
         items = []
-        for item in os.listdir(path):
-            full_path = os.path.join(path, item)
-            items.append({
-                "name": item,
-                "type": "directory" if os.path.isdir(full_path) else "file",
-                "size": os.path.getsize(full_path) if os.path.isfile(full_path) else None
-            })
+        # scandir entries carry the file type, so only regular files need a stat
+        with os.scandir(path) as entries:
+            for entry in entries:
+                items.append({
+                    "name": entry.name,
+                    "type": "directory" if entry.is_dir() else "file",
+                    "size": entry.stat().st_size if entry.is_file() else None
+                })
         
         return {"path": path, "items": items, "count": len(items)}
     except Exception as e:
@@ -340,15 +579,84 @@ def http_post(url: str, body: dict, headers: dict = None) -> dict:
     return rest_api_call("POST", url, headers=headers, body=body)
 
 
+# Whitelist for calculate's expression evaluator
+_CALC_MAX_BITS = 100_000  # caps int results (and list repeats) so 9**9**9-style inputs can't hang the agent
+
+
+def _check_result_size(op: type, left, right):
+    """Raise ValueError if `left op right` would build an oversized int or list."""
+    if op is ast.Pow:
+        if type(left) is int and type(right) is int and right > 0 and abs(left) > 1:
+            size = abs(left).bit_length() * right
+        else:
+            return
+    elif op is ast.Mult:
+        if isinstance(left, list) and type(right) is int:
+            size = len(left) * right
+        elif isinstance(right, list) and type(left) is int:
+            size = len(right) * left
+        elif type(left) is int and type(right) is int:
+            size = abs(left).bit_length() + abs(right).bit_length()
+        else:
+            return
+    else:
+        return
+    if size > _CALC_MAX_BITS:
+        raise ValueError("Result too large")
+
+
+def _calc_pow(base, exp, mod=None):
+    """pow() for calculate, with the same size limit as the ** operator."""
+    if mod is None:
+        _check_result_size(ast.Pow, base, exp)
+    return pow(base, exp, mod)
+
+
+_CALC_FUNCS = {
+    'abs': abs, 'round': round, 'min': min, 'max': max,
+    'sum': sum, 'pow': _calc_pow, 'len': len,
+}
+_CALC_BINOPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+_CALC_UNARYOPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expression(expression: str) -> ast.AST:
+    """Parse an expression once; repeated expressions reuse the tree."""
+    return ast.parse(expression.strip(), mode="eval").body
+
+
+def _eval_node(node: ast.AST):
+    """Evaluate a parsed expression, allowing only numbers, arithmetic and _CALC_FUNCS."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float, complex):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _CALC_BINOPS:
+        left, right = _eval_node(node.left), _eval_node(node.right)
+        _check_result_size(type(node.op), left, right)
+        return _CALC_BINOPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _CALC_UNARYOPS:
+        return _CALC_UNARYOPS[type(node.op)](_eval_node(node.operand))
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_eval_node(e) for e in node.elts]
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _CALC_FUNCS:
+        args = [_eval_node(a) for a in node.args]
+        kwargs = {k.arg: _eval_node(k.value) for k in node.keywords if k.arg}
+        if len(kwargs) != len(node.keywords):
+            raise ValueError("Unsupported expression element: **kwargs")
+        return _CALC_FUNCS[node.func.id](*args, **kwargs)
+    if isinstance(node, ast.Name):
+        raise ValueError(f"Unknown name: {node.id}")
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+
 def calculate(expression: str) -> dict:
     """Evaluate a mathematical expression."""
     try:
-        # Safe evaluation of math expressions
-        allowed_names = {
-            'abs': abs, 'round': round, 'min': min, 'max': max,
-            'sum': sum, 'pow': pow, 'len': len,
-        }
-        result = eval(expression, {"__builtins__": {}}, allowed_names)
+        result = _eval_node(_parse_expression(expression))
         return {"expression": expression, "result": result}
     except Exception as e:
         return {"error": str(e), "expression": expression}
@@ -363,16 +671,28 @@ def json_parse(json_string: str) -> dict:
         return {"error": str(e), "success": False}
 
 
+@functools.lru_cache(maxsize=1)
+def _python_version() -> str:
+    """Version of the `python` on PATH that execute_python runs (looked up once per process)."""
+    on_path = shutil.which("python")
+    if on_path and os.path.realpath(on_path) == os.path.realpath(sys.executable):
+        # Same interpreter as the agent: no need to spawn it to ask
+        return f"Python {platform.python_version()}"
+    return subprocess.run(
+        ["python", "--version"], 
+        capture_output=True, text=True
+    ).stdout.strip()
+
+
 def environment_info() -> dict:
     """Get environment information."""
     return {
-        "platform": os.name,
+        "platform": sys.platform,
+        "os_name": os.name,
         "cwd": os.getcwd(),
-        "user": os.environ.get("USERNAME", os.environ.get("USER", "unknown")),
-        "python_version": subprocess.run(
-            ["python", "--version"], 
-            capture_output=True, text=True
-        ).stdout.strip(),
+        "user": os.environ.get("USERNAME") or os.environ.get("USER") or "unknown",
+        "python_version": _python_version(),
+        "python_impl": platform.python_implementation(),
         "data_directory": DATA_DIR,
         "code_workspace": CODE_WORKSPACE
     }
@@ -380,66 +700,96 @@ def environment_info() -> dict:
 
 # ============== Code Execution Tools ==============
 
+def _spawn_python() -> subprocess.Popen:
+    """Start an interpreter running _PY_DRIVER, waiting for a script on stdin."""
+    return subprocess.Popen(
+        ["python", "-c", _PY_DRIVER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=CODE_WORKSPACE,
+        env={**os.environ, "PYTHONIOENCODING": "utf-8"}
+    )
+
+
+def _take_python() -> subprocess.Popen:
+    """Take a warm interpreter (or start one) and start its replacement."""
+    proc = None
+    while proc is None:
+        try:
+            proc = _py_spares.get_nowait()
+        except queue.Empty:
+            proc = _spawn_python()
+            break
+        if proc.poll() is not None:
+            proc = None
+    try:
+        _py_spares.put_nowait(_spawn_python())
+    except queue.Full:
+        pass
+    except Exception as e:
+        print(f"[Tools] Could not start spare Python interpreter: {e}")
+    return proc
+
+
 def execute_python(code: str, filename: str = None) -> dict:
-    """Execute Python code."""
-    filename = filename or f"script_{datetime.now().strftime('%Y%m%d_%H%M%S')}.py"
-    filepath = os.path.join(CODE_WORKSPACE, filename)
+    """Execute Python code. The script is only saved to disk when a filename is given."""
+    filepath = os.path.join(CODE_WORKSPACE, filename) if filename else None
     
     try:
-        # Write code to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(code)
+        if filepath:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(code)
         
         # Execute
-        result = subprocess.run(
-            ["python", filepath],
-            capture_output=True,
-            text=True,
-            timeout=120,
-            cwd=CODE_WORKSPACE
+        script = f"{filepath or '<stdin>'}\n{code}".encode("utf-8")
+        exit_code, stdout, stderr = _collect_bounded(
+            _take_python(), 120, 10000, 5000, input=script, encoding="utf-8"
         )
         
-        return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout[:10000] if result.stdout else "",
-            "stderr": result.stderr[:5000] if result.stderr else "",
-            "exit_code": result.returncode,
-            "file": filepath
+        result = {
+            "success": exit_code == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": exit_code
         }
+        if filepath:
+            result["file"] = filepath
+        return result
     except subprocess.TimeoutExpired:
-        return {"error": "Execution timed out (120s limit)", "success": False, "file": filepath}
+        return {"error": "Execution timed out (120s limit)", "success": False}
     except Exception as e:
         return {"error": str(e), "success": False}
 
 
 def execute_javascript(code: str, filename: str = None) -> dict:
-    """Execute JavaScript/Node.js code."""
-    filename = filename or f"script_{datetime.now().strftime('%Y%m%d_%H%M%S')}.js"
-    filepath = os.path.join(CODE_WORKSPACE, filename)
+    """Execute JavaScript/Node.js code. The script is only saved to disk when a filename is given."""
+    filepath = os.path.join(CODE_WORKSPACE, filename) if filename else None
     
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(code)
+        if filepath:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(code)
         
-        result = subprocess.run(
-            ["node", filepath],
-            capture_output=True,
-            text=True,
-            timeout=120,
-            cwd=CODE_WORKSPACE
+        # Unsaved scripts are piped to node's stdin
+        exit_code, stdout, stderr = _run_bounded(
+            ["node", filepath or "-"], 120, 10000, 5000, CODE_WORKSPACE,
+            input=None if filepath else code.encode("utf-8"), encoding="utf-8"
         )
         
-        return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout[:10000] if result.stdout else "",
-            "stderr": result.stderr[:5000] if result.stderr else "",
-            "exit_code": result.returncode,
-            "file": filepath
+        output = {
+            "success": exit_code == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": exit_code
         }
+        if filepath:
+            output["file"] = filepath
+        return output
     except FileNotFoundError:
         return {"error": "Node.js not found. Install Node.js to run JavaScript.", "success": False}
     except subprocess.TimeoutExpired:
-        return {"error": "Execution timed out (120s limit)", "success": False, "file": filepath}
+        return {"error": "Execution timed out (120s limit)", "success": False}
     except Exception as e:
         return {"error": str(e), "success": False}
 
@@ -453,19 +803,16 @@ def execute_powershell(code: str, filename: str = None) -> dict:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(code)
         
-        result = subprocess.run(
+        exit_code, stdout, stderr = _run_bounded(
             ["powershell", "-ExecutionPolicy", "Bypass", "-File", filepath],
-            capture_output=True,
-            text=True,
-            timeout=120,
-            cwd=CODE_WORKSPACE
+            120, 10000, 5000, CODE_WORKSPACE
         )
         
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout[:10000] if result.stdout else "",
-            "stderr": result.stderr[:5000] if result.stderr else "",
-            "exit_code": result.returncode,
+            "success": exit_code == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": exit_code,
             "file": filepath
         }
     except subprocess.TimeoutExpired:
@@ -497,6 +844,16 @@ def execute_code(language: str, code: str, filename: str = None) -> dict:
     return executors[language](code, filename)
 
 
+def _write_project_file(project_dir: str, filename: str, content: str) -> str:
+    """Write one project file, creating subdirectories if needed. Returns its path."""
+    filepath = os.path.join(project_dir, filename)
+    if os.path.dirname(filepath):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return filepath
+
+
 def create_and_run_project(project_type: str, name: str, code_files: dict) -> dict:
     """Create a project with multiple files and run it."""
     project_dir = os.path.join(CODE_WORKSPACE, name)
@@ -505,46 +862,29 @@ def create_and_run_project(project_type: str, name: str, code_files: dict) -> di
         # Create project directory
         os.makedirs(project_dir, exist_ok=True)
         
-        # Write all files
-        created_files = []
-        for filename, content in code_files.items():
-            filepath = os.path.join(project_dir, filename)
-            # Create subdirectories if needed
-            os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            created_files.append(filepath)
+        # Write all files (in order of code_files, which map() preserves)
+        created_files = list(_project_write_executor.map(
+            lambda item: _write_project_file(project_dir, *item), code_files.items()
+        ))
         
         # Determine entry point and run
         if project_type == "python":
             entry = "main.py" if "main.py" in code_files else list(code_files.keys())[0]
-            result = subprocess.run(
-                ["python", entry],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                cwd=project_dir
-            )
+            exit_code, stdout, stderr = _run_bounded(["python", entry], 120, 10000, 5000, project_dir)
         elif project_type in ["javascript", "node"]:
             # Install dependencies if package.json exists
             if "package.json" in code_files:
-                subprocess.run(["npm", "install"], cwd=project_dir, capture_output=True, timeout=120)
+                _run_bounded(["npm", "install"], 120, 0, 0, project_dir)
             entry = "index.js" if "index.js" in code_files else list(code_files.keys())[0]
-            result = subprocess.run(
-                ["node", entry],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                cwd=project_dir
-            )
+            exit_code, stdout, stderr = _run_bounded(["node", entry], 120, 10000, 5000, project_dir)
         else:
             return {"error": f"Unknown project type: {project_type}", "success": False}
         
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout[:10000] if result.stdout else "",
-            "stderr": result.stderr[:5000] if result.stderr else "",
-            "exit_code": result.returncode,
+            "success": exit_code == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": exit_code,
             "project_dir": project_dir,
             "files_created": created_files
         }
@@ -558,25 +898,21 @@ def create_and_run_project(project_type: str, name: str, code_files: dict) -> di
 def install_package(package_manager: str, packages: list) -> dict:
     """Install packages using pip, npm, etc."""
     try:
+        # Skip prompts, version checks, audits and index round-trips the agent doesn't need;
+        # both tools already keep a persistent per-user download cache
         if package_manager == "pip":
-            cmd = ["pip", "install"] + packages
+            cmd = ["pip", "install", "--no-input", "--disable-pip-version-check", "--prefer-binary"] + packages
         elif package_manager == "npm":
-            cmd = ["npm", "install"] + packages
+            cmd = ["npm", "install", "--no-audit", "--no-fund", "--prefer-offline"] + packages
         else:
             return {"error": f"Unknown package manager: {package_manager}", "success": False}
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,
-            cwd=CODE_WORKSPACE
-        )
+        exit_code, stdout, stderr = _run_bounded(cmd, 300, 5000, 2000, CODE_WORKSPACE)
         
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout[:5000] if result.stdout else "",
-            "stderr": result.stderr[:2000] if result.stderr else "",
+            "success": exit_code == 0,
+            "stdout": stdout,
+            "stderr": stderr,
             "packages": packages
         }
     except subprocess.TimeoutExpired:
@@ -589,12 +925,20 @@ def list_code_workspace() -> dict:
     """List files in the code workspace."""
     try:
         items = []
-        for root, dirs, files in os.walk(CODE_WORKSPACE):
-            rel_root = os.path.relpath(root, CODE_WORKSPACE)
-            for f in files:
-                rel_path = os.path.join(rel_root, f) if rel_root != "." else f
-                items.append(rel_path)
-        return {"workspace": CODE_WORKSPACE, "files": items[:100], "count": len(items)}
+        pending = [CODE_WORKSPACE]
+        # Stop one past the listing limit: enough to know the result is truncated
+        while pending and len(items) <= 100:
+            subdirs = []
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    else:
+                        items.append(os.path.relpath(entry.path, CODE_WORKSPACE))
+            pending.extend(reversed(subdirs))
+        return {"workspace": CODE_WORKSPACE, "files": items[:100], "count": min(len(items), 100),
+                "truncated": len(items) > 100}
     except Exception as e:
         return {"error": str(e)}
 
@@ -603,8 +947,9 @@ def read_code_file(filename: str) -> dict:
     """Read a file from the code workspace."""
     filepath = os.path.join(CODE_WORKSPACE, filename)
     try:
+        # Read one character past the limit rather than the whole file
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+            content = f.read(20001)
         return {"file": filename, "content": content[:20000], "truncated": len(content) > 20000}
     except FileNotFoundError:
         return {"error": f"File not found: {filename}"}
@@ -618,28 +963,30 @@ def cleanup_workspace(older_than_hours: int = 24) -> dict:
         deleted = 0
         cutoff = datetime.now().timestamp() - (older_than_hours * 3600)
         
-        for item in os.listdir(CODE_WORKSPACE):
-            path = os.path.join(CODE_WORKSPACE, item)
-            if os.path.getmtime(path) < cutoff:
-                if os.path.isdir(path):
-                    shutil.rmtree(path)
-                else:
-                    os.remove(path)
-                deleted += 1
+        with os.scandir(CODE_WORKSPACE) as entries:
+            for entry in entries:
+                # Symlinks are judged and removed as links, never followed
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.remove(entry.path)
+                    deleted += 1
         
         return {"deleted": deleted, "workspace": CODE_WORKSPACE}
     except Exception as e:
         return {"error": str(e)}
 
 
-def web_search(query: str, num_results: int = 5) -> dict:
-    """Search the web using public APIs."""
+def _search_ddg(query: str, num_results: int) -> List[dict]:
+    """DuckDuckGo instant answers (no API key needed)."""
     results = []
-    
-    # DuckDuckGo instant answers (no API key needed)
     try:
-        ddg_url = f"https://api.duckduckgo.com/?q={query}&format=json&no_html=1&skip_disambig=1"
-        response = requests.get(ddg_url, timeout=10)
+        response = _SESSION.get(
+            "https://api.duckduckgo.com/",
+            params={"q": query, "format": "json", "no_html": 1, "skip_disambig": 1},
+            timeout=10,
+        )
         if response.status_code == 200:
             data = response.json()
             if data.get("Abstract"):
@@ -657,13 +1004,20 @@ def web_search(query: str, num_results: int = 5) -> dict:
                         "url": topic.get("FirstURL", ""),
                         "source": "DuckDuckGo"
                     })
-    except Exception as e:
+    except Exception:
         pass
-    
-    # Wikipedia for knowledge queries
+    return results
+
+
+def _search_wiki(query: str, num_results: int) -> List[dict]:
+    """Wikipedia opensearch for knowledge queries."""
+    results = []
     try:
-        wiki_search_url = f"https://en.wikipedia.org/w/api.php?action=opensearch&search={query}&limit={num_results}&format=json"
-        response = requests.get(wiki_search_url, timeout=10)
+        response = _SESSION.get(
+            "https://en.wikipedia.org/w/api.php",
+            params={"action": "opensearch", "search": query, "limit": num_results, "format": "json"},
+            timeout=10,
+        )
         if response.status_code == 200:
             data = response.json()
             if len(data) >= 4:
@@ -676,8 +1030,17 @@ def web_search(query: str, num_results: int = 5) -> dict:
                             "url": urls[i] if i < len(urls) else "",
                             "source": "Wikipedia"
                         })
-    except:
+    except Exception:
         pass
+    return results
+
+
+def web_search(query: str, num_results: int = 5) -> dict:
+    """Search the web using public APIs."""
+    # The two lookups are independent, so run them side by side
+    ddg = _search_executor.submit(_search_ddg, query, num_results)
+    wiki = _search_executor.submit(_search_wiki, query, num_results)
+    results = ddg.result() + wiki.result()
     
     if results:
         return {"success": True, "query": query, "results": results[:num_results], "count": len(results)}
@@ -691,28 +1054,43 @@ def fetch_webpage(url: str, max_length: int = 5000) -> dict:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+        byte_cap = max_length * _FETCH_BYTES_PER_CHAR
+        with _SESSION.get(url, headers=headers, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and not (content_type.startswith("text/")
+                                     or any(t in content_type for t in ("html", "xml", "json"))):
+                return {"success": False, "url": url,
+                        "error": f"Not a text page (Content-Type: {content_type})"}
+            
+            # Read only as much of the body as the text limit can use
+            chunks, size = [], 0
+            for chunk in response.iter_content(chunk_size=65536):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= byte_cap:
+                    break
+            body = b"".join(chunks)
+            body_truncated = len(body) > byte_cap
+            encoding = response.encoding or "utf-8"
         
         # Basic HTML to text extraction
-        import re
-        text = response.text
+        text = body[:byte_cap].decode(encoding, errors="replace")
         
         # Remove scripts and styles
-        text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.IGNORECASE)
+        text = _RE_SCRIPT.sub('', text)
+        text = _RE_STYLE.sub('', text)
         
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', text)
+        text = _RE_TAG.sub(' ', text)
         
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _RE_WS.sub(' ', text).strip()
         
         # Decode HTML entities
-        import html
         text = html.unescape(text)
         
-        truncated = len(text) > max_length
+        truncated = body_truncated or len(text) > max_length
         text = text[:max_length]
         
         return {
@@ -919,7 +1297,8 @@ register_tool(
         },
         "required": ["expression"]
     },
-    func=calculate
+    func=calculate,
+    cache_ttl=float("inf")
 )
 
 register_tool(
@@ -930,7 +1309,8 @@ register_tool(
         "properties": {},
         "required": []
     },
-    func=environment_info
+    func=environment_info,
+    cache_ttl=300
 )
 
 # ============== Code Execution Tool Registrations ==============
@@ -972,7 +1352,7 @@ register_tool(
             },
             "filename": {
                 "type": "string",
-                "description": "Optional filename (default: auto-generated)"
+                "description": "Optional filename to save the script under (default: run without saving)"
             }
         },
         "required": ["code"]
@@ -992,7 +1372,7 @@ register_tool(
             },
             "filename": {
                 "type": "string",
-                "description": "Optional filename (default: auto-generated)"
+                "description": "Optional filename to save the script under (default: run without saving)"
             }
         },
         "required": ["code"]
@@ -1155,7 +1535,9 @@ register_tool(
         },
         "required": ["query"]
     },
-    func=web_search
+    func=web_search,
+    cache_ttl=120,
+    cache_key=_query_cache_key
 )
 
 register_tool(
@@ -1175,7 +1557,20 @@ register_tool(
         },
         "required": ["url"]
     },
-    func=fetch_webpage
+    func=fetch_webpage,
+    cache_ttl=300,
+    cache_key=_url_cache_key
+)
+
+register_tool(
+    name="clear_tool_cache",
+    description="Clear cached results of web_search, fetch_webpage, calculate and environment_info, forcing fresh results on the next call.",
+    parameters={
+        "type": "object",
+        "properties": {},
+        "required": []
+    },
+    func=clear_tool_cache
 )
 
 
@@ -1,39 +1,74 @@
 """Flask web application for CrapBot."""
 import base64
 import functools
+import heapq
+import itertools
 import json
 import os
+import secrets
 import sys
 import threading
 import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from urllib.parse import unquote
 
-from flask import Flask, render_template, request, jsonify, Response, make_response
+from flask import Flask, render_template, request, jsonify, Response, make_response, g
 
 from ai_client import get_ai_client, AIClient
-from autonomous_agent import AutonomousAgent, CriticAgent, AgentMailbox, persona_manager
-from deep_research_agent import ResearchOrchestrator
-from config import AGENT_NAME
+from autonomous_agent import (AutonomousAgent, CriticAgent, AgentMailbox, persona_manager,
+                              _run_in_agent_thread)
+from deep_research_agent import ResearchOrchestrator, ResearchCancelled
+from config import AGENT_NAME, MAX_CONCURRENT_RESEARCH
 
 GOOGLE_CLIENT_ID = "446284060043-t6871c7h7thc2v6aud1sp97lpe096027.apps.googleusercontent.com"
 AUTH_COOKIE = "crapbot_auth"
 
 app = Flask(__name__, template_folder=os.path.join(os.path.dirname(__file__), "templates"))
+# jsonify sorts keys by default; responses are built in a deliberate order and
+# sorting every log-line payload is wasted work
+app.json.sort_keys = False
 
 # ── Session registry ─────────────────────────────────────────────────────────
 # Tracks all active agentic sessions so they can be listed / stopped.
+# _sessions_lock only guards inserting and deleting entries; each session's
+# output, status and result are guarded by its own "_cond" (a Condition, used
+# as the session lock), so busy sessions don't block each other or the listing.
+# Plain _sessions.get() lookups are atomic and need no lock.
 _sessions_lock = threading.Lock()
 _sessions: Dict[str, Dict[str, Any]] = {}
 
+# /api/sessions body, rebuilt only after a session is added, removed or changes
+# status: (_sessions_version it was built at, JSON bytes)
+_sessions_version = 0
+_sessions_view = (-1, b"")
+
+# (stopped_at, session_id) in the order sessions stopped, so the watchdog
+# only looks at sessions old enough to forget
+_stopped_sessions: deque = deque()
+
+# Lines kept per session output stream; older lines are dropped
+SESSION_LOG_LINES = 500
+
+# Session IDs: the counter keeps them unique, the random suffix keeps them
+# from being guessed in sequence
+_session_counter = itertools.count(1)
+
 
 # ── Per-browser-session AIClient instances ────────────────────────────────────
+# sid -> [client, last-used monotonic time], least recently used first.
+# Bounded in size (least recently used evicted first) and swept for idle
+# sessions by the watchdog so abandoned browser sessions don't keep their
+# clients and conversation history forever. _client_lock guards all access;
+# every operation under it is O(1) apart from the idle sweep's evictions.
 _client_lock = threading.Lock()
-_session_clients: Dict[str, AIClient] = {}
+_session_clients: "OrderedDict[str, list]" = OrderedDict()
 
 SESSION_COOKIE = "crapbot_session"
+MAX_SESSION_CLIENTS = 1000
+SESSION_CLIENT_IDLE_SECONDS = 86400
 
 
 def _get_session_client() -> AIClient:
@@ -41,30 +76,66 @@ def _get_session_client() -> AIClient:
     sid = request.cookies.get(SESSION_COOKIE)
     if not sid:
         sid = uuid.uuid4().hex
+        # New session: the after-request hook sets its cookie
+        request._crapbot_sid = sid  # type: ignore[attr-defined]
+    evicted = []
     with _client_lock:
-        if sid not in _session_clients:
-            _session_clients[sid] = AIClient()
-    # Stash sid so the after-request hook can set the cookie if needed.
-    request._crapbot_sid = sid  # type: ignore[attr-defined]
-    return _session_clients[sid]
+        entry = _session_clients.get(sid)
+        if entry is None:
+            entry = _session_clients[sid] = [AIClient(), time.monotonic()]
+            while len(_session_clients) > MAX_SESSION_CLIENTS:
+                evicted.append(_session_clients.popitem(last=False)[1][0])
+        else:
+            _session_clients.move_to_end(sid)
+            entry[1] = time.monotonic()
+    for client in evicted:
+        client.close()
+    return entry[0]
+
+
+def _evict_idle_clients():
+    """Close and drop AIClients whose browser session has been idle too long."""
+    cutoff = time.monotonic() - SESSION_CLIENT_IDLE_SECONDS
+    evicted = []
+    with _client_lock:
+        # Least recently used first, so the idle ones are all at the front
+        while _session_clients:
+            sid, (client, last_used) = next(iter(_session_clients.items()))
+            if last_used > cutoff:
+                break
+            del _session_clients[sid]
+            evicted.append(client)
+    for client in evicted:
+        client.close()
 
 
 @app.after_request
 def _set_session_cookie(response: Response) -> Response:
     sid = getattr(request, "_crapbot_sid", None)
-    if sid and SESSION_COOKIE not in request.cookies:
+    if sid:
         response.set_cookie(SESSION_COOKIE, sid, httponly=True, samesite="Lax")
     return response
 
 
 # ── Authentication ────────────────────────────────────────────────────────────
 def _get_auth_user():
-    """Return user info dict from the auth cookie, or None."""
-    raw = request.cookies.get(AUTH_COOKIE)
+    """Return user info dict from the auth cookie, or None.
+
+    Parsed once per request and kept on flask.g.
+    """
+    if "_auth_user" not in g:
+        g._auth_user = _parse_auth_cookie(request.cookies.get(AUTH_COOKIE))
+    return g._auth_user
+
+
+def _parse_auth_cookie(raw: Optional[str]):
+    """Decode the auth cookie's JSON user info; None if missing or malformed."""
     if not raw:
         return None
+    if "%" in raw:
+        raw = unquote(raw)
     try:
-        return json.loads(unquote(raw))
+        return json.loads(raw)
     except (json.JSONDecodeError, ValueError):
         return None
 
@@ -79,15 +150,20 @@ def require_auth(f):
     return wrapper
 
 
+def _json_body() -> Dict[str, Any]:
+    """The request's JSON object, or {} if the body is missing, malformed or not an object."""
+    data = request.get_json(force=True, silent=True)
+    return data if isinstance(data, dict) else {}
+
+
 def _b64url_decode(s: str) -> bytes:
     """Base64url decode without padding."""
-    s += "=" * (4 - len(s) % 4)
-    return base64.urlsafe_b64decode(s)
+    return base64.urlsafe_b64decode(s.encode("ascii") + b"==="[:-len(s) & 3])
 
 
 @app.route("/api/auth/verify", methods=["POST"])
 def api_auth_verify():
-    data = request.get_json(force=True)
+    data = _json_body()
     credential = data.get("credential", "")
     if not credential:
         return jsonify({"error": "Missing credential"}), 400
@@ -128,6 +204,11 @@ def api_auth_me():
     return jsonify(user)
 
 
+def _new_session_id(prefix: str) -> str:
+    """Return a fresh session ID like ``research-1f-a3c9e2``."""
+    return f"{prefix}-{next(_session_counter):x}-{secrets.token_hex(3)}"
+
+
 def _register_session(session_id: str, session_type: str, description: str,
                       timeout_seconds: Optional[float], stop_fn,
                       extra_outputs: Optional[Dict[str, list]] = None) -> Dict[str, Any]:
@@ -135,32 +216,81 @@ def _register_session(session_id: str, session_type: str, description: str,
 
     Args:
         extra_outputs: optional dict of named output streams beyond the main
-                       one, e.g. {"agent": [], "critic": []}.
+                       one, e.g. {"agent": [], "critic": []}. Only the names
+                       are used; each stream gets its own rolling log.
     """
+    now = datetime.now()
     entry = {
         "id": session_id,
         "type": session_type,
         "description": description,
-        "started_at": datetime.now().isoformat(),
+        "started_at": now.isoformat(),
         "timeout_seconds": timeout_seconds,
-        "expires_at": (datetime.now() + timedelta(seconds=timeout_seconds)).isoformat()
+        "expires_at": (now + timedelta(seconds=timeout_seconds)).isoformat()
                       if timeout_seconds else None,
         "status": "running",
         "stop": stop_fn,        # callable – not serialised
-        "output": [],           # rolling log of output lines (main)
+        "output": deque(maxlen=SESSION_LOG_LINES),  # rolling log of output lines (main)
+        # Lines ever appended per stream, so readers can resume by position
+        # after old lines are trimmed from the rolling log
+        "_appended": {"output": 0, **{name: 0 for name in (extra_outputs or {})}},
+        # Session lock; also wakes /stream readers on new output or status change
+        "_cond": threading.Condition(),
     }
     if extra_outputs:
-        entry["extra_outputs"] = extra_outputs
+        entry["extra_outputs"] = {name: deque(maxlen=SESSION_LOG_LINES) for name in extra_outputs}
     with _sessions_lock:
         _sessions[session_id] = entry
+    _sessions_changed()
+    if timeout_seconds is not None:
+        _schedule_timeout(session_id, time.monotonic() + timeout_seconds)
     return entry
 
 
-def _unregister_session(session_id: str):
+def _time_out_session(sess: Dict[str, Any]):
+    """Stop a session that reached its timeout."""
+    if sess["status"] != "running":
+        return
+    # stop() runs without the session lock so it can't deadlock with _unregister_session
+    try:
+        sess["stop"]()
+    except Exception:
+        pass
+    _end_session(sess, "timed_out")
+
+
+def _sessions_changed():
+    """Invalidate the cached /api/sessions body."""
+    global _sessions_version
     with _sessions_lock:
-        if session_id in _sessions:
-            _sessions[session_id]["status"] = "stopped"
-            _sessions[session_id]["stopped_at"] = time.monotonic()
+        _sessions_version += 1
+
+
+def _mark_stopped(sess: Dict[str, Any], status: str):
+    """Set a session's final status. Call with the session's "_cond" held."""
+    sess["status"] = status
+    if "stopped_at" not in sess:
+        sess["stopped_at"] = time.monotonic()
+        _stopped_sessions.append((sess["stopped_at"], sess["id"]))
+
+
+def _unregister_session(session_id: str):
+    """Mark a session stopped once its work has finished.
+
+    A session already stopped or timed out keeps that status.
+    """
+    sess = _sessions.get(session_id)
+    if sess:
+        _end_session(sess, "stopped")
+
+
+def _end_session(sess: Dict[str, Any], status: str):
+    """Move a still-running session to ``status`` and wake its /stream readers."""
+    with sess["_cond"]:
+        if sess["status"] == "running":
+            _mark_stopped(sess, status)
+        sess["_cond"].notify_all()
+    _sessions_changed()
 
 
 def _session_output(session_id: str, text: str, stream: str = "output"):
@@ -169,90 +299,121 @@ def _session_output(session_id: str, text: str, stream: str = "output"):
     Args:
         stream: key name – "output" for main, or a name inside extra_outputs.
     """
-    with _sessions_lock:
-        sess = _sessions.get(session_id)
-        if not sess:
+    sess = _sessions.get(session_id)
+    if not sess:
+        return
+    if stream == "output":
+        buf = sess["output"]
+    else:
+        buf = sess.get("extra_outputs", {}).get(stream)
+        if buf is None:
             return
-        if stream == "output":
-            buf = sess["output"]
-        else:
-            buf = sess.get("extra_outputs", {}).get(stream)
-            if buf is None:
-                return
-        buf.append(text)
-        # Keep last 500 lines to avoid unbounded memory
-        if len(buf) > 500:
-            del buf[:len(buf) - 500]
+    # Stored JSON-encoded, so polls and streams never re-encode a line;
+    # encoded before taking the lock so readers only wait for the append
+    line = json.dumps(text)
+    with sess["_cond"]:
+        # the deque drops its oldest line once full
+        buf.append(line)
+        sess["_appended"][stream] += 1
+        sess["_cond"].notify_all()
+
+
+def _json_with_lines(fields: Dict[str, Any], lines, key: str = "lines") -> str:
+    """JSON object of ``fields`` plus a ``key`` array spliced from pre-encoded lines."""
+    return f'{json.dumps(fields)[:-1]}, "{key}": [{", ".join(lines)}]}}'
+
+
+def _stream_lines_since(sess: Dict[str, Any], stream: str, position: int):
+    """Return (JSON-encoded lines appended after ``position``, new position,
+    lines dropped) for a stream.
+
+    ``position`` counts every line ever appended to the stream, so it stays
+    valid as old lines fall out of the rolling log; lines that fell out
+    before they were read are skipped and counted as dropped. Call with the
+    session's "_cond" held.
+    """
+    buf = sess["output"] if stream == "output" else sess.get("extra_outputs", {}).get(stream, ())
+    total = sess["_appended"].get(stream, 0)
+    first = total - len(buf)  # position of buf[0]
+    start = max(position, first)
+    return list(itertools.islice(buf, start - first, None)), total, start - min(position, start)
 
 
-def _parse_timeout(value: str) -> Optional[float]:
-    """Parse a timeout string into seconds. Returns None for unlimited."""
-    if not value or value.lower() == "unlimited":
+def _parse_timeout(value) -> Optional[float]:
+    """Parse a timeout (seconds, as a JSON number or string) into seconds.
+
+    Returns None for unlimited.
+    """
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if not value or value == "unlimited":
+            return None
+        try:
+            value = float(value)
+        except ValueError:
+            return 3600.0  # default 1 hour
+    elif value is None:
         return None
-    try:
-        num = float(value)
-        return num if num > 0 else None
-    except (ValueError, TypeError):
-        return 3600.0  # default 1 hour
+    elif not isinstance(value, (int, float)):
+        return 3600.0
+    return value if value > 0 else None
+
+
+# ── Timeout scheduler ────────────────────────────────────────────────────────
+# One thread sleeps until the earliest session deadline instead of a timer
+# per session. Entries are (monotonic deadline, session id); sessions that
+# ended or were forgotten before their deadline are skipped when it comes up.
+_timeouts_cond = threading.Condition()
+_timeouts: list = []
+
+
+def _schedule_timeout(session_id: str, deadline: float):
+    """Arrange for a session to be timed out at ``deadline`` (time.monotonic())."""
+    with _timeouts_cond:
+        heapq.heappush(_timeouts, (deadline, session_id))
+        if _timeouts[0][1] == session_id:
+            _timeouts_cond.notify()  # new earliest deadline: re-arm the wait
+
+
+def _timeout_scheduler():
+    """Background thread that times out sessions as their deadlines pass."""
+    while True:
+        with _timeouts_cond:
+            while not _timeouts or _timeouts[0][0] > time.monotonic():
+                _timeouts_cond.wait(_timeouts[0][0] - time.monotonic() if _timeouts else None)
+            _, session_id = heapq.heappop(_timeouts)
+        sess = _sessions.get(session_id)
+        if sess:
+            _time_out_session(sess)
+
+
+_timeout_thread = threading.Thread(target=_timeout_scheduler, daemon=True)
+_timeout_thread.start()
 
 
 # ── Timeout watchdog ─────────────────────────────────────────────────────────
 def _timeout_watchdog():
-    """Background thread that stops sessions that have exceeded their timeout
-    and detects sessions whose worker threads have died."""
+    """Background thread that forgets sessions stopped more than an hour ago
+    and closes idle browser-session clients.
+
+    Timeouts and natural completion are handled as they happen, by
+    _timeout_scheduler and by the worker monitors.
+    """
     while True:
         time.sleep(10)
-        now = datetime.now()
 
-        # Collect sessions that need to be timed out or marked stopped.
-        # We must NOT hold _sessions_lock while calling stop() to avoid
-        # deadlocking with _unregister_session.
-        to_timeout = []
-        to_mark_stopped = []
-        with _sessions_lock:
-            for sid, sess in list(_sessions.items()):
-                if sess["status"] != "running":
-                    continue
-                # Check timeout
-                if sess["timeout_seconds"] is not None:
-                    started = datetime.fromisoformat(sess["started_at"])
-                    if (now - started).total_seconds() > sess["timeout_seconds"]:
-                        to_timeout.append((sid, sess))
-                        continue
-                # Check if worker threads have died (natural completion)
-                alive_fn = sess.get("_is_alive")
-                if alive_fn and not alive_fn():
-                    to_mark_stopped.append((sid, sess))
-
-        # Stop timed-out sessions (outside the lock)
-        for sid, sess in to_timeout:
-            try:
-                sess["stop"]()
-            except Exception:
-                pass
-            with _sessions_lock:
-                if sid in _sessions and _sessions[sid]["status"] == "running":
-                    _sessions[sid]["status"] = "timed_out"
-                    _sessions[sid]["stopped_at"] = time.monotonic()
-
-        # Mark naturally-completed sessions as stopped
-        for sid, sess in to_mark_stopped:
-            try:
-                sess["stop"]()
-            except Exception:
-                pass
+        # Clean up sessions stopped/timed_out for more than 1 hour
+        cutoff = time.monotonic() - 3600
+        expired = []
+        while _stopped_sessions and _stopped_sessions[0][0] < cutoff:
+            expired.append(_stopped_sessions.popleft()[1])
+        if expired:
             with _sessions_lock:
-                if sid in _sessions and _sessions[sid]["status"] == "running":
-                    _sessions[sid]["status"] = "stopped"
-                    _sessions[sid]["stopped_at"] = time.monotonic()
+                for sid in expired:
+                    _sessions.pop(sid, None)
+            _sessions_changed()
 
-        # Clean up sessions stopped/timed_out for more than 1 hour
-        with _sessions_lock:
-            mono_now = time.monotonic()
-            for sid in [s for s, sess in _sessions.items()
-                        if sess["status"] in ("stopped", "timed_out")
-                        and mono_now - sess.get("stopped_at", mono_now) > 3600]:
-                del _sessions[sid]
+        _evict_idle_clients()
 
 
 _watchdog_thread= threading.Thread(target=_timeout_watchdog, daemon=True)
@@ -266,10 +427,17 @@ def index():
 
 
 # ── Chat / Do ────────────────────────────────────────────────────────────────
+# Appended to every /api/do task
+_DO_INSTRUCTIONS = (
+    "\n\nComplete this task. If it requires computation, data processing, or any "
+    "programming, write and execute the necessary code. Show the actual results."
+)
+
+
 @app.route("/api/chat", methods=["POST"])
 @require_auth
 def api_chat():
-    data = request.get_json(force=True)
+    data = _json_body()
     message = data.get("message", "").strip()
     if not message:
         return jsonify({"error": "Empty message"}), 400
@@ -282,15 +450,13 @@ def api_chat():
 @app.route("/api/do", methods=["POST"])
 @require_auth
 def api_do():
-    data = request.get_json(force=True)
+    data = _json_body()
     task_desc = data.get("task", "").strip()
     if not task_desc:
         return jsonify({"error": "Empty task"}), 400
 
     ai = _get_session_client()
-    response = ai.chat(
-        f"Task: {task_desc}\n\nComplete this task. If it requires computation, data processing, or any programming, write and execute the necessary code. Show the actual results.",
-    )
+    response = ai.chat("Task: " + task_desc + _DO_INSTRUCTIONS)
     return jsonify({"response": response})
 
 
@@ -298,7 +464,7 @@ def api_do():
 @app.route("/api/search", methods=["POST"])
 @require_auth
 def api_search():
-    data = request.get_json(force=True)
+    data = _json_body()
     query = data.get("query", "").strip()
     if not query:
         return jsonify({"error": "Empty query"}), 400
@@ -319,7 +485,7 @@ def api_models():
 @app.route("/api/model", methods=["POST"])
 @require_auth
 def api_switch_model():
-    data = request.get_json(force=True)
+    data = _json_body()
     model = data.get("model", "").strip()
     ai = _get_session_client()
     result = ai.switch_model(model)
@@ -337,53 +503,71 @@ def api_tools_status():
 @app.route("/api/tools", methods=["POST"])
 @require_auth
 def api_tools_toggle():
-    data = request.get_json(force=True)
+    data = _json_body()
     ai = _get_session_client()
     ai.toggle_tools(data.get("enabled", not ai.tools_enabled))
     return jsonify({"enabled": ai.tools_enabled})
 
 
 # ── Research session ─────────────────────────────────────────────────────────
+# A run makes dozens of LLM calls and holds a worker thread for minutes, so
+# only a few run at once across all sessions; the rest wait for a slot
+_research_slots = threading.BoundedSemaphore(MAX_CONCURRENT_RESEARCH)
+
+
 @app.route("/api/research", methods=["POST"])
 @require_auth
 def api_research():
     """Start a deep research session in the background."""
-    data = request.get_json(force=True)
+    data = _json_body()
     problem = data.get("problem", "").strip()
     if not problem:
         return jsonify({"error": "Empty problem"}), 400
 
     timeout = _parse_timeout(data.get("timeout", "3600"))
-    session_id = f"research-{uuid.uuid4().hex[:8]}"
+    session_id = _new_session_id("research")
 
-    # Orchestrator will run in a background thread
+    # Orchestrator will run on a shared agent thread, with its own client so
+    # concurrent sessions don't share one conversation history
     orchestrator = ResearchOrchestrator(
-        on_output=lambda text: _session_output(session_id, text)
+        on_output=lambda text: _session_output(session_id, text),
+        ai=AIClient(),
     )
 
     def _run():
         try:
-            _session_output(session_id, f"[Research] Starting research: {problem}")
-            result = orchestrator.conduct_research(problem)
+            if not _research_slots.acquire(blocking=False):
+                _session_output(session_id, "[Research] Waiting for a free research slot...")
+                _research_slots.acquire()
+            try:
+                # stopped or timed out while queued
+                if sess["status"] != "running":
+                    return
+                _session_output(session_id, f"[Research] Starting research: {problem}")
+                result = orchestrator.conduct_research(problem)
+            finally:
+                _research_slots.release()
             _session_output(session_id, "[Research] ✓ Research complete.")
-            with _sessions_lock:
-                if session_id in _sessions:
-                    _sessions[session_id]["result"] = result
+            with sess["_cond"]:
+                sess["result"] = result
+        except ResearchCancelled:
+            _session_output(session_id, "[Research] Stopped.")
         except Exception as exc:
             _session_output(session_id, f"[Research] Error: {exc}")
         finally:
             _unregister_session(session_id)
 
     def _stop():
+        # Ends the run at its next step boundary, which frees its research
+        # slot; the LLM call in flight still completes first.
         # NOTE: do NOT call _unregister_session here – callers
-        # (api_session_stop / _timeout_watchdog) manage the status
-        # themselves and calling it while the lock is held deadlocks.
-        pass
+        # (api_session_stop / the session timeout) manage the status
+        # themselves.
+        orchestrator.cancel()
 
-    _register_session(session_id, "research", f"Research: {problem[:80]}",
-                      timeout, _stop)
-    t = threading.Thread(target=_run, daemon=True)
-    t.start()
+    sess = _register_session(session_id, "research", f"Research: {problem[:80]}",
+                             timeout, _stop)
+    _run_in_agent_thread(_run)
 
     return jsonify({"session_id": session_id, "status": "started",
                     "timeout_seconds": timeout})
@@ -401,12 +585,12 @@ def api_autonomous_start():
     Output from each is written to separate named streams ("agent", "critic")
     so the UI can render them in two independent panes.
     """
-    data = request.get_json(force=True)
+    data = _json_body()
     prompt = data.get("prompt", "").strip() or None
     agent_persona_id = data.get("agent_persona_id")
     critic_persona_id = data.get("critic_persona_id")
     timeout = _parse_timeout(data.get("timeout", "3600"))
-    session_id = f"auto-{uuid.uuid4().hex[:8]}"
+    session_id = _new_session_id("auto")
 
     # Resolve persona prompts
     agent_prompt = prompt  # explicit prompt overrides persona
@@ -454,22 +638,27 @@ def api_autonomous_start():
         agent.stop()
         critic.stop()
         # NOTE: do NOT call _unregister_session here – callers
-        # (api_session_stop / _timeout_watchdog) manage the status
-        # themselves, and calling it here while the lock is held
-        # would deadlock.
+        # (api_session_stop / the session timeout) manage the status
+        # themselves.
 
-    def _is_alive():
-        """Return True if at least one worker thread is still running."""
-        a_alive = agent._thread is not None and agent._thread.is_alive()
-        c_alive = critic._thread is not None and critic._thread.is_alive()
-        return a_alive or c_alive
+    loops_left = [2]
+    loops_lock = threading.Lock()
+
+    def _loop_done(_future):
+        """Mark the session stopped as soon as both agent loops have exited."""
+        with loops_lock:
+            loops_left[0] -= 1
+            if loops_left[0]:
+                return
+        _end_session(sess, "stopped")
 
     sess = _register_session(session_id, "autonomous", "Autonomous Agent + Critic",
                       timeout, _stop,
                       extra_outputs={"agent": [], "critic": []})
-    sess["_is_alive"] = _is_alive
     agent.start()
     critic.start()
+    for loop in (agent._future, critic._future):
+        loop.add_done_callback(_loop_done)
 
     return jsonify({"session_id": session_id, "status": "started",
                     "timeout_seconds": timeout})
@@ -480,9 +669,14 @@ def api_autonomous_start():
 @require_auth
 def api_sessions():
     """List all agentic sessions."""
-    with _sessions_lock:
+    global _sessions_view
+    version, body = _sessions_view
+    if version != _sessions_version:
+        with _sessions_lock:
+            version = _sessions_version
+            sessions = list(_sessions.values())
         out = []
-        for s in _sessions.values():
+        for s in sessions:
             out.append({
                 "id": s["id"],
                 "type": s["type"],
@@ -492,18 +686,20 @@ def api_sessions():
                 "expires_at": s["expires_at"],
                 "status": s["status"],
             })
-    return jsonify({"sessions": out})
+        body = json.dumps({"sessions": out}).encode("utf-8")
+        _sessions_view = (version, body)
+    return Response(body, mimetype="application/json")
 
 
 @app.route("/api/sessions/<session_id>", methods=["GET"])
 @require_auth
 def api_session_detail(session_id: str):
     """Get session detail including output log."""
-    with _sessions_lock:
-        sess = _sessions.get(session_id)
-        if not sess:
-            return jsonify({"error": "Session not found"}), 404
-        return jsonify({
+    sess = _sessions.get(session_id)
+    if not sess:
+        return jsonify({"error": "Session not found"}), 404
+    with sess["_cond"]:
+        fields = {
             "id": sess["id"],
             "type": sess["type"],
             "description": sess["description"],
@@ -511,8 +707,10 @@ def api_session_detail(session_id: str):
             "timeout_seconds": sess["timeout_seconds"],
             "expires_at": sess["expires_at"],
             "status": sess["status"],
-            "output": sess["output"],
-        })
+        }
+        lines = list(sess["output"])
+    body = _json_with_lines(fields, lines, key="output")
+    return Response(body, mimetype="application/json")
 
 
 @app.route("/api/sessions/<session_id>/output", methods=["GET"])
@@ -522,51 +720,96 @@ def api_session_output(session_id: str):
 
     Query params:
         stream: "output" (default), "agent", or "critic"
-        offset: line offset for incremental polling
+        offset: line offset for incremental polling; pass back the returned
+                offset. "dropped" counts lines that left the rolling log
+                before they were polled.
+
+    Returns 204 No Content when nothing was appended since ``offset``.
     """
     stream = request.args.get("stream", "output")
     offset = request.args.get("offset", 0, type=int)
-    with _sessions_lock:
-        sess = _sessions.get(session_id)
-        if not sess:
-            return jsonify({"error": "Session not found"}), 404
-        if stream == "output":
-            buf = sess["output"]
-        else:
-            buf = sess.get("extra_outputs", {}).get(stream, [])
-        lines = buf[offset:]
-    return jsonify({"lines": lines, "offset": offset + len(lines),
-                    "stream": stream})
+    sess = _sessions.get(session_id)
+    if not sess:
+        return jsonify({"error": "Session not found"}), 404
+    if sess["_appended"].get(stream, 0) == offset:
+        return Response(status=204)
+    with sess["_cond"]:
+        lines, offset, dropped = _stream_lines_since(sess, stream, offset)
+    body = _json_with_lines({"offset": offset, "dropped": dropped, "stream": stream}, lines)
+    return Response(body, mimetype="application/json")
 
 
 @app.route("/api/sessions/<session_id>/stop", methods=["POST"])
 @require_auth
 def api_session_stop(session_id: str):
     """Stop / close an agentic session."""
-    # Grab the stop function and release the lock BEFORE calling it
-    # to avoid deadlocking with _unregister_session.
-    with _sessions_lock:
-        sess = _sessions.get(session_id)
-        if not sess:
-            return jsonify({"error": "Session not found"}), 404
-        if sess["status"] != "running":
-            return jsonify({"status": sess["status"]})
-        stop_fn = sess["stop"]
-
-    # Call stop outside the lock
+    sess = _sessions.get(session_id)
+    if not sess:
+        return jsonify({"error": "Session not found"}), 404
+    if sess["status"] != "running":
+        return jsonify({"status": sess["status"]})
+
+    # Call stop without holding the session lock, so it can't deadlock
+    # with _unregister_session.
     try:
-        stop_fn()
+        sess["stop"]()
     except Exception:
         pass
 
-    with _sessions_lock:
-        sess = _sessions.get(session_id)
-        if sess and sess["status"] == "running":
-            sess["status"] = "stopped"
-            sess.setdefault("stopped_at", time.monotonic())
+    _end_session(sess, "stopped")
     return jsonify({"status": "stopped"})
 
 
+# Seconds between keepalive comments on an idle /stream connection
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@app.route("/api/sessions/<session_id>/stream", methods=["GET"])
+@require_auth
+def api_session_stream(session_id: str):
+    """Push a session stream's output as Server-Sent Events.
+
+    Each event carries {"lines": [...], "offset": n} with ``id: n``, so an
+    EventSource that reconnects resumes where it left off (Last-Event-ID).
+    A final "end" event carries the session status once it stops running.
+
+    Query params:
+        stream: "output" (default), "agent", or "critic"
+        offset: line position to start from (default 0)
+    """
+    stream = request.args.get("stream", "output")
+    position = request.headers.get("Last-Event-ID", type=int)
+    if position is None:
+        position = request.args.get("offset", 0, type=int)
+    sess = _sessions.get(session_id)
+    if not sess:
+        return jsonify({"error": "Session not found"}), 404
+    if stream != "output" and stream not in sess.get("extra_outputs", {}):
+        return jsonify({"error": f"Unknown stream: {stream}"}), 404
+    cond = sess["_cond"]
+
+    def events():
+        nonlocal position
+        while True:
+            with cond:
+                cond.wait_for(
+                    lambda: sess["_appended"][stream] > position or sess["status"] != "running",
+                    timeout=SSE_KEEPALIVE_SECONDS,
+                )
+                lines, position, _ = _stream_lines_since(sess, stream, position)
+                status = sess["status"]
+            if lines:
+                yield f"id: {position}\ndata: {_json_with_lines({'offset': position}, lines)}\n\n"
+            elif status == "running":
+                yield ": keepalive\n\n"
+            if status != "running":
+                yield f"event: end\ndata: {json.dumps({'status': status})}\n\n"
+                return
+
+    return Response(events(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @app.route("/api/reset", methods=["POST"])
 @require_auth
 def api_reset():
@@ -588,7 +831,7 @@ def api_personas_list():
 @require_auth
 def api_personas_create():
     """Create a new persona."""
-    data = request.get_json(force=True)
+    data = _json_body()
     name = data.get("name", "").strip()
     role = data.get("role", "").strip()
     instructions = data.get("instructions", "").strip()
@@ -604,7 +847,7 @@ def api_personas_create():
 @require_auth
 def api_personas_update(persona_id: str):
     """Update an existing persona's name and/or instructions."""
-    data = request.get_json(force=True)
+    data = _json_body()
     updated = persona_manager.update(
         persona_id,
         name=data.get("name"),
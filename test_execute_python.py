@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Test that execute_python runs scripts like `python script.py` would."""
+
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from tools import execute_python
+
+
+def test_main_guard():
+    """Scripts run as __main__, so the usual entry-point guard fires."""
+    print("Test 1: if __name__ == '__main__'")
+
+    result = execute_python('if __name__ == "__main__":\n    print("ran as main")\n')
+    assert result["success"], f"Script failed: {result}"
+    assert result["stdout"].strip() == "ran as main", f"Unexpected output: {result['stdout']!r}"
+    print("✓ Scripts run as __main__")
+
+
+def test_pickle_main_class():
+    """Classes defined by the script can be pickled (looked up on sys.modules['__main__'])."""
+    print("\nTest 2: Pickling a class defined in the script")
+
+    code = (
+        "import pickle\n"
+        "class A:\n"
+        "    pass\n"
+        "print(type(pickle.loads(pickle.dumps(A()))).__name__)\n"
+    )
+    result = execute_python(code)
+    assert result["success"], f"Pickling failed: {result.get('stderr') or result}"
+    assert result["stdout"].strip() == "A", f"Unexpected output: {result['stdout']!r}"
+    print("✓ Script classes pickle")
+
+
+def test_clean_namespace():
+    """The driver's own names don't leak into the script's globals."""
+    print("\nTest 3: Clean script namespace")
+
+    result = execute_python("print(sorted(k for k in globals() if not k.startswith('__')))\n")
+    assert result["success"], f"Script failed: {result}"
+    assert result["stdout"].strip() == "[]", f"Unexpected globals: {result['stdout']!r}"
+    print("✓ Script namespace is clean")
+
+
+if __name__ == '__main__':
+    print("Testing execute_python\n" + "="*50)
+
+    try:
+        test_main_guard()
+        test_pickle_main_class()
+        test_clean_namespace()
+
+        print("\n" + "="*50)
+        print("All tests passed! ✓")
+        sys.exit(0)
+
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
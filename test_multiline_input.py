@@ -2,20 +2,22 @@
 """Test multi-line input functionality for Agent/Critic topic."""
 
 import os
+import re
 import sys
 import tempfile
 
+_COMMENT_LINE_RE = re.compile(r"^[^\S\n]*#[^\n]*(?:\n|$)", re.M)
+_TRAILING_SPACE_RE = re.compile(r"[^\S\n]+$", re.M)
+
 
 def get_multiline_input_logic(file_path: str) -> str:
     """Simulate the logic from get_multiline_input without importing the module."""
     with open(file_path, 'r') as f:
-        lines = f.readlines()
+        text = f.read()
     
     # Filter out comment lines and strip trailing whitespace
-    content_lines = [line.rstrip() for line in lines if not line.strip().startswith('#')]
-    content = '\n'.join(content_lines).strip()
-    
-    return content
+    text = _COMMENT_LINE_RE.sub('', text)
+    return _TRAILING_SPACE_RE.sub('', text).strip()
 
 
 def test_multiline_input_basic():